@@ -0,0 +1,106 @@
+"""A memory footprint of chaining a command that reads a huge file with
+a subcommand that processes its records.
+
+Runs `tool read big.csv filter --col x` over generated CSV files of 16 MB,
+256 MB and 2 GB (or of the sizes in megabytes passed as arguments), where
+`read` yields records lazily and `filter` consumes them, and reports
+the peak memory allocated while the command line is executed. The peak
+stays the same regardless of the size of the file.
+
+Usage:
+    $ python -m benchmarks.chaining
+       Size        Records          Peak
+      16 MB          17439       47.7 KB
+     256 MB         279038       45.6 KB
+    2048 MB        2232311       45.6 KB
+"""
+
+import csv
+import os
+import sys
+import tempfile
+import tracemalloc
+from typing import Iterable, List
+
+from mints import CLI, Arg, Opt
+
+# A number of columns in a generated file (the first one is named `x`).
+COLUMNS = 16
+
+
+def new_cli() -> CLI:
+    """Creates a CLI that reads records of a CSV file and filters them."""
+
+    cli = CLI()
+
+    @cli
+    def tool():
+        pass
+
+    @tool.command
+    def read(path: Arg):
+        with open(path, newline='') as file:
+            yield from csv.DictReader(file)
+
+    @read.command
+    def filter(records: Iterable[dict], col: Opt, value: Opt = '0'):
+        return sum(record[col] == value for record in records)
+
+    return cli
+
+
+def generated(path: str, size: int) -> int:
+    """Writes a CSV file of `size` megabytes and returns a number
+    of records in it."""
+
+    header = ','.join(['x'] + [f'c{i}' for i in range(1, COLUMNS)]) + '\n'
+    row = ','.join(['0'] + ['1' * 63] * (COLUMNS - 1)) + '\n'
+    rows = size * 2 ** 20 // len(row)
+    chunk = row * 1024
+
+    with open(path, 'w') as file:
+        file.write(header)
+
+        for _ in range(rows // 1024):
+            file.write(chunk)
+
+        file.write(row * (rows % 1024))
+
+    return rows
+
+
+def peak(path: str) -> int:
+    """Returns a peak number of bytes allocated while executing
+    the command line."""
+
+    cli = new_cli()
+    args = ['read', path, 'filter', '--col', 'x']
+
+    # Warm up: parse the command line once, so only execution is measured.
+    cli.invocations(args)
+
+    tracemalloc.start()
+    cli(args)
+    _, peak_ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return peak_
+
+
+def run(sizes: List[int]):
+    print('   Size        Records          Peak')
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'big.csv')
+
+        for size in sizes:
+            records = generated(path, size)
+            memory = peak(path) / 1024
+
+            print(f'{size:4} MB  {records:13}  {memory:9.1f} KB')
+
+            os.remove(path)
+
+
+if __name__ == '__main__':
+    run([int(x) for x in sys.argv[1:]] or [16, 256, 2048])
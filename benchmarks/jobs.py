@@ -0,0 +1,76 @@
+"""A throughput of a batch of CPU-bound command lines executed by
+different numbers of worker processes (see `mints.batch.Batch`).
+
+Executes a batch of lines of a synthetic command that takes about 10 ms
+of pure Python computation with 1, 2, 4, ... jobs up to the number of CPUs
+(or up to the number passed as an argument), and reports the throughput
+and the speedup over a single job.
+
+Since workers are forked with the CLI and its parser ready and exchange
+only lines and their output, the throughput is expected to scale close to
+linearly up to the number of CPUs. On a single CPU, it only shows
+the overhead of the pool:
+
+Usage:
+    $ python -m benchmarks.jobs 2
+       Jobs      Throughput
+          1      105 lines/s
+          2       92 lines/s (0.9x)
+"""
+
+import io
+import os
+import sys
+import time
+from contextlib import redirect_stdout
+
+from mints import CLI, Arg
+from mints.batch import Batch
+
+
+def new_cli() -> CLI:
+    """Creates a CLI with a single CPU-bound command."""
+
+    cli = CLI()
+
+    @cli
+    def work(n: Arg[int]):
+        print(sum(i * i for i in range(n)) % 10)
+
+    return cli
+
+
+def throughput(jobs: int, lines: int, n: int = 100000) -> float:
+    """Returns a number of lines executed per second."""
+
+    batch = Batch(new_cli(), jobs)
+
+    start = time.perf_counter()
+
+    with redirect_stdout(io.StringIO()):
+        for _ in batch.run(f'{n}' for _ in range(lines)):
+            pass
+
+    return lines / (time.perf_counter() - start)
+
+
+if __name__ == '__main__':
+    cpus = int(sys.argv[1]) if len(sys.argv) > 1 else os.cpu_count() or 1
+    counts = [1]
+
+    while counts[-1] * 2 <= cpus:
+        counts.append(counts[-1] * 2)
+
+    if counts[-1] != cpus:
+        counts.append(cpus)
+
+    print('   Jobs      Throughput')
+
+    single = None
+
+    for jobs in counts:
+        value = throughput(jobs, lines=50 * jobs)
+        single = single or value
+        speedup = f' ({value / single:.1f}x)' if jobs > 1 else ''
+
+        print(f'{jobs:7}  {value:7.0f} lines/s{speedup}')
@@ -0,0 +1,78 @@
+"""An overhead of recording a batch in a journal (see `mints.batch.Journal`).
+
+Executes a batch of 10^4 and 10^5 lines of a trivial command with and
+without a journal and reports the best time per line out of 5 runs,
+the overhead of the journal per line and the time it takes to skip a line
+once the batch is restarted with the complete journal.
+
+Usage:
+    $ python -m benchmarks.journal
+      Lines     Plain   Journal  Overhead   Restart
+      10000   18.9 us   22.9 us    4.0 us    1.9 us
+     100000   18.9 us   23.7 us    4.7 us    2.4 us
+"""
+
+import os
+import tempfile
+import time
+from typing import Optional, Tuple
+
+from mints import CLI, Arg
+from mints.batch import Batch, Journal
+from mints.parsers.fast import FastParser
+
+
+def new_cli() -> CLI:
+    """Creates a CLI with a single trivial command."""
+
+    cli = CLI()
+
+    @cli
+    def tool(x: Arg[int]):
+        pass
+
+    cli.parser = FastParser(cli)
+
+    return cli
+
+
+def per_line(lines: int, journal: Optional[str] = None) -> float:
+    """Returns a number of microseconds it takes to execute a line."""
+
+    batch = Batch(new_cli(), journal=journal and Journal(journal))
+    start = time.perf_counter()
+
+    for _ in batch.run(f'{i}' for i in range(lines)):
+        pass
+
+    if batch.journal is not None:
+        batch.journal.close()
+
+    return (time.perf_counter() - start) * 10 ** 6 / lines
+
+
+def best(lines: int, directory: str, repeat: int = 5) -> Tuple[float, ...]:
+    """Returns the best times per line of (<plain>, <journal>, <restart>)
+    batches out of `repeat` runs."""
+
+    times = []
+
+    for i in range(repeat):
+        path = os.path.join(directory, f'{lines}-{i}.journal')
+
+        times.append((per_line(lines),
+                      per_line(lines, path),
+                      per_line(lines, path)))
+
+    return tuple(map(min, zip(*times)))
+
+
+if __name__ == '__main__':
+    print('  Lines     Plain   Journal  Overhead   Restart')
+
+    with tempfile.TemporaryDirectory() as directory:
+        for lines in [10 ** 4, 10 ** 5]:
+            plain, journal, restart = best(lines, directory)
+
+            print(f'{lines:7}  {plain:5.1f} us  {journal:5.1f} us  '
+                  f'{journal - plain:5.1f} us  {restart:5.1f} us')
@@ -0,0 +1,74 @@
+"""A comparison of parsers for command lines with huge lists of values.
+
+Parses a command line with 10^3, 10^5 and 10^6 values of a list argument
+(as `find ... | xargs tool` would produce) and reports the time it takes
+and the peak memory allocated while parsing (except for the command line
+itself).
+
+Usage:
+    $ python -m benchmarks.lists
+     Values  StandardParser      FastParser    Peak (FastParser)
+       1000         1.2 ms          0.4 ms           38 bytes/value
+     100000        73.3 ms         44.9 ms           44 bytes/value
+    1000000       724.1 ms        355.0 ms           44 bytes/value
+"""
+
+import time
+import tracemalloc
+from typing import List
+
+from mints import CLI, Arg, Opt
+from mints.parsers.fast import FastParser
+from mints.parsers.standard import StandardParser
+
+
+def new_cli() -> CLI:
+    """Creates a CLI with a single command that accepts a list of values."""
+
+    cli = CLI()
+
+    @cli
+    def tool(counts: Arg[List[int]], name: Opt = None):
+        ...
+
+    return cli
+
+
+def duration(new_parser, args: List[str]) -> float:
+    """Returns a duration of parsing `args` in milliseconds."""
+
+    parser = new_parser(new_cli())
+    parser.parse(args[-2:])
+
+    start = time.perf_counter()
+    parser.parse(args)
+
+    return (time.perf_counter() - start) * 1000
+
+
+def peak(new_parser, args: List[str]) -> int:
+    """Returns a peak number of bytes allocated while parsing `args`."""
+
+    parser = new_parser(new_cli())
+    parser.parse(args[-2:])
+
+    tracemalloc.start()
+    parser.parse(args)
+    _, peak_ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return peak_
+
+
+if __name__ == '__main__':
+    print(' Values  StandardParser      FastParser    Peak (FastParser)')
+
+    for values in [10 ** 3, 10 ** 5, 10 ** 6]:
+        args = [str(x) for x in range(values)] + ['--name', 'x']
+
+        standard = duration(StandardParser, args)
+        fast = duration(FastParser, args)
+        memory = peak(FastParser, args) / values
+
+        print(f'{values:7}  {standard:10.1f} ms   {fast:10.1f} ms   '
+              f'{memory:10.0f} bytes/value')
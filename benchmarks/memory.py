@@ -0,0 +1,82 @@
+"""A memory footprint of a large command tree before and after `compact`.
+
+Builds a tree of `SERVICES * OPERATIONS` leaf commands, as a CLI generated
+from a service catalog would, and reports the memory it takes per command.
+
+Usage:
+    $ python -m benchmarks.memory
+    Built:       827 bytes/command (10101 commands)
+    Compact:     150 bytes/command (5.5x)
+"""
+
+import gc
+import tracemalloc
+
+from mints import CLI, Arg, Opt, Flag
+from mints.command import Command
+
+
+SERVICES = 100
+OPERATIONS = 100
+
+
+def call(resource: Arg('A resource to call the operation for.'),
+         region: Opt('A region.') = 'eu',
+         retries: Opt[int](short='r') = 3,
+         dry: Flag = False):
+    """Calls an operation of a service."""
+
+
+def new_cli() -> CLI:
+    """Creates a CLI with a command per operation of each service."""
+
+    cli = CLI()
+
+    @cli
+    def tool(verbose: Flag(short='v')):
+        ...
+
+    for i in range(SERVICES):
+        service = tool.command(lambda: None, name=f'service-{i}',
+                               description=f'Operations of service {i}.')
+
+        for j in range(OPERATIONS):
+            service.command(call, name=f'operation-{j}',
+                            description=f'Calls operation {j}.')
+
+    return cli
+
+
+def count(command: Command) -> int:
+    """Returns a number of commands in a tree."""
+
+    return 1 + sum(count(x) for x in command.subcommands.values())
+
+
+def size(build) -> int:
+    """Returns a number of bytes allocated by `build` and kept alive."""
+
+    gc.collect()
+    tracemalloc.start()
+
+    start = tracemalloc.get_traced_memory()[0]
+    kept = build()
+    gc.collect()
+    end = tracemalloc.get_traced_memory()[0]
+
+    tracemalloc.stop()
+
+    # Keep the result alive until the memory is measured.
+    del kept
+
+    return end - start
+
+
+if __name__ == '__main__':
+    commands = count(new_cli().main)
+
+    built = size(new_cli) / commands
+    compact = size(lambda: new_cli().main.compact()) / commands
+
+    print(f'Built:   {built:7.0f} bytes/command ({commands} commands)')
+    print(f'Compact: {compact:7.0f} bytes/command ({built / compact:.1f}x)')
@@ -0,0 +1,71 @@
+"""A throughput comparison of parsers for commands with many options.
+
+Parses command lines of a command with 50, 500 and 5,000 options, using
+both exact option strings and abbreviations of them.
+
+Usage:
+    $ python -m benchmarks.options
+    Options  StandardParser      FastParser
+         50     14207 lines/s   275766 lines/s (19.4x)
+        500      2189 lines/s   137226 lines/s (62.7x)
+       5000       187 lines/s    42615 lines/s (227.5x)
+"""
+
+from timeit import timeit
+
+from mints import CLI, Opt, Flag
+from mints.parsers.fast import FastParser
+from mints.parsers.standard import StandardParser
+
+
+def new_cli(options: int) -> CLI:
+    """Creates a CLI with a single command with many options and flags."""
+
+    params = ', '.join(f'o{i}_value: Opt = None' if i % 2 else
+                       f'f{i}_value: Flag = False' for i in range(options))
+    namespace = {'Opt': Opt, 'Flag': Flag}
+
+    exec(f'def main({params}):\n    pass\n', namespace)
+
+    cli = CLI()
+    cli(namespace['main'])
+
+    return cli
+
+
+def lines(options: int):
+    """Returns command lines that refer to options across the command."""
+
+    last = options - 1 if options % 2 == 0 else options - 2
+
+    return [f'--f0_value --o1_value x --o{last}_value y'.split(),
+            f'--f0_v --o1_v x --o{last}_v y'.split()]
+
+
+def throughput(new_parser, options: int, number: int = 2000) -> float:
+    """Returns a number of lines parsed per second."""
+
+    cli = new_cli(options)
+    parser = new_parser(cli)
+    lines_ = lines(options)
+
+    def parse():
+        for line in lines_:
+            parser.parse(line)
+
+    # Warm up: construct the parser, so only parsing is measured.
+    parse()
+
+    return number * len(lines_) / timeit(parse, number=number)
+
+
+if __name__ == '__main__':
+    print('Options  StandardParser      FastParser')
+
+    for options in [50, 500, 5000]:
+        number = 100000 // options
+        standard = throughput(StandardParser, options, number)
+        fast = throughput(FastParser, options, number)
+
+        print(f'{options:7}  {standard:8.0f} lines/s '
+              f'{fast:8.0f} lines/s ({fast / standard:.1f}x)')
@@ -0,0 +1,76 @@
+"""A throughput comparison of `StandardParser` and `FastParser`.
+
+Parses the same set of command lines with both parsers many times in
+a single process, as in tests, batch jobs or embedded use.
+
+Usage:
+    $ python -m benchmarks.parsers
+    StandardParser:     20482 lines/s
+    FastParser:        216390 lines/s (10.6x)
+"""
+
+from timeit import timeit
+from typing import List
+
+from mints import CLI, Arg, Opt, Flag
+from mints.parsers.fast import FastParser
+from mints.parsers.standard import StandardParser
+
+
+LINES = [
+    'deploy api --region eu --replicas 3',
+    'deploy web --region us --replicas 1 --dry',
+    'logs api --tail 100 -f',
+    'scale api 1 2 3 4',
+]
+
+
+def new_cli() -> CLI:
+    """Creates a CLI with a few typical subcommands."""
+
+    cli = CLI()
+
+    @cli
+    def tool(verbose: Flag(short='v')):
+        ...
+
+    @tool.command
+    def deploy(service: Arg,
+               region: Opt = 'eu',
+               replicas: Opt[int] = 1,
+               dry: Flag = False):
+        ...
+
+    @tool.command
+    def logs(service: Arg,
+             tail: Opt[int] = 10,
+             follow: Flag(short='f') = False):
+        ...
+
+    @tool.command
+    def scale(service: Arg, counts: Arg[List[int]]):
+        ...
+
+    return cli
+
+
+def throughput(new_parser, number: int = 20000) -> float:
+    """Returns a number of lines parsed per second."""
+
+    cli = new_cli()
+    parser = new_parser(cli)
+    lines = [x.split() for x in LINES]
+
+    def parse():
+        for line in lines:
+            parser.parse(line)
+
+    return number * len(lines) / timeit(parse, number=number)
+
+
+if __name__ == '__main__':
+    standard = throughput(StandardParser)
+    fast = throughput(FastParser)
+
+    print(f'StandardParser: {standard:9.0f} lines/s')
+    print(f'FastParser:     {fast:9.0f} lines/s ({fast / standard:.1f}x)')
@@ -0,0 +1,96 @@
+"""A cold start comparison of a CLI with and without `mints.cache.Cache`.
+
+Generates a module with many commands and runs it in fresh processes, as
+a short-lived CLI is run from a shell. The first run with the cache fills
+it and is not measured.
+
+Usage:
+    $ python -m benchmarks.startup
+    Without cache:    115.4 ms/run
+    With cache:        88.0 ms/run (1.3x)
+"""
+
+import compileall
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+
+COMMANDS = 500
+
+HEADER = '''
+import os
+
+from typing import List
+
+from mints import CLI, Arg, Opt, Flag
+from mints.cache import Cache
+
+cache = Cache(os.environ['CACHE']) if os.environ.get('CACHE') else None
+cli = CLI(cache=cache)
+
+
+@cli
+def tool(verbose: Flag(short='v')):
+    pass
+'''
+
+COMMAND = '''
+
+@tool.command
+def command_{i}(service: Arg,
+                counts: Arg[List[int]],
+                region: Opt('A region.') = 'eu',
+                replicas: Opt[int](short='r') = 1,
+                dry: Flag = False):
+    pass
+'''
+
+
+def generate(path: str):
+    """Writes a module with a CLI of `COMMANDS` subcommands."""
+
+    with open(os.path.join(path, 'generated.py'), 'w') as f:
+        f.write(HEADER)
+        f.write(''.join(COMMAND.format(i=i) for i in range(COMMANDS)))
+        f.write("\ncli(['command_0', 'api', '1'])\n")
+
+    # Bytecode is compiled beforehand, so it is used even if
+    # `PYTHONDONTWRITEBYTECODE` is set.
+    compileall.compile_dir(path, quiet=1)
+
+
+def duration(path: str, cache: str, number: int = 20) -> float:
+    """Returns an average duration of a run in milliseconds."""
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ,
+               CACHE=cache,
+               PYTHONPATH=os.pathsep.join([path, root]))
+
+    def run():
+        subprocess.run([sys.executable, '-c', 'import generated'],
+                       env=env, check=True)
+
+    # Warm up: fill the cache (if enabled).
+    run()
+
+    start = time.perf_counter()
+
+    for _ in range(number):
+        run()
+
+    return (time.perf_counter() - start) / number * 1000
+
+
+if __name__ == '__main__':
+    with tempfile.TemporaryDirectory() as path:
+        generate(path)
+
+        without = duration(path, cache='')
+        with_ = duration(path, cache=os.path.join(path, 'cache'))
+
+    print(f'Without cache: {without:8.1f} ms/run')
+    print(f'With cache:    {with_:8.1f} ms/run ({without / with_:.1f}x)')
@@ -1,3 +1,4 @@
 from mints.cli import CLI, cli
 from mints.command import Command
 from mints.args import Arg, Opt, Flag, Typed
+from mints.parsers.parser import ParseError
@@ -0,0 +1,51 @@
+"""Tools for CLIs built with Mints.
+
+Usage:
+    $ python -m mints compile mypkg.cli:cli -o mypkg/_cli_compiled.py
+    $ python -m mints build mypkg.cli:cli -o tool.pyz
+"""
+
+from mints.args import Arg, Opt
+from mints.cli import CLI
+
+
+cli = CLI()
+
+
+@cli
+def mints():
+    """Tools for CLIs built with Mints."""
+
+
+@mints.command(name='compile')
+def compile_(target: Arg('A CLI to compile in the `module:attribute` '
+                         'format (e.g., `mypkg.cli:cli`).'),
+             output: Opt('A file to write the compiled module to.',
+                         short='o')):
+    """Compiles a CLI into a module for `mints.parsers.CompiledParser`."""
+
+    from mints.command import imported
+    from mints.compiler import Compiler
+
+    source = Compiler(imported(target), target).source()
+
+    with open(output, 'w') as f:
+        f.write(source)
+
+
+@mints.command
+def build(target: Arg('A CLI to build in the `module:attribute` '
+                      'format (e.g., `mypkg.cli:cli`).'),
+          output: Opt('A file to write the zipapp to.', short='o'),
+          python: Opt('An interpreter to run the zipapp with.',
+                      short='p') = '/usr/bin/env python3'):
+    """Builds a zipapp with a CLI and the modules of its commands."""
+
+    from mints.bundle import Bundle
+    from mints.command import imported
+
+    Bundle(imported(target), target).build(output, python)
+
+
+if __name__ == '__main__':
+    cli()
@@ -32,6 +32,8 @@ class Arg:
             ...
     """
 
+    __slots__ = ('description',)
+
     def __init__(self, description: str = None):
         self.description = description
 
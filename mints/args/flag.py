@@ -33,6 +33,8 @@ class Flag:
             ...
     """
 
+    __slots__ = ('description', 'short', 'prefix')
+
     def __init__(self, description: str = None, short: str = None, prefix = '-'):
         self.description = description
         self.short = short
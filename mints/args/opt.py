@@ -32,6 +32,8 @@ class Opt:
             ...
     """
 
+    __slots__ = ('description', 'short', 'prefix')
+
     def __init__(self, description: str = None, short: str = None, prefix: str = '-'):
         self.description = description
         self.short = short
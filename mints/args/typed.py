@@ -30,6 +30,8 @@ class Typed:
             (for example, `int`, `List[double]`, etc.).
     """
 
+    __slots__ = ('kind', 'type')
+
     def __init__(self, kind: Type, type: Type):
         self.kind = kind
         self.type = type
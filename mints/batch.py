@@ -0,0 +1,646 @@
+from typing import Any, Iterable, Iterator, List, NamedTuple, Optional, \
+    TextIO, Tuple
+import collections
+import contextlib
+import hashlib
+import io
+import itertools
+import os
+import shlex
+import struct
+import sys
+import time
+
+from mints.cli import BATCH, CLI
+
+
+# An option to execute lines of a batch in a number of worker processes.
+JOBS = '--mints-jobs'
+
+# An option to report lines of a parallel batch as soon as they are done
+# rather than in the order they are read.
+UNORDERED = '--mints-unordered'
+
+# An option to record completed lines in a journal and to skip them
+# when the batch is restarted.
+JOURNAL = '--mints-journal'
+
+# An exit status of a line whose worker process has died.
+LOST = 1
+
+# A batch executed by the current worker process (see `Batch.parallel`).
+worker: Optional['Batch'] = None
+
+
+class Result(NamedTuple):
+    """A result of executing a single line of a batch.
+
+    Attributes:
+        number: A number of the line in the input (starting with 1).
+        line: The line itself (without the trailing newline).
+        status: An exit status the line would have if it was executed
+            in a separate process (`0` on success).
+        duration: A number of seconds it took to parse and execute the line.
+    """
+
+    number: int
+    line: str
+    status: int
+    duration: float
+
+
+class Journal:
+    """An append-only journal of lines of a batch that have been executed.
+
+    A record of a line consists of a hash of the line along with its number
+    (so identical lines of a batch are told apart) and its exit status.
+    Records are loaded into a set once the journal is opened, so checking
+    whether a line has succeeded takes O(1).
+
+    Records are written to the file as lines are done, but synced to disk
+    (see `os.fsync`) only once per `sync` records or `interval` seconds,
+    whichever comes first, so the journal barely slows a batch down. After
+    a crash, at most the lines that have not been synced yet are executed
+    again.
+
+    A hash of a line is computed with `digest_of`.
+
+    Attributes:
+        path: A path to the journal file (created if it does not exist).
+        sync: A maximum number of records that may be written
+            without syncing.
+        interval: A maximum number of seconds a record may be written
+            without syncing.
+
+    Examples:
+        with Journal('nightly.journal') as journal:
+            for result in Batch(cli, journal=journal).run(lines):
+                ...
+    """
+
+    # A record: a 16-byte hash of a line and its exit status.
+    RECORD = struct.Struct('16sB')
+
+    def __init__(self,
+                 path: str,
+                 sync: int = 65536,
+                 interval: float = 1.0):
+        self.path = path
+        self.sync = sync
+        self.interval = interval
+        self._succeeded = set()
+        self._pending = 0
+        self._synced = time.monotonic()
+        self._file = open(path, 'ab')
+
+        with open(path, 'rb') as file:
+            data = file.read()
+
+        size = self.RECORD.size
+        end = len(data) - len(data) % size
+
+        # A record that has been written partially (e.g., during a crash)
+        # is dropped, so the following ones are aligned.
+        if end != len(data):
+            self._file.truncate(end)
+
+        self._succeeded.update(digest for digest, status
+                               in self.RECORD.iter_unpack(data[:end])
+                               if status == 0)
+
+    def __enter__(self) -> 'Journal':
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def succeeded(self, digest: bytes) -> bool:
+        """Checks whether a line with the `digest` has already succeeded."""
+
+        return digest in self._succeeded
+
+    def add(self, digest: bytes, status: int):
+        """Records an exit status of a line with the `digest`."""
+
+        self._file.write(self.RECORD.pack(digest, status & 0xFF))
+        self._pending += 1
+
+        if status == 0:
+            self._succeeded.add(digest)
+
+        if self._pending >= self.sync or \
+                time.monotonic() - self._synced >= self.interval:
+            self.flush()
+
+    def flush(self):
+        """Syncs the written records to disk."""
+
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+        self._pending = 0
+        self._synced = time.monotonic()
+
+    def close(self):
+        """Syncs the written records and closes the journal."""
+
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+
+class Batch:
+    """Executes many command lines with a single CLI in one process.
+
+    Each line is split as a shell would do (see `shlex.split`), then parsed
+    and executed in the same way as by `CLI.__call__`. Interpreter start,
+    imports and parser construction are thus paid once per batch rather
+    than once per line.
+
+    A line that fails (either to parse or to execute) is reported in
+    the same way as it would be by a separate process (an error message or
+    a traceback is printed to `stderr`), and the batch goes on. Empty lines
+    and comments (starting with `#`) are skipped.
+
+    Asynchronous commands of all lines run on the same event loop
+    (see `CLI.loop`).
+
+    Lines may also be executed in parallel by a pool of worker processes
+    (see `parallel`), which is the only way to use many cores for commands
+    that are CPU-bound Python code.
+
+    Results of lines may also be recorded in a journal (see `Journal`),
+    so a restarted batch skips the lines that have already succeeded
+    (failed lines are executed again).
+
+    Attributes:
+        cli: An instance of `CLI` to execute lines with.
+        jobs: A number of worker processes to execute lines in (the lines
+            are executed in the current process if it's `1`, and a worker
+            is started for each CPU if it's `0`).
+        ordered: Whether results of a parallel batch are reported in the
+            order the lines are read (`True` by default). Otherwise, they
+            are reported as soon as they are done.
+        journal: A journal to record results of lines in and to skip
+            the succeeded ones with (`None` if not specified).
+        skipped: A number of lines skipped by the last run (as they have
+            already succeeded according to the `journal`).
+
+    Examples:
+        for result in Batch(cli).run(open('lines.txt')):
+            if result.status != 0:
+                print(f'Line {result.number} has failed.')
+    """
+
+    def __init__(self,
+                 cli: CLI,
+                 jobs: int = 1,
+                 ordered: bool = True,
+                 journal: Optional[Journal] = None):
+        self.cli = cli
+        self.jobs = jobs if jobs > 0 else os.cpu_count() or 1
+        self.ordered = ordered
+        self.journal = journal
+        self.skipped = 0
+        self._digests = {}
+
+    def run(self, lines: Iterable[str]) -> Iterator[Result]:
+        """Executes the lines (see `parallel` if there are many `jobs`).
+
+        Returns:
+            An iterator over results of the executed lines (the lines are
+            read and executed lazily, as the iterator is consumed).
+        """
+
+        journal = self.journal
+        tasks = ((number, line.rstrip('\r\n'))
+                 for number, line in enumerate(lines, start=1))
+
+        self.skipped = 0
+
+        if journal is not None:
+            tasks = filter(self.pending, tasks)
+
+        if self.jobs > 1:
+            results = self.parallel(tasks)
+        else:
+            results = self.sequential(tasks)
+
+        if journal is None:
+            yield from results
+            return
+
+        digests = self._digests
+
+        try:
+            for result in results:
+                journal.add(digests.pop(result.number), result.status)
+
+                yield result
+        finally:
+            digests.clear()
+            journal.flush()
+
+    def pending(self, task: Tuple[int, str]) -> bool:
+        """Checks whether a line has to be executed
+        (according to the `journal`)."""
+
+        digest = digest_of(*task)
+
+        if self.journal.succeeded(digest):
+            self.skipped += 1
+
+            return False
+
+        # The hash is kept to record the line once it's done.
+        self._digests[task[0]] = digest
+
+        return True
+
+    def sequential(self, tasks: Iterable[Tuple[int, str]]) \
+            -> Iterator[Result]:
+        """Executes lines (given as pairs of (<number>, <line>)) one by one
+        in the current process."""
+
+        cli = self.cli
+        loop = cli.loop
+
+        if loop is None:
+            # Imported here, so `asyncio` is not loaded
+            # unless a batch is executed.
+            import asyncio
+
+            cli.loop = asyncio.new_event_loop()
+
+        try:
+            for number, line in tasks:
+                start = time.perf_counter()
+                status = self.executed(line)
+
+                if status is not None:
+                    yield Result(number, line, status,
+                                 time.perf_counter() - start)
+        finally:
+            if loop is None:
+                cli.loop.close()
+                cli.loop = None
+
+    def parallel(self, tasks: Iterable[Tuple[int, str]]) \
+            -> Iterator[Result]:
+        """Executes lines (given as pairs of (<number>, <line>)) in a pool
+        of `jobs` worker processes.
+
+        Workers are forked from the current process once the parser of
+        the CLI is constructed, so neither modules of the CLI are imported
+        nor the parser is constructed again. Output of each line is captured
+        by the worker and written by the current process at once, so output
+        of different lines never interleaves.
+
+        If a worker dies while executing a line (e.g., it's killed by
+        the OOM killer or calls `os._exit`), the pool is replaced, and
+        the lines that were being executed are executed again one by one
+        (so they may run twice). The line that kills its worker again is
+        reported with the `LOST` status, and the batch goes on.
+
+        Raises:
+            `ValueError` if processes cannot be forked on the platform.
+        """
+
+        import multiprocessing
+        from concurrent.futures import FIRST_COMPLETED, wait
+
+        if 'fork' not in multiprocessing.get_all_start_methods():
+            raise ValueError(f"Cannot execute a batch in {self.jobs} jobs: "
+                             f"worker processes cannot be forked.")
+
+        tasks = iter(tasks)
+        first = next(tasks, None)
+
+        if first is None:
+            return
+
+        self.prepared(first[1])
+
+        tasks = itertools.chain((first,), tasks)
+        pool = self.pool()
+
+        # Lines that are being executed along with their futures,
+        # in the order the lines are read.
+        pending = collections.deque()
+
+        try:
+            while True:
+                # A few lines are queued per worker, so a worker does not
+                # wait for the next line, and the input is still read lazily.
+                for task in itertools.islice(tasks, 2 * self.jobs -
+                                             len(pending)):
+                    pending.append((task, pool.submit(performed, task)))
+
+                if not pending:
+                    break
+
+                if self.ordered:
+                    wait([pending[0][1]])
+                else:
+                    wait([x for _, x in pending], return_when=FIRST_COMPLETED)
+
+                if any(broken(x) for _, x in pending):
+                    # All the lines that were being executed are lost along
+                    # with the pool, so they are executed again one by one
+                    # to find out which of them has killed the worker.
+                    pool = self.pool(pool)
+
+                    while pending:
+                        task, future = pending.popleft()
+
+                        if broken(future):
+                            future = pool.submit(performed, task)
+                            wait([future])
+
+                        if broken(future):
+                            pool = self.pool(pool)
+                            output = lost(task)
+                        else:
+                            output = future.result()
+
+                        yield from reported(output)
+
+                    continue
+
+                while pending and pending[0][1].done():
+                    yield from reported(pending.popleft()[1].result())
+
+                if not self.ordered:
+                    for item in [x for x in pending if x[1].done()]:
+                        pending.remove(item)
+
+                        yield from reported(item[1].result())
+        finally:
+            # Lines that have not started yet are dropped if the results
+            # are no longer needed.
+            for _, future in pending:
+                future.cancel()
+
+            pool.shutdown(wait=True)
+
+    def pool(self, broken: Optional[Any] = None) -> Any:
+        """Starts a new pool of workers (shutting the `broken` one down).
+
+        Returns:
+            An instance of `concurrent.futures.ProcessPoolExecutor`.
+        """
+
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        if broken is not None:
+            broken.shutdown(wait=True)
+
+        return ProcessPoolExecutor(self.jobs,
+                                   multiprocessing.get_context('fork'),
+                                   initializer=started,
+                                   initargs=(self,))
+
+    def prepared(self, line: str):
+        """Constructs the parser of the CLI (by parsing the `line`) before
+        workers are forked, so they all inherit it."""
+
+        with contextlib.redirect_stdout(io.StringIO()), \
+                contextlib.redirect_stderr(io.StringIO()):
+            try:
+                self.cli.invocations(split(line))
+            except (Exception, SystemExit):
+                # The line is reported once it is executed by a worker.
+                pass
+
+    def executed(self, line: str) -> Optional[int]:
+        """Executes a single line.
+
+        Returns:
+            An exit status of the line (`None` if the line is empty).
+        """
+
+        try:
+            args = split(line)
+        except ValueError as e:
+            sys.stderr.write(f'{BATCH}: error: {e}: {line}\n')
+
+            return 2
+
+        if not args:
+            return None
+
+        cli = self.cli
+
+        try:
+            cli.execute(cli.invocations(args))
+        except SystemExit as e:
+            return status_of(e)
+        except Exception:
+            import traceback
+
+            traceback.print_exc()
+
+            return 1
+
+        return 0
+
+    def main(self, path: str, summary: Optional[TextIO] = None) -> int:
+        """Executes lines of a file (or of `stdin` if `path` is `-`)
+        and writes a summary.
+
+        Args:
+            path: A path to a file with lines to execute.
+            summary: A stream to write the summary to (`stderr` if not
+                specified).
+
+        Returns:
+            An exit status of the batch: `0` if all the lines have succeeded
+            and `1` otherwise.
+        """
+
+        summary = summary or sys.stderr
+
+        if path == '-':
+            results = list(self.run(sys.stdin))
+        else:
+            with open(path) as lines:
+                results = list(self.run(lines))
+
+        if not self.ordered:
+            results.sort(key=lambda x: x.number)
+
+        summary.write(summarized(results, self.skipped))
+
+        return int(any(x.status != 0 for x in results))
+
+
+def launch(cli: CLI, args: List[str]) -> int:
+    """Executes a batch as specified by the command line arguments:
+    `--mints-batch FILE|- [--mints-jobs N] [--mints-unordered]
+    [--mints-journal PATH]`.
+
+    Returns:
+        An exit status of the batch (see `Batch.main`).
+    """
+
+    path = None
+    jobs = 1
+    ordered = True
+    journal = None
+    args = iter(args)
+
+    try:
+        for arg in args:
+            if arg == BATCH:
+                path = next(args)
+            elif arg == JOBS:
+                jobs = int(next(args))
+            elif arg == UNORDERED:
+                ordered = False
+            elif arg == JOURNAL:
+                journal = next(args)
+            else:
+                raise ValueError(f'unrecognized argument: {arg}')
+
+        if path is None:
+            raise ValueError(f'the argument {BATCH} is required')
+    except (StopIteration, ValueError) as e:
+        sys.stderr.write(f'usage: {BATCH} FILE|- [{JOBS} N] [{UNORDERED}] '
+                         f'[{JOURNAL} PATH]\n'
+                         f'{BATCH}: error: {str(e) or "expected a value"}\n')
+
+        return 2
+
+    if journal is None:
+        return Batch(cli, jobs, ordered).main(path)
+
+    with Journal(journal) as journal:
+        return Batch(cli, jobs, ordered, journal).main(path)
+
+
+def started(batch: Batch):
+    """Initializes a worker process of a parallel batch."""
+
+    global worker
+
+    worker = batch
+
+    # An event loop of the parent process (if any) must not be shared,
+    # as its selector would be shared as well.
+    import asyncio
+
+    batch.cli.loop = asyncio.new_event_loop()
+
+
+def performed(task: Tuple[int, str]) -> Tuple[Optional[Result], str, str]:
+    """Executes a line in a worker process.
+
+    Returns:
+        A tuple of (<result>, <stdout>, <stderr>), where the result is
+        `None` if the line is empty.
+    """
+
+    number, line = task
+    out, err = io.StringIO(), io.StringIO()
+    start = time.perf_counter()
+
+    with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+        status = worker.executed(line)
+
+    result = Result(number, line, status, time.perf_counter() - start) \
+        if status is not None else None
+
+    return result, out.getvalue(), err.getvalue()
+
+
+def broken(future: Any) -> bool:
+    """Checks whether a line has been lost along with its worker."""
+
+    from concurrent.futures.process import BrokenProcessPool
+
+    return future.done() and \
+        isinstance(future.exception(), BrokenProcessPool)
+
+
+def lost(task: Tuple[int, str]) -> Tuple[Result, str, str]:
+    """Returns an output of a line whose worker has died (e.g., it has
+    been killed by a signal or has called `os._exit`)."""
+
+    number, line = task
+    error = f'{BATCH}: error: the worker process has died while ' \
+            f'executing the line {number}: {line}\n'
+
+    return Result(number, line, LOST, 0.0), '', error
+
+
+def reported(output: Tuple[Optional[Result], str, str]) \
+        -> Iterator[Result]:
+    """Writes an output of a line executed by a worker and yields
+    its result (if the line is not empty)."""
+
+    result, out, err = output
+
+    if out:
+        sys.stdout.write(out)
+        sys.stdout.flush()
+    if err:
+        sys.stderr.write(err)
+        sys.stderr.flush()
+    if result is not None:
+        yield result
+
+
+def summarized(results: List[Result], skipped: int = 0) -> str:
+    """Formats a summary of a batch: an exit status and a duration of each
+    line followed by the totals."""
+
+    failed = sum(x.status != 0 for x in results)
+    total = sum(x.duration for x in results)
+    width = len(str(results[-1].number)) if results else 1
+
+    lines = [f'{x.number:>{width}}  {x.status:3}  '
+             f'{x.duration * 1000:9.1f} ms  {x.line}' for x in results]
+    lines.append(f'{len(results)} lines: {len(results) - failed} succeeded, '
+                 f'{failed} failed'
+                 f'{f", {skipped} skipped" if skipped else ""} '
+                 f'in {total * 1000:.1f} ms')
+
+    return '\n'.join(lines) + '\n'
+
+
+def split(line: str) -> List[str]:
+    """Splits a line of a batch into arguments (an empty list if the line
+    is a comment).
+
+    Only a line that starts with `#` is a comment: `#` within a line
+    (e.g., in `http://host/path#fragment`) is a part of an argument.
+    """
+
+    if line.lstrip().startswith('#'):
+        return []
+
+    return shlex.split(line)
+
+
+def digest_of(number: int, line: str) -> bytes:
+    """Returns a hash of a line of a batch to record in a journal."""
+
+    return hashlib.blake2b(f'{number}:{line}'.encode(),
+                           digest_size=16).digest()
+
+
+def status_of(error: SystemExit) -> int:
+    """Returns an exit status a process would have for a `SystemExit`."""
+
+    code = error.code
+
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+
+    # A message is printed and the status is 1, as `sys.exit` does.
+    sys.stderr.write(f'{code}\n')
+
+    return 1
@@ -0,0 +1,221 @@
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+import os
+import sys
+
+from mints.cli import CLI
+from mints.command import Command, imported
+from mints.parsers.compiled import CompiledParser, name_of
+
+
+# A name of the manifest module within a zipapp.
+MANIFEST = '_mints_manifest'
+
+LAUNCHER = '''\
+from mints.bundle import launch
+
+launch()
+'''
+
+
+class Bundle:
+    """A zipapp with a CLI and the modules it consists of.
+
+    Besides the modules, the zipapp contains a manifest: a compiled parser
+    of the CLI (see `mints.compiler.Compiler`) and a list of the commands
+    with the modules they are defined in. On start, the command line is
+    parsed by the manifest, and only the modules of the selected commands
+    are imported.
+
+    Attributes:
+        cli: An instance of `CLI` to bundle.
+        target: A name of the CLI in the `module:attribute` format.
+
+    Examples:
+        $ python -m mints build mypkg.cli:cli -o tool.pyz
+        $ ./tool.pyz fetch origin
+    """
+
+    def __init__(self, cli: CLI, target: str):
+        self.cli = cli
+        self.target = target
+
+    def manifest(self) -> str:
+        """Generates the source code of the manifest module.
+
+        Raises:
+            `ValueError` if any of the commands, converters or custom help
+            functions cannot be imported by its name.
+        """
+
+        from mints.compiler import Compiler, literal, walk
+
+        commands = {}
+
+        for path, command in walk(self.cli.main):
+            target = command.target or importable(command.func)
+            help_ = importable(command.help_) \
+                if command.help_ is not None else None
+
+            commands[path] = target, command.name, command.description, help_
+
+        parsers = {importable(k): importable(v)
+                   for k, v in self.cli.parsers.items()}
+
+        return Compiler(self.cli, self.target).source() + \
+            f'\n\nCOMMANDS = {literal(commands)}\n' \
+            f'\nPARSERS = {literal(parsers)}\n'
+
+    def modules(self) -> Set[str]:
+        """Returns names of top-level modules to include into the zipapp.
+
+        Modules of the standard library (and `mints` itself, which is always
+        included) are excluded.
+        """
+
+        from mints.compiler import walk
+
+        names = [self.target.partition(':')[0]]
+
+        for _, command in walk(self.cli.main):
+            names += [getattr(command.func, '__module__', None),
+                      getattr(command.help_, '__module__', None)]
+
+        for k, v in self.cli.parsers.items():
+            names += [getattr(k, '__module__', None),
+                      getattr(v, '__module__', None)]
+
+        modules = set()
+
+        for name in names:
+            if name is None:
+                continue
+
+            top = name.partition('.')[0]
+            path = getattr(sys.modules.get(top), '__file__', None)
+
+            if top == 'mints' or path is None or standard(path):
+                continue
+
+            modules.add(top)
+
+        return modules
+
+    def build(self, output: str, interpreter: str = '/usr/bin/env python3'):
+        """Writes the zipapp to the `output` file."""
+
+        import compileall
+        import tempfile
+        import zipapp
+
+        with tempfile.TemporaryDirectory() as root:
+            for name in sorted(self.modules() | {'mints'}):
+                copy(sys.modules[name], root)
+
+            with open(os.path.join(root, f'{MANIFEST}.py'), 'w') as f:
+                f.write(self.manifest())
+            with open(os.path.join(root, '__main__.py'), 'w') as f:
+                f.write(LAUNCHER)
+
+            # `zipimport` cannot write bytecode, so it is compiled beforehand
+            # and stored next to the sources.
+            compileall.compile_dir(root, quiet=1, legacy=True)
+
+            zipapp.create_archive(root, output, interpreter=interpreter)
+
+
+def launch(args: Optional[Iterable[str]] = None) -> Any:
+    """Runs the CLI of a zipapp built by `Bundle`."""
+
+    manifest = __import__(MANIFEST)
+
+    cli = CLI()
+    cli.main = tree(manifest.COMMANDS)
+    cli.parser = CompiledParser(cli, manifest, strict=False)
+
+    for type_, parser in manifest.PARSERS.items():
+        cli.parsers[imported(type_)] = imported(parser)
+
+    return cli(args)
+
+
+def tree(commands: Dict[Tuple[str, ...], Tuple]) -> Command:
+    """Constructs a tree of lazy commands from a manifest."""
+
+    nodes = {}
+
+    for path, (target, name, description, help_) in commands.items():
+        if path:
+            command = nodes[path[:-1]].command(target,
+                                               name=name,
+                                               description=description)
+        else:
+            command = Command(target, name, description)
+
+        if help_ is not None:
+            command.help_ = lazy(help_)
+
+        nodes[path] = command
+
+    return nodes[()]
+
+
+def lazy(target: str) -> Any:
+    """Returns a function that imports a `target` function on first call."""
+
+    def call(*args: Any, **kwargs: Any) -> Any:
+        return imported(target)(*args, **kwargs)
+
+    return call
+
+
+def importable(x: Any) -> str:
+    """Returns a name of an object in the `module:qualname` format.
+
+    Raises:
+        `ValueError` if the object cannot be imported by its name.
+    """
+
+    name = name_of(x)
+
+    try:
+        found = imported(name)
+    except (ImportError, ValueError):
+        found = None
+
+    # A name of a decorated function refers to its command.
+    if found is not x and getattr(found, 'func', None) is not x:
+        raise ValueError(f"Cannot bundle '{name}': it cannot be imported "
+                         f"by its name.")
+
+    return name
+
+
+def standard(path: str) -> bool:
+    """Checks whether a file belongs to the standard library."""
+
+    import sysconfig
+
+    paths = sysconfig.get_paths()
+    path = os.path.normcase(os.path.abspath(path))
+
+    def within(name):
+        return path.startswith(os.path.normcase(paths[name]) + os.sep)
+
+    return within('stdlib') and not within('purelib') and \
+        not within('platlib')
+
+
+def copy(module: Any, root: str):
+    """Copies the sources of a top-level module or package into `root`."""
+
+    import shutil
+
+    path = module.__file__
+
+    if os.path.basename(path) == '__init__.py':
+        directory = os.path.dirname(path)
+        shutil.copytree(directory,
+                        os.path.join(root, os.path.basename(directory)),
+                        ignore=shutil.ignore_patterns('__pycache__', '*.pyc'))
+    else:
+        shutil.copy(path, root)
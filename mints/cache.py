@@ -0,0 +1,270 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import marshal
+import os
+import sys
+import zlib
+
+from mints.spec import CommandSpec
+
+
+# Bump the version when the format of cached entries changes.
+VERSION = 3
+
+
+class Cache:
+    """A persistent cache of analyzed commands.
+
+    Analyzing command functions (see `mints.spec.CommandSpec`) takes a
+    noticeable share of time for short-lived CLIs with many commands,
+    while a single run needs the specifications of a few of them only.
+    A command is analyzed once it is defined to report errors early. The
+    cache records the commands that have been analyzed without errors, so
+    in subsequent runs (until a module that defines a command changes)
+    the analysis is postponed until the specification is needed, as it
+    is for commands with string annotations.
+
+    Specifications themselves are not stored: descriptions, short names,
+    default values, etc. may be computed on import or come from other
+    modules, so they are always read from the function itself.
+
+    Commands are recorded per module and keyed by the path, the
+    modification time and the size of the module file.
+
+    Attributes:
+        path: A directory to store the cache in
+            (`$XDG_CACHE_HOME/mints` or `~/.cache/mints` if not specified).
+        hits: A number of commands whose analysis was postponed (and
+            plugin indexes loaded from the cache, see `plugins`).
+        misses: A number of commands that had to be analyzed first (and
+            plugin indexes that had to be rebuilt).
+
+    Examples:
+        cli = CLI(cache=Cache())
+
+        @cli
+        def main(...):
+            ...
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        if path is None:
+            home = os.environ.get('XDG_CACHE_HOME') or \
+                   os.path.join(os.path.expanduser('~'), '.cache')
+            path = os.path.join(home, 'mints')
+
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._entries = {}
+        self._dirty = set()
+
+    def checked(self, func: Callable) -> bool:
+        """Checks whether `func` has been analyzed without errors since
+        its module last changed (so its analysis may be postponed)."""
+
+        entry, key = self.entry(func), key_of(func)
+
+        if entry is None or key is None or key not in entry['checked']:
+            return False
+
+        self.hits += 1
+        return True
+
+    def spec(self, func: Callable) -> CommandSpec:
+        """Computes a specification of a command function and records
+        that `func` has been analyzed (see `save`).
+
+        Raises:
+            `ValueError` if any of the parameters is defined incorrectly.
+        """
+
+        entry, key = self.entry(func), key_of(func)
+        spec = CommandSpec.of(func)
+
+        if entry is None or key is None:
+            self.misses += 1
+        elif key not in entry['checked']:
+            self.misses += 1
+            entry['checked'][key] = True
+            self._dirty.add(entry['path'])
+
+        return spec
+
+    def save(self):
+        """Writes all entries that have changed since the last save."""
+
+        for path in self._dirty:
+            self.write(self.file(path), self._entries[path])
+
+        self._dirty.clear()
+
+    def plugins(self, group: str) -> List[Tuple[str, str, str]]:
+        """Returns plugins registered for an entry point `group`.
+
+        Scanning installed distributions takes time proportional to their
+        number, so the found plugins are stored in an index, which is
+        rebuilt only when any directory on `sys.path` (e.g.,
+        `site-packages`) changes, that is, when a distribution is installed
+        or removed.
+
+        Returns:
+            A list of (<name>, <distribution-version>, <target>) tuples
+            sorted by name.
+        """
+
+        file = self.file(f'entry-points:{group}')
+        fingerprint = VERSION, sys.version_info[:2], tuple(
+            (x, stamp(x)) for x in sys.path)
+
+        try:
+            with open(file, 'rb') as f:
+                index = marshal.loads(f.read())
+        except (OSError, EOFError, ValueError, TypeError):
+            index = None
+
+        if isinstance(index, dict) and \
+                index.get('group') == group and \
+                index.get('fingerprint') == fingerprint:
+            self.hits += 1
+            return list(index['plugins'])
+
+        self.misses += 1
+        plugins = scanned(group)
+
+        self.write(file, {'group': group,
+                          'fingerprint': fingerprint,
+                          'plugins': tuple(plugins)})
+
+        return plugins
+
+    def write(self, file: str, data: Any):
+        """Writes `data` to a cache `file` (ignoring errors)."""
+
+        try:
+            os.makedirs(self.path, exist_ok=True)
+
+            # Write to a temporary file first, so concurrently started
+            # processes never read a partially written entry.
+            with open(f'{file}.{os.getpid()}', 'wb') as f:
+                marshal.dump(data, f)
+
+            os.replace(f'{file}.{os.getpid()}', file)
+        except OSError:
+            # The cache is only an optimization.
+            pass
+
+    def entry(self, func: Callable) -> Optional[Dict[str, Any]]:
+        """Returns an up-to-date cache entry of the module of `func`.
+
+        Returns `None` if the module does not have a file.
+        """
+
+        module = sys.modules.get(getattr(func, '__module__', None))
+        path = getattr(module, '__file__', None)
+
+        if path is None:
+            return None
+
+        entry = self._entries.get(path)
+
+        if entry is None:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                return None
+
+            fingerprint = VERSION, sys.version_info[:2], \
+                          stat.st_mtime_ns, stat.st_size
+
+            try:
+                with open(self.file(path), 'rb') as f:
+                    entry = marshal.loads(f.read())
+            except (OSError, EOFError, ValueError, TypeError):
+                entry = None
+
+            if not isinstance(entry, dict) or \
+                    entry.get('path') != path or \
+                    entry.get('fingerprint') != fingerprint or \
+                    not isinstance(entry.get('checked'), dict):
+                entry = {'path': path, 'fingerprint': fingerprint,
+                         'checked': {}}
+
+            self._entries[path] = entry
+
+        return entry
+
+    def file(self, path: str) -> str:
+        """Returns a path to the cache file of a module file `path`
+        (or of another key)."""
+
+        return os.path.join(self.path, f'{zlib.crc32(path.encode()):08x}')
+
+
+def key_of(func: Callable) -> Optional[str]:
+    """Returns a key of a function within its module.
+
+    The line number is included, since several functions of a module may
+    have the same qualified name.
+    """
+
+    code = getattr(func, '__code__', None)
+    name = getattr(func, '__qualname__', '<locals>')
+
+    if code is None or '<locals>' in name:
+        return None
+
+    return f'{name}:{code.co_firstlineno}'
+
+
+def located(name: str) -> Optional[Any]:
+    """Finds an object by its name in the `module:qualname` format."""
+
+    module, _, qualname = name.partition(':')
+
+    if '<locals>' in qualname:
+        return None
+
+    # Modules are never imported here: types of a command are expected
+    # to be defined by the time the command is.
+    x = sys.modules.get(module)
+
+    try:
+        for part in qualname.split('.'):
+            x = getattr(x, part)
+    except AttributeError:
+        return None
+
+    return x
+
+
+def scanned(group: str) -> List[Tuple[str, str, str]]:
+    """Finds plugins of an entry point `group` in installed distributions.
+
+    If several distributions define a plugin with the same name, the first
+    one found on `sys.path` is used (in the same way as for modules).
+    """
+
+    try:
+        from importlib import metadata
+    except ImportError:
+        import importlib_metadata as metadata
+
+    plugins = {}
+
+    for dist in metadata.distributions():
+        for entry in dist.entry_points:
+            if entry.group == group and entry.name not in plugins:
+                # Extras (e.g., `module:function [extra]`) are ignored.
+                target = entry.value.partition('[')[0].strip()
+                plugins[entry.name] = entry.name, dist.version, target
+
+    return sorted(plugins.values())
+
+
+def stamp(path: str) -> Optional[int]:
+    """Returns a modification time of a directory on `sys.path`."""
+
+    try:
+        return os.stat(path or '.').st_mtime_ns
+    except OSError:
+        return None
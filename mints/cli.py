@@ -1,10 +1,21 @@
-import inspect
 import sys
-from typing import Callable, Optional, Union, Iterable, Any, Type, Text
+from types import CoroutineType
+from typing import Callable, Optional, Union, Iterable, Any, Type, Text, \
+    List, TYPE_CHECKING
 
-from mints.command import Command
-from mints.parsers.parser import Parser
-from mints.parsers.standard import StandardParser
+from mints.command import Command, arguments
+from mints.spec import EMPTY, evaluated, signature_of
+
+if TYPE_CHECKING:
+    from asyncio import AbstractEventLoop
+    from mints.batch import Result
+    from mints.cache import Cache
+    from mints.parsers.parser import Invocation, Parser
+
+
+# An option to execute a batch of command lines from a file (or from `stdin`)
+# instead of a single command line (see `mints.batch.Batch`).
+BATCH = '--mints-batch'
 
 
 class CLI:
@@ -16,14 +27,28 @@ class CLI:
             (`mints.parsers.StandardParser` if not specified).
         parsers: A dictionary that contains parsers for custom types.
             Maps a custom type to a parser itself.
+        cache: A persistent cache of analyzed commands
+            (see `mints.cache.Cache`). Disabled if not specified.
+        revision: A number that is incremented each time the CLI changes
+            (for example, when a main command is set or a parser for a
+            custom type is added). Used by parsers to invalidate their caches.
+        loop: An event loop to run asynchronous (`async def`) commands on.
+            If not specified, a new loop is created for each call of the CLI
+            (see `asyncio.run`). Batch and resident modes may set a loop
+            to share it (and anything bound to it, such as connection pools)
+            across calls.
     """
 
     def __init__(self,
                  main: Optional[Command] = None,
-                 parser: Optional[Parser] = None):
+                 parser: Optional['Parser'] = None,
+                 cache: Optional['Cache'] = None):
         self.main = main
         self.parser = parser
+        self.cache = cache
         self.parsers = {}
+        self.revision = 0
+        self.loop = None
 
     def __call__(self,
                  args_or_func: Union[Iterable[str], Callable] = None,
@@ -39,6 +64,18 @@ class CLI:
                   be passed as ['--a=10', '--b=20'].
                   Is set to `argv[1:]` if not specified.
                 - A function to be set as the main command of the CLI.
+                If the arguments are `--mints-batch FILE` (or `-` instead
+                of `FILE` to read `stdin`), each line of the file is parsed
+                and executed as a separate command line, a summary is
+                printed to `stderr`, and `SystemExit` is raised with
+                an exit status of the batch (see `mints.batch.Batch`).
+                The lines are executed by `N` worker processes
+                if `--mints-jobs N` is specified as well, and their
+                results are reported as soon as they are done
+                if `--mints-unordered` is specified. Results are
+                recorded in a journal if `--mints-journal PATH` is
+                specified, so lines that have already succeeded are skipped
+                once the batch is restarted.
             **kwargs: Options for the main command (such as `name` or
                 `description`; refer to the documentation of `Command`
                 for a full list of available options).
@@ -46,6 +83,8 @@ class CLI:
         Raises:
             `ValueError` when
                 - setting the main command when it has already been set;
+                - setting the main command with incorrectly defined
+                  parameters;
                 - passing `kwargs` along with arguments to run the CLI with;
                 - running the CLI when the main command has not been set.
 
@@ -63,7 +102,8 @@ class CLI:
                 raise ValueError(f"Cannot set '{func.__name__}': the main "
                                  f"command has already been set.")
 
-            self.main = Command(func, **kwargs)
+            self.main = Command(func, cache=self.cache, **kwargs)
+            self.revision += 1
 
             return self.main
 
@@ -71,26 +111,227 @@ class CLI:
             if kwargs:
                 raise ValueError("Cannot run the CLI: "
                                  "`kwargs` are not expected.")
-            if self.main is None:
-                raise ValueError("Cannot run the CLI: "
-                                 "the main command is not set.")
 
-            parser = self.parser or StandardParser(self)
-            args = args if args is not None else sys.argv[1:]
+            args = list(args) if args is not None else sys.argv[1:]
 
-            command = self.main
-            context = None
+            if args[:1] == [BATCH]:
+                from mints.batch import launch
 
-            for invoke in parser.parse(args):
-                command, context = invoke(command, context)
+                raise SystemExit(launch(self, args))
 
-            return context
+            return self.execute(self.invocations(args))
 
         if callable(args_or_func):
             return set(args_or_func)
         else:
             return run(args_or_func)
 
+    def invocations(self, args: Optional[Iterable[str]] = None) \
+            -> List['Invocation']:
+        """Parses the command line arguments without executing anything.
+
+        Meant for cases when a command line has to be validated first and
+        then either executed (see `execute`), queued, forwarded to another
+        process, etc.
+
+        Args:
+            args: An iterable of command line arguments
+                (`argv[1:]` if not specified).
+
+        Returns:
+            A list of `Invocation`s with commands attached to them,
+            starting with the main command.
+
+        Raises:
+            `ValueError` if the main command has not been set.
+            `SystemExit` if the command line is invalid or a help page
+            is requested (in the same way as on `__call__`).
+            `ParseError` instead of `SystemExit` if the command line is
+            invalid and the parser is configured to raise errors
+            (see `StandardParser.exit_on_error`).
+
+        Examples:
+            invocations = cli.invocations(['deploy', '--region', 'eu'])
+
+            if invocations[-1].command.name == 'deploy':
+                queue.put(invocations)
+            else:
+                cli.execute(invocations)
+        """
+
+        if self.main is None:
+            raise ValueError("Cannot run the CLI: "
+                             "the main command is not set.")
+
+        # By now, all the commands are usually defined,
+        # so their specifications could be stored.
+        if self.cache is not None:
+            self.cache.save()
+
+        # The parser is kept between calls, so it could reuse
+        # anything it has compiled for the CLI.
+        if self.parser is None:
+            # Imported here, so `argparse` is not loaded
+            # until the CLI is actually run.
+            from mints.parsers.standard import StandardParser
+
+            self.parser = StandardParser(self)
+
+        args = args if args is not None else sys.argv[1:]
+        invocations = list(self.parser.parse(args))
+
+        # Specifications of commands with string annotations
+        # are computed only once the commands are parsed.
+        if self.cache is not None:
+            self.cache.save()
+
+        command = self.main
+
+        for invocation in invocations:
+            invocation.command = command
+
+            if invocation.next is not None:
+                command = command.subcommands[invocation.next]
+
+        return invocations
+
+    def execute(self, invocations: Iterable['Invocation']) -> Any:
+        """Executes invocations returned by `invocations`.
+
+        Once an asynchronous (`async def`) command is invoked, it and
+        the rest of the commands are executed on an event loop (see `loop`),
+        and results of asynchronous commands are awaited before they are
+        passed to subcommands.
+
+        Returns:
+            A result of the last executed command.
+        """
+
+        command = self.main
+        context = None
+        invocations = iter(invocations)
+
+        for invoke in invocations:
+            command, context = invoke(invoke.command or command, context)
+
+            if type(context) is CoroutineType:
+                return self.run(chained(context, command, invocations))
+
+        return context
+
+    def run(self, coroutine: Any) -> Any:
+        """Runs a coroutine on the `loop` (or on a new one) until it's done.
+        """
+
+        if self.loop is not None:
+            return self.loop.run_until_complete(coroutine)
+
+        # Imported here, so `asyncio` is not loaded
+        # unless there are asynchronous commands.
+        import asyncio
+
+        return asyncio.run(coroutine)
+
+    def invoke(self, *names: str, **kwargs: Any) -> Any:
+        """Invokes a command directly (without parsing a command line).
+
+        Meant for calling a CLI from Python code (tests, scripts, other
+        tools), where building a command line only to parse it back
+        is a waste. Parent commands are invoked with their default values.
+
+        Values are validated against the specification of the command:
+        a value of the declared type is passed as is, while a string is
+        converted in the same way as a parsed one.
+
+        Args:
+            names: Names of subcommands that lead to the command to invoke
+                (the main command if not specified).
+            kwargs: Values of parameters of the command.
+
+        Returns:
+            A result of the invoked command.
+
+        Raises:
+            `ValueError` if
+                - the main command has not been set;
+                - a subcommand is not found;
+                - a value is unknown, missing or has a wrong type.
+
+        Examples:
+            cli.invoke('deploy', 'update', region='eu', replicas=3)
+        """
+
+        from mints.parsers.parser import Invocation
+
+        if self.main is None:
+            raise ValueError("Cannot invoke the CLI: "
+                             "the main command is not set.")
+
+        invocations = []
+        command = self.main
+
+        for name in names:
+            # Arguments are resolved first, since loading a command
+            # defined by a target may define its subcommands.
+            args = arguments(command, {}, self.parsers)
+
+            if name not in command.subcommands:
+                raise ValueError(f"Cannot invoke the CLI: the command "
+                                 f"'{command.name}' does not have "
+                                 f"a subcommand '{name}'.")
+
+            invocations.append(Invocation(args, name, command))
+            command = command.subcommands[name]
+
+        invocations.append(Invocation(arguments(command, kwargs,
+                                                self.parsers),
+                                      None, command))
+
+        return self.execute(invocations)
+
+    def batch(self,
+              lines: Iterable[str],
+              jobs: int = 1,
+              ordered: bool = True,
+              journal: Optional[str] = None) -> List['Result']:
+        """Executes many command lines, one per line, in the same process
+        (or in a pool of worker processes).
+
+        A line is split as a shell would do, and a line that fails does not
+        stop the batch (see `mints.batch.Batch` for details).
+
+        Args:
+            lines: An iterable of command lines (e.g., an opened file).
+            jobs: A number of worker processes to execute the lines in
+                (`1` to execute them in the current process, `0` to start
+                a worker for each CPU).
+            ordered: Whether results of worker processes are returned
+                (and their output is written) in the order of the lines
+                or as soon as they are done.
+            journal: A path to a journal to record results of the lines in
+                (see `mints.batch.Journal`). If the batch is restarted with
+                the same journal, the lines that have already succeeded are
+                skipped.
+
+        Returns:
+            A list of `mints.batch.Result`s with an exit status and
+            a duration of each line.
+
+        Examples:
+            with open('lines.txt') as lines:
+                results = cli.batch(lines)
+
+            failed = [x.number for x in results if x.status != 0]
+        """
+
+        from mints.batch import Batch, Journal
+
+        if journal is None:
+            return list(Batch(self, jobs, ordered).run(lines))
+
+        with Journal(journal) as journal_:
+            return list(Batch(self, jobs, ordered, journal_).run(lines))
+
     def parse(self, func: Callable[[str], Any]) -> Callable[[str], Any]:
         """Defines a parser function for a custom type.
 
@@ -160,22 +401,23 @@ class CLI:
         if isinstance(callable, type):
             type_ = callable
         else:
-            signature = inspect.signature(callable)
-            parameter = next(iter(signature.parameters.values()), None)
+            parameters, type_ = signature_of(callable)
+            type_ = evaluated(type_, callable)
 
-            if len(signature.parameters) != 1:
+            if len(parameters) != 1:
                 raise ValueError(f"Expected a parser function "
                                  f"'{callable.__name__}' "
                                  f"to have a single parameter.")
-            if parameter.annotation not in (parameter.default, str, Any, Text):
+
+            parameter, = parameters
+
+            if parameter.annotation not in (EMPTY, str, Any, Text):
                 raise ValueError(f"Expected a parameter of a parser "
                                  f"function '{callable.__name__}' to be "
                                  f"either empty or 'str', but got "
                                  f"{parameter.annotation}.")
 
-            type_ = signature.return_annotation
-
-            if type_ is signature.empty:
+            if type_ is EMPTY:
                 raise ValueError(f"Expected a parser function "
                                  f"'{callable.__name__}' "
                                  f"to have a return annotation.")
@@ -189,9 +431,28 @@ class CLI:
                              f"(namely '{name}').")
 
         self.parsers[type_] = callable
+        self.revision += 1
 
         return callable
 
 
+async def chained(context: Any,
+                  command: Optional[Command],
+                  invocations: Iterable['Invocation']) -> Any:
+    """Awaits a result of an asynchronous command and executes the rest
+    of the `invocations` (awaiting results of asynchronous ones as well).
+    """
+
+    context = await context
+
+    for invoke in invocations:
+        command, context = invoke(invoke.command or command, context)
+
+        if type(context) is CoroutineType:
+            context = await context
+
+    return context
+
+
 cli: CLI = CLI()
 """A default instance of `CLI` for convenient use in most cases."""
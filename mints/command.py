@@ -1,17 +1,53 @@
-from typing import Callable, Optional, Union
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Optional, Union, \
+    TYPE_CHECKING
+import sys
+
+from mints.args.flag import Flag
+from mints.spec import CommandSpec, postponed, signature_of
+
+if TYPE_CHECKING:
+    from mints.cache import Cache
+
+
+# Subcommands of all commands without them (usually, most commands of
+# a large tree), so each of them does not keep its own empty dictionary.
+NO_SUBCOMMANDS = MappingProxyType({})
 
 
 class Command:
     """A command of a CLI.
 
+    A command may also be defined by a target in the `module:function`
+    format. In this case, the module is imported only when the function
+    or its parameters are actually needed (for example, when the command
+    is selected by a command line).
+
     Attributes:
         func: A function to be executed when the command is invoked.
+        target: A `module:function` string the function (or a command
+            with the function) is imported from (`None` if the function
+            was specified directly).
         name: A name of the command
-            (`func.__name__` if not explicitly specified).
+            (`func.__name__` or the name of the function in `target`
+            if not explicitly specified).
         description: A description of the command
             (`func.__doc__` if not explicitly specified).
+        spec: A specification of the command parameters
+            (computed from `func` when the command is defined
+            or when `func` is imported; or when it's first needed
+            if `func` has string annotations or has already been
+            analyzed, see `cache`).
+        cache: A cache of analyzed commands
+            (see `mints.cache.Cache`). Inherited by subcommands.
         subcommands: A dictionary that maps a subcommand name
-            to the subcommand itself.
+            to the subcommand itself (a shared read-only empty mapping
+            until the first subcommand is defined).
+        parent: A command this command is a subcommand of
+            (`None` for a top-level command).
+        revision: A number that is incremented each time the command
+            or one of its subcommands changes (for example, when a new
+            subcommand is defined).
 
     Examples:
         @cli
@@ -30,18 +66,123 @@ class Command:
             cli('merge --branch develop'.split())
     """
 
+    __slots__ = ('help_', 'cache', 'subcommands', 'parent', 'revision',
+                 'target', 'name', '_description', '_func', '_spec')
+
     def __init__(self,
-                 func: Callable,
+                 func: Union[Callable, str],
                  name: Optional[str] = None,
-                 description: Optional[str] = None):
-        self.func = func
-        self.name = name or func.__name__
+                 description: Optional[str] = None,
+                 cache: Optional['Cache'] = None):
         self.help_ = None
-        self.description = description or func.__doc__
-        self.subcommands = {}
+        self.cache = cache
+        self.subcommands = NO_SUBCOMMANDS
+        self.parent = None
+        self.revision = 0
+        self._func = None
+        self._spec = None
+
+        if isinstance(func, str):
+            module, _, qualname = func.partition(':')
+
+            if not module or not qualname:
+                raise ValueError(f"Cannot define a command '{func}': "
+                                 f"expected a target in the "
+                                 f"`module:function` format.")
+
+            self.target = func
+            self.name = sys.intern(name or qualname.rpartition('.')[2])
+            self._description = description
+        else:
+            self.target = None
+            self.name = sys.intern(name or func.__name__)
+            self._description = description or func.__doc__
+            self.load(func)
+
+    @property
+    def func(self) -> Callable:
+        if self._func is None:
+            self.load(imported(self.target))
+
+        return self._func
+
+    @property
+    def description(self) -> Optional[str]:
+        return self._description or self.func.__doc__
+
+    @description.setter
+    def description(self, value: Optional[str]):
+        self._description = value
+
+    @property
+    def spec(self) -> CommandSpec:
+        if self._func is None:
+            self.load(imported(self.target))
+
+        if self._spec is None:
+            self._spec = self.cache.spec(self._func) \
+                if self.cache is not None else CommandSpec.of(self._func)
+
+        return self._spec
+
+    @spec.setter
+    def spec(self, value: CommandSpec):
+        self._spec = value
+
+    def load(self, func: Union[Callable, 'Command']):
+        """Sets the function of the command and computes its specification.
+
+        If `func` is a command itself (for example, a target refers to
+        a decorated function), its function and specification are reused,
+        and so are its help and description (unless the command has its
+        own), while its subcommands become subcommands of this command
+        (unless subcommands with the same names are already defined,
+        as in a tree restored from a bundle manifest).
+
+        If `func` has string annotations (for example, it's defined in
+        a module with `from __future__ import annotations`), the
+        specification is computed only when it's first needed, so the
+        annotations are not evaluated (and may refer to names defined
+        later in the module) until then. The same is true for a function
+        that the `cache` has already seen analyzed without errors.
+
+        Raises:
+            `ValueError` if any of the parameters is defined incorrectly.
+        """
+
+        if isinstance(func, Command):
+            self._spec, self._func = func.spec, func.func
+
+            if self.help_ is None:
+                self.help_ = func.help_
+
+            if self._description is None:
+                self._description = func._description
+
+            adopted = {k: v for k, v in func.subcommands.items()
+                       if k not in self.subcommands}
+
+            if adopted:
+                if self.subcommands is NO_SUBCOMMANDS:
+                    self.subcommands = {}
+
+                for name, subcommand in adopted.items():
+                    subcommand.parent = self
+                    self.subcommands[name] = subcommand
+
+                self.changed()
+
+            return
+
+        self._func = func
+        self._spec = None
+
+        if not postponed(func) and \
+                not (self.cache is not None and self.cache.checked(func)):
+            self._spec = self.spec
 
     def command(self,
-                func: Optional[Callable] = None,
+                func: Optional[Union[Callable, str]] = None,
                 name: Optional[str] = None,
                 description: Optional[str] = None) \
             -> Union[Callable, 'Command']:
@@ -49,33 +190,170 @@ class Command:
 
         A subcommand is executed right after the parent one,
         and the latter may also return a value that will be passed
-        as an argument to the subcommand.
+        as an argument to the subcommand (namely, to the first parameter
+        that is not annotated with `Arg`, `Opt` or `Flag`, see
+        `context_of`). A generator returned by the parent command is
+        passed as is, so the subcommand may consume it lazily.
 
         Args:
-            func: A function to be executed when the subcommand is invoked.
+            func: A function to be executed when the subcommand is invoked
+                or a `module:function` string to import the function from
+                once it is needed.
             name: A name of the subcommand
-                (`func.__name__` if not explicitly specified).
+                (`func.__name__` or the name of the function in a target
+                if not explicitly specified).
             description: A description of the subcommand
                 (`func.__doc__` if not explicitly specified).
 
         Returns:
             Either an instance of `Command` if `func` was specified
             or a decorator to wrap a function with.
+
+        Raises:
+            `ValueError` if either a command with the same name has already
+            been defined or any of the parameters is defined incorrectly.
+
+        Examples:
+            git.command('myapp.fetch:fetch', description='Fetches a remote.')
+
+            @tool.command
+            def read(path: Arg):
+                with open(path) as file:
+                    yield from file
+
+            @read.command
+            def count(lines: Iterable[str]):
+                return sum(1 for _ in lines)
         """
 
         def define(x):
-            command = Command(x, name, description)
+            command = Command(x, name, description, self.cache)
 
             if command.name in self.subcommands:
                 raise ValueError(f'A command `{command.name}` has '
                                  f'already been defined.')
 
+            if self.subcommands is NO_SUBCOMMANDS:
+                self.subcommands = {}
+
+            command.parent = self
             self.subcommands[command.name] = command
+            self.changed()
 
             return command
 
         return define(func) if func is not None else define
 
+    def plugins(self, group: str) -> List['Command']:
+        """Defines subcommands from plugins of installed distributions.
+
+        A plugin is an entry point in the `group` that refers to
+        a command function (or a decorated command) in the `module:function`
+        format. The found plugins are stored in an index of the `cache`
+        (a default `mints.cache.Cache` if not specified), so installed
+        distributions are scanned only when they change. The module of
+        a plugin is imported only when the subcommand is actually needed.
+
+        Args:
+            group: A name of the entry point group.
+
+        Returns:
+            A list of the defined subcommands.
+
+        Raises:
+            `ValueError` if a plugin has the same name as an already
+            defined subcommand.
+
+        Examples:
+            # In `setup.py` of a plugin:
+            entry_points={'git.commands': ['lfs = git_lfs.cli:lfs']}
+
+            # In the CLI:
+            git.plugins('git.commands')
+        """
+
+        if self.cache is None:
+            from mints.cache import Cache
+
+            cache = Cache()
+        else:
+            cache = self.cache
+
+        return [self.command(target, name=name)
+                for name, _, target in cache.plugins(group)]
+
+    def compact(self) -> 'Command':
+        """Reduces the memory used by the command and all of its subcommands.
+
+        Meant for large generated trees (for example, thousands of commands
+        built from a service catalog): equal specifications with the same
+        default values (of commands defined by the same function, etc.) are
+        shared and descriptions are interned. Subcommands may still be defined afterwards.
+
+        Returns:
+            The command itself.
+        """
+
+        specs = {}
+        commands = [self]
+
+        while commands:
+            command = commands.pop()
+            description = command._description
+            spec = command._spec
+
+            if type(description) is str:
+                command._description = sys.intern(description)
+
+            if spec is not None:
+                # Defaults are compared by identity, since equal values
+                # may differ in type (e.g., `1 == True` or `(1,) == (1.0,)`)
+                # and lists are not hashable.
+                key = spec._replace(params=tuple(
+                    x._replace(default=id(x.default)) for x in spec.params))
+
+                command._spec = specs.setdefault(key, spec)
+
+            commands.extend(command.subcommands.values())
+
+        return self
+
+    def changed(self):
+        """Marks the command and all of its parents as changed.
+
+        Parsers that cache anything built from a command tree compare
+        `revision` of the top-level command to find out whether the cache
+        is still valid.
+        """
+
+        command = self
+
+        while command is not None:
+            command.revision += 1
+            command = command.parent
+
+    def invoke(self, **kwargs: Any) -> Any:
+        """Invokes the function of the command directly (without parsing
+        a command line).
+
+        Values are validated against the specification of the command
+        in the same way as parsed ones (see `arguments`), so they may be
+        passed either as objects of the declared types or as strings.
+        A value of the parameter that accepts a result of the parent
+        command (see `context_of`) is passed as is.
+
+        Returns:
+            A result of the function.
+
+        Raises:
+            `ValueError` if any of the values is missing or invalid.
+
+        Examples:
+            deploy.invoke(service='api', replicas=3)
+        """
+
+        return self.func(**arguments(self, kwargs))
+
     def help(self, func: Callable[['Command'], str]) -> Callable:
         """Defines a callable to be called for `--help`.
 
@@ -101,3 +379,131 @@ class Command:
         self.help_ = func
 
         return func
+
+
+def imported(target: str) -> Any:
+    """Imports an object specified in the `module:qualname` format."""
+
+    import importlib
+
+    module, _, qualname = target.partition(':')
+    x = importlib.import_module(module)
+
+    for part in qualname.split('.'):
+        try:
+            x = getattr(x, part)
+        except AttributeError:
+            raise ValueError(f"Cannot import '{target}': "
+                             f"'{part}' is not found.") from None
+
+    return x
+
+
+def arguments(command: Command,
+              values: Dict[str, Any],
+              parsers: Optional[Dict[type, Callable]] = None) \
+        -> Dict[str, Any]:
+    """Validates values of parameters of a command passed from Python code.
+
+    A value that is already an instance of the declared type is passed as
+    is, while a string is converted in the same way as a parsed one (with
+    a parser from `parsers` if there is one for the type). Missing values
+    of flags and optional parameters are replaced with their defaults.
+
+    Returns:
+        A dictionary of keyword arguments for the function of the command.
+
+    Raises:
+        `ValueError` if a value is unknown, missing or has a wrong type.
+    """
+
+    parsers = parsers or {}
+    spec = command.spec
+    names = set(x.name for x in spec.params)
+    unknown = set(values).difference(names)
+
+    # A result of the parent command may also be passed directly.
+    if unknown:
+        unknown.discard(context_of(command))
+
+    if unknown:
+        raise ValueError(f"Cannot invoke '{command.name}': unexpected "
+                         f"arguments {', '.join(map(repr, sorted(unknown)))}.")
+
+    args = {k: v for k, v in values.items() if k not in names}
+
+    for param in spec.params:
+        convert = parsers.get(param.type, param.type) \
+            if param.type is not None else None
+
+        def checked(value):
+            if param.type is None:
+                if not isinstance(value, str):
+                    raise ValueError(f"Cannot invoke '{command.name}': "
+                                     f"expected a string for '{param.name}' "
+                                     f"but got {value!r}.")
+                return value
+            if isinstance(param.type, type) and \
+                    isinstance(value, param.type):
+                return value
+            if isinstance(value, str):
+                return convert(value)
+            if not isinstance(param.type, type):
+                return value
+
+            raise ValueError(f"Cannot invoke '{command.name}': expected "
+                             f"{param.type.__name__} for '{param.name}' "
+                             f"but got {value!r}.")
+
+        if param.name not in values:
+            if param.required:
+                raise ValueError(f"Cannot invoke '{command.name}': "
+                                 f"the argument '{param.name}' is missing.")
+
+            default = param.default
+
+            # `argparse` also converts default values of options
+            # if they are strings.
+            if convert is not None and isinstance(default, str):
+                default = checked(default)
+
+            args[param.name] = default
+        elif param.kind is Flag:
+            if not isinstance(values[param.name], bool):
+                raise ValueError(f"Cannot invoke '{command.name}': expected "
+                                 f"a `bool` value for the flag "
+                                 f"'{param.name}' but got "
+                                 f"{values[param.name]!r}.")
+
+            args[param.name] = values[param.name]
+        elif param.many:
+            value = values[param.name]
+
+            if isinstance(value, str) or \
+                    not isinstance(value, (list, tuple)):
+                raise ValueError(f"Cannot invoke '{command.name}': expected "
+                                 f"a list for '{param.name}' but got "
+                                 f"{value!r}.")
+
+            args[param.name] = list(map(checked, value))
+        else:
+            args[param.name] = checked(values[param.name])
+
+    return args
+
+
+def context_of(command: Command) -> Optional[str]:
+    """Returns a name of the parameter of a command that accepts a result
+    of its parent command (`None` if there is no such parameter).
+
+    It's the first parameter that is not a part of the command line,
+    i.e. the one that is not annotated with `Arg`, `Opt` or `Flag`.
+    """
+
+    names = set(x.name for x in command.spec.params)
+
+    for param in signature_of(command.func)[0]:
+        if param.name not in names:
+            return param.name
+
+    return None
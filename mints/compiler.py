@@ -0,0 +1,426 @@
+from typing import Any, Dict, Iterator, List, Tuple
+import ast
+import os
+
+from mints.args.arg import Arg
+from mints.args.flag import Flag
+from mints.cache import located
+from mints.command import Command
+from mints.parsers.compiled import fingerprint, name_of
+
+
+# A width of a terminal help pages are formatted for.
+COLUMNS = 80
+
+HEADER = '''\
+"""A parser of `{target}` generated by `mints compile`.
+
+Do not edit: the module is generated from the command functions and
+is checked against them at run time (see `mints.parsers.CompiledParser`).
+"""
+
+{imports}from mints.parsers.compiled import Help, Unsupported, end_of, many, one
+from mints.parsers.parser import Invocation
+
+TARGET = {target!r}
+COLUMNS = {columns!r}
+
+FINGERPRINTS = {fingerprints}
+
+HELP = {help}
+
+{converters}
+
+
+def parse(args):
+    invocations = []
+    parse_ = _parse_0
+    i, n = 0, len(args)
+
+    while parse_ is not None:
+        values, next, i, parse_ = parse_(args, i, n)
+        invocations.append(Invocation(values, next))
+
+    return invocations
+'''
+
+
+class Compiler:
+    """Generates the source code of a module for `CompiledParser`.
+
+    For each command of a CLI, the module contains a function that parses
+    the arguments of the command in a single pass (in the same way as
+    `FastParser` does), with the options, the defaults and the converters
+    of the command inlined into the code.
+
+    Attributes:
+        cli: An instance of `CLI` to compile.
+        target: A name of the CLI in the `module:attribute` format
+            (used to tell how to regenerate the module).
+    """
+
+    def __init__(self, cli, target: str):
+        self.cli = cli
+        self.target = target
+        self._converters = {}
+        self._modules = {}
+
+    def source(self) -> str:
+        """Generates the source code of the module.
+
+        Raises:
+            `ValueError` if the CLI cannot be compiled (for example, if
+            a converter cannot be imported by its name or a default value
+            cannot be written as a literal).
+        """
+
+        commands = list(walk(self.cli.main))
+        functions = [self.function(i, path, command)
+                     for i, (path, command) in enumerate(commands)]
+
+        index = {path: i for i, (path, _) in enumerate(commands)}
+        tables = []
+
+        for i, (path, command) in enumerate(commands):
+            if command.subcommands:
+                items = ', '.join(f'{x!r}: _parse_{index[path + (x,)]}'
+                                  for x in command.subcommands)
+                tables.append(f'_COMMANDS_{i} = {{{items}}}')
+
+        fingerprints = {path: fingerprint(command, self.cli.parsers)
+                        for path, command in commands}
+
+        header = HEADER.format(
+            target=self.target,
+            columns=COLUMNS,
+            imports=''.join(f'import {x} as {name}\n'
+                            for x, name in self._modules.items()) +
+                    ('\n' if self._modules else ''),
+            fingerprints=literal(fingerprints),
+            help=literal(self.help(commands)),
+            converters='\n'.join(f'{name} = {source}'
+                                 for name, source
+                                 in self._converters.values()))
+
+        parts = [header.rstrip('\n'), *functions, *tables]
+
+        return '\n\n\n'.join(parts) + '\n'
+
+    def function(self, i: int, path: Tuple[str, ...], command: Command) \
+            -> str:
+        """Generates a function that parses the arguments of a command."""
+
+        spec = command.spec
+        prefixes = spec.prefixes
+        positionals = [x for x in spec.params if x.kind is Arg]
+        lists = any(x.many for x in positionals)
+        commands = bool(command.subcommands)
+        singles = sum(not x.many for x in positionals)
+
+        default = '-' if '-' in prefixes else prefixes[0]
+        table = {default + 'h': -1, default * 2 + 'help': -1}
+
+        seen = []
+        checks = []
+        conversions = []
+        defaults = {}
+        branches = []
+
+        for j, param in enumerate(spec.params):
+            if param.kind is Arg:
+                defaults[param.name] = None
+                continue
+
+            strings = param.strings
+            dest = strings[0].lstrip(prefixes).replace('-', '_')
+            convert = self.converter(param.type)
+
+            table.update((x, j) for x in strings)
+            defaults[dest] = constant(param.default, command, param.name)
+
+            if param.kind is Flag:
+                body = [f'values[{dest!r}] = True']
+            elif param.many:
+                body = [f'j = end_of(args, i, {prefixes!r})',
+                        f'values[{dest!r}] = '
+                        f'{converted(convert, "args[i:j]", True)}',
+                        'i = j']
+            else:
+                body = [f'if i < n and not '
+                        f'(args[i] and args[i][0] in {prefixes!r}):',
+                        f'    values[{dest!r}] = '
+                        f'{converted(convert, "args[i]", False)}',
+                        '    i += 1',
+                        'else:',
+                        '    raise Unsupported']
+
+            if param.kind is not Flag and param.required:
+                checks.append(dest)
+                seen.append(dest)
+            elif convert is not None and isinstance(param.default, str):
+                # `argparse` also converts default values of options
+                # if they are strings.
+                conversions.append(
+                    f'if {dest!r} not in seen:\n'
+                    f'    values[{dest!r}] = '
+                    f'{converted(convert, repr(param.default), False)}')
+                seen.append(dest)
+
+            if dest in seen:
+                body.append(f'seen.add({dest!r})')
+
+            branches.append((j, body))
+
+        lines = [f'def _parse_{i}(args, i, n):']
+
+        if commands and lists:
+            # `argparse` matches list arguments and a subcommand name
+            # against the same tokens (see `FastParser`).
+            lines.append('    raise Unsupported')
+            return '\n'.join(lines)
+
+        lines += [f'    values = {defaults!r}',
+                  '    positionals = []',
+                  '    next = None']
+
+        if seen:
+            lines.append('    seen = set()')
+        if lists:
+            lines.append('    split = False')
+        if commands:
+            lines.append('    parse_ = None')
+
+        lines += ['',
+                  '    while i < n:',
+                  '        token = args[i]',
+                  '',
+                  f'        if token and token[0] in {prefixes!r}:',
+                  f'            option = _OPTIONS_{i}.get(token)',
+                  '            i += 1',
+                  '']
+
+        keyword = 'if'
+
+        for j, body in branches:
+            lines.append(f'            {keyword} option == {j}:')
+            lines += indented(body, 16)
+            keyword = 'elif'
+
+        lines += [f'            {keyword} option == -1 and not positionals:',
+                  f'                raise Help({path!r})',
+                  '            else:',
+                  '                raise Unsupported']
+
+        if lists:
+            lines += ['',
+                      '            split = split or bool(positionals)']
+
+        if commands:
+            lines += [f'        elif len(positionals) == {len(positionals)}:',
+                      f'            parse_ = _COMMANDS_{i}.get(token)',
+                      '',
+                      '            if parse_ is None:',
+                      '                raise Unsupported',
+                      '',
+                      '            next = token',
+                      '            i += 1',
+                      '            break']
+
+        lines += ['        else:']
+
+        if lists:
+            # Positional tokens after a flag or an option are not supported
+            # (`split`), so all of them are taken by a single run.
+            lines += ['            if split:',
+                      '                raise Unsupported',
+                      '',
+                      f'            j = end_of(args, i, {prefixes!r})',
+                      '            positionals = args[i:j]',
+                      '            i = j',
+                      '']
+        else:
+            lines += ['            positionals.append(token)',
+                      '            i += 1',
+                      '']
+
+        if checks:
+            condition = ' or '.join(f'{x!r} not in seen' for x in checks)
+            lines += [f'    if {condition}:',
+                      '        raise Unsupported',
+                      '']
+
+        lines += indented(self.allocation(positionals, singles))
+
+        if conversions:
+            lines += [''] + indented('\n\n'.join(conversions).splitlines())
+        lines += ['',
+                  f'    return values, next, i, '
+                  f'{"parse_" if commands else "None"}']
+
+        table = literal(table)
+
+        return f'_OPTIONS_{i} = {table}\n\n\n' + '\n'.join(lines)
+
+    def allocation(self, positionals: List[Any], singles: int) -> List[str]:
+        """Generates lines that distribute positional tokens between
+        positional arguments (see `Table.allocate` in `FastParser`)."""
+
+        lists = any(x.many for x in positionals)
+
+        if lists:
+            lines = [f'rest = len(positionals) - {singles}',
+                     '',
+                     'if rest < 0:',
+                     '    raise Unsupported']
+        else:
+            lines = [f'if len(positionals) != {singles}:',
+                     '    raise Unsupported']
+
+        if positionals:
+            lines.append('')
+
+        before, first = 0, True
+
+        for param in positionals:
+            convert = self.converter(param.type)
+
+            if param.many and first and singles == 0:
+                # The list is taken entirely, so it's not copied once again.
+                value = 'positionals'
+                first = False
+            elif param.many and first:
+                value = f'positionals[{before}:{before} + rest]'
+                first = False
+            elif param.many:
+                value = '[]'
+            elif first:
+                value = f'positionals[{before}]'
+                before += 1
+            else:
+                value = f'positionals[{before} + rest]'
+                before += 1
+
+            lines.append(f'values[{param.name!r}] = '
+                         f'{converted(convert, value, param.many)}')
+
+        return lines
+
+    def converter(self, type_: Any) -> Any:
+        """Returns a name of a global variable bound to a converter of values
+        of the `type_` (`None` if values are kept as strings)."""
+
+        if type_ is None:
+            return None
+
+        convert = self.cli.parsers.get(type_, type_)
+
+        if id(convert) in self._converters:
+            return self._converters[id(convert)][0]
+
+        name = name_of(convert)
+
+        if located(name) is not convert:
+            raise ValueError(f"Cannot compile a converter '{name}': "
+                             f"it cannot be imported by its name.")
+
+        module, _, qualname = name.partition(':')
+
+        if module == 'builtins':
+            source = qualname
+        else:
+            alias = self._modules.setdefault(module, f'_m{len(self._modules)}')
+            source = f'{alias}.{qualname}'
+
+        self._converters[id(convert)] = \
+            f'_c{len(self._converters)}', source
+
+        return self._converters[id(convert)][0]
+
+    def help(self, commands: List[Tuple[Tuple[str, ...], Command]]) \
+            -> Dict[Tuple[str, ...], str]:
+        """Formats help pages of all commands that do not have custom ones."""
+
+        from mints.parsers.standard import configured, new_parser
+
+        parsers = dict(walk_parsers(configured(new_parser, self.cli.main,
+                                               self.cli.parsers)))
+        columns = os.environ.get('COLUMNS')
+        os.environ['COLUMNS'] = str(COLUMNS)
+
+        try:
+            return {path: parsers[path].format_help()
+                    for path, command in commands
+                    if command.help_ is None}
+        finally:
+            if columns is None:
+                del os.environ['COLUMNS']
+            else:
+                os.environ['COLUMNS'] = columns
+
+
+def walk(command: Command, path: Tuple[str, ...] = ()) \
+        -> Iterator[Tuple[Tuple[str, ...], Command]]:
+    """Yields all commands of a tree with their paths of names."""
+
+    yield path, command
+
+    for name, subcommand in command.subcommands.items():
+        yield from walk(subcommand, path + (name,))
+
+
+def walk_parsers(parser: Any, path: Tuple[str, ...] = ()) \
+        -> Iterator[Tuple[Tuple[str, ...], Any]]:
+    """Yields all `argparse` parsers of a tree with their paths of names."""
+
+    from argparse import _SubParsersAction
+
+    yield path, parser
+
+    for action in parser._actions:
+        if isinstance(action, _SubParsersAction):
+            for name, subparser in action._name_parser_map.items():
+                yield from walk_parsers(subparser, path + (name,))
+
+
+def indented(lines: List[str], width: int = 4) -> List[str]:
+    """Indents non-empty lines of code."""
+
+    return [' ' * width + x if x else x for x in lines]
+
+
+def converted(convert: Any, value: str, many: bool) -> str:
+    """Generates an expression that converts a value."""
+
+    if convert is None:
+        return value
+    if many:
+        return f'many({convert}, {value})'
+
+    return f'one({convert}, {value})'
+
+
+def constant(value: Any, command: Command, name: str) -> Any:
+    """Validates that a default value can be written as a literal."""
+
+    try:
+        restored = ast.literal_eval(repr(value))
+    except (ValueError, SyntaxError):
+        restored = not value
+
+    if type(restored) is not type(value) or restored != value:
+        raise ValueError(f"Cannot compile a default value of the parameter "
+                         f"'{name}' of the command '{command.name}': "
+                         f"it cannot be written as a literal.")
+
+    return value
+
+
+def literal(value: Dict) -> str:
+    """Formats a dictionary with one item per line."""
+
+    if not value:
+        return '{}'
+
+    items = ''.join(f'    {k!r}: {v!r},\n' for k, v in value.items())
+
+    return f'{{\n{items}}}'
@@ -1,2 +1,20 @@
 from mints.parsers.parser import Parser
-from mints.parsers.standard import StandardParser
+
+
+def __getattr__(name):
+    # Parsers are imported on first access, so importing `mints.parsers`
+    # (or `mints.parsers.parser`) does not load `argparse`.
+    if name == 'StandardParser':
+        from mints.parsers.standard import StandardParser
+        return StandardParser
+    if name == 'FastParser':
+        from mints.parsers.fast import FastParser
+        return FastParser
+    if name == 'CompiledParser':
+        from mints.parsers.compiled import CompiledParser
+        return CompiledParser
+    if name == 'MemoParser':
+        from mints.parsers.memo import MemoParser
+        return MemoParser
+
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
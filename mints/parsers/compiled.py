@@ -0,0 +1,214 @@
+from types import ModuleType
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+import sys
+import zlib
+
+from mints.command import Command
+from mints.parsers.fast import Unsupported, end_of
+from mints.parsers.parser import Parser, Invocation
+
+
+class Help(Exception):
+    """Raised by a compiled module when a help page is requested.
+
+    Attributes:
+        path: A path of names of the command to show the help page of
+            (an empty tuple for the main command).
+    """
+
+    def __init__(self, path: Tuple[str, ...]):
+        super().__init__(path)
+        self.path = path
+
+
+class CompiledParser(Parser):
+    """A parser that uses a module generated by `mints compile`.
+
+    The module contains straight-line code to parse command lines of
+    the exact command tree of a CLI and precomputed help pages, so neither
+    the command functions nor `argparse` are analyzed at run time.
+
+    Anything the module does not handle by itself (errors, abbreviations,
+    help pages for a terminal of another width, etc.) is delegated to
+    the `fallback` parser, in the same way as `FastParser` does.
+
+    Before a command line is accepted, the parser checks that the commands
+    it selects have not changed since the module was generated.
+
+    Attributes:
+        cli: An instance of `CLI` to parse command lines for.
+        module: A compiled module or its name. If the module cannot be found
+            (e.g., it has not been generated yet), all command lines are
+            parsed by the `fallback` parser.
+        fallback: A parser to delegate unsupported command lines to
+            (`StandardParser` if not specified).
+        strict: Whether to check that the commands have not changed since
+            the module was generated (may be disabled if they cannot
+            change, for example, in a zipapp built by `mints build`).
+
+    Examples:
+        $ python -m mints compile mypkg.cli:cli -o mypkg/_cli_compiled.py
+
+        cli.parser = CompiledParser(cli, 'mypkg._cli_compiled')
+    """
+
+    def __init__(self,
+                 cli,
+                 module: Union[str, ModuleType],
+                 fallback: Optional[Parser] = None,
+                 strict: bool = True):
+        self.cli = cli
+        self.module = module
+        self.strict = strict
+        self._fallback = fallback
+        self._fingerprints = {}
+
+    @property
+    def fallback(self) -> Parser:
+        if self._fallback is None:
+            from mints.parsers.standard import StandardParser
+
+            self._fallback = StandardParser(self.cli)
+
+        return self._fallback
+
+    def parse(self, args: Iterable[str]) -> Iterable[Invocation]:
+        args = args if isinstance(args, list) else list(args)
+        module = self.compiled()
+
+        if module is None:
+            return self.fallback.parse(args)
+
+        try:
+            invocations = module.parse(args)
+        except Help as e:
+            if self.strict:
+                self.check(e.path)
+
+            text = module.HELP.get(e.path)
+
+            if text is None or columns() != module.COLUMNS:
+                return self.fallback.parse(args)
+
+            sys.stdout.write(text)
+            raise SystemExit(0)
+        except Unsupported:
+            return self.fallback.parse(args)
+
+        if self.strict:
+            self.check(tuple(x.next for x in invocations[:-1]))
+
+        return invocations
+
+    def compiled(self) -> Optional[ModuleType]:
+        """Returns the compiled module (importing it if needed)."""
+
+        if isinstance(self.module, str):
+            import importlib
+
+            try:
+                self.module = importlib.import_module(self.module)
+            except ModuleNotFoundError as e:
+                if e.name != self.module:
+                    raise
+
+                return None
+
+        return self.module
+
+    def check(self, path: Tuple[str, ...]):
+        """Checks that the commands on the `path` have not changed.
+
+        Raises:
+            `ValueError` if any of the commands has changed since
+            the module was generated.
+        """
+
+        command = self.cli.main
+        fingerprints = self.module.FINGERPRINTS
+
+        for i in range(len(path) + 1):
+            if i > 0:
+                command = command.subcommands.get(path[i - 1])
+
+            if command is None or \
+                    fingerprints.get(path[:i]) != self.fingerprint(command):
+                name = ' '.join(path[:i]) or 'main'
+
+                raise ValueError(f"The compiled module "
+                                 f"'{self.module.__name__}' is stale: "
+                                 f"the {name} command has changed since "
+                                 f"it was generated. Run `python -m mints "
+                                 f"compile {self.module.TARGET} -o <file>` "
+                                 f"again.")
+
+    def fingerprint(self, command: Command) -> int:
+        """Returns a fingerprint of the `command` (computing it if needed)."""
+
+        key = command.revision, self.cli.revision
+        cached = self._fingerprints.get(command)
+
+        if cached is None or cached[0] != key:
+            cached = key, fingerprint(command, self.cli.parsers)
+            self._fingerprints[command] = cached
+
+        return cached[1]
+
+
+def fingerprint(command: Command, parsers: Dict[type, Any]) -> int:
+    """Computes a fingerprint of everything a compiled module depends on.
+
+    That is, the name and the description of the command, its parameters,
+    converters of their values and the names of its subcommands.
+    """
+
+    spec = command.spec
+    params = []
+
+    for x in spec.params:
+        convert = parsers.get(x.type, x.type) if x.type is not None else None
+
+        params.append((x.name, x.kind.__name__, name_of(convert), x.many,
+                       x.description, x.short, x.prefix, repr(x.default),
+                       x.required))
+
+    state = command.name, command.description, command.help_ is None, \
+        spec.prefixes, params, list(command.subcommands)
+
+    return zlib.crc32(repr(state).encode())
+
+
+def name_of(x: Any) -> Optional[str]:
+    """Returns a name of an object in the `module:qualname` format."""
+
+    if x is None:
+        return None
+
+    return f'{getattr(x, "__module__", None)}:' \
+           f'{getattr(x, "__qualname__", "<locals>")}'
+
+
+def columns() -> int:
+    """Returns a width of the terminal in the same way as `argparse` does."""
+
+    import shutil
+
+    return shutil.get_terminal_size().columns
+
+
+def many(convert: Any, values: List[str]) -> List[Any]:
+    """Converts a list of values for a compiled module."""
+
+    try:
+        return list(map(convert, values))
+    except Exception:
+        raise Unsupported
+
+
+def one(convert: Any, value: str) -> Any:
+    """Converts a single value for a compiled module."""
+
+    try:
+        return convert(value)
+    except Exception:
+        raise Unsupported
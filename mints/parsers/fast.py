@@ -0,0 +1,372 @@
+from bisect import bisect_left
+from itertools import compress, count, repeat
+from typing import Iterable, Any, Callable, Dict, List, Optional, Tuple
+
+from mints.args.arg import Arg
+from mints.args.flag import Flag
+from mints.command import Command
+from mints.parsers.parser import Parser, Invocation
+from mints.parsers.trie import Trie
+
+
+class Unsupported(Exception):
+    """Raised when a command line has to be parsed by a fallback parser."""
+
+
+class Option:
+    """A named argument of a command (either a flag or an option).
+
+    Attributes:
+        dest: A key to store a value of the argument with.
+        flag: Whether the argument is a flag.
+        many: Whether the argument accepts a list of values.
+        convert: A function to convert a value with (`None` if a value
+            should be kept as a string).
+    """
+
+    def __init__(self,
+                 dest: str,
+                 flag: bool,
+                 many: bool,
+                 convert: Optional[Callable]):
+        self.dest = dest
+        self.flag = flag
+        self.many = many
+        self.convert = convert
+
+
+class Table:
+    """Precomputed tables to parse a command line of a single command.
+
+    Attributes:
+        command: A command the table is computed for.
+        prefixes: A string of characters that start flags and options.
+        options: A dictionary that maps an option string (such as `--x`,
+            `-x` or `++x`) to an `Option`.
+        strings: A sorted list of all option strings (including the ones
+            reserved for help) to look abbreviations up in.
+        positionals: A list of positional arguments as tuples of
+            (<name>, <many>, <convert>).
+        defaults: A dictionary of default values of all arguments
+            in the order they are declared.
+        required: A set of names of options that must be specified.
+        conversions: A list of (<name>, <convert>) pairs of options
+            that have a type to convert their values to.
+        singles: A number of positional arguments that are not lists.
+        trie: A prefix tree of names of the subcommands to resolve their
+            abbreviations with (`None` if there are no subcommands).
+    """
+
+    def __init__(self, command: Command, parsers: Dict[type, Callable]):
+        spec = command.spec
+
+        self.command = command
+        self.prefixes = spec.prefixes
+        self.options = {}
+        self.positionals = []
+        self.defaults = {}
+        self.required = set()
+        self.conversions = []
+
+        for param in spec.params:
+            many = param.many
+            convert = parsers.get(param.type, param.type) \
+                if param.type is not None else None
+
+            if param.kind is Arg:
+                self.defaults[param.name] = None
+                self.positionals.append((param.name, many, convert))
+                continue
+
+            strings = param.strings
+            dest = strings[0].lstrip(self.prefixes).replace('-', '_')
+
+            if param.kind is Flag:
+                option = Option(dest, True, False, None)
+            else:
+                option = Option(dest, False, many, convert)
+
+                if param.required:
+                    self.required.add(dest)
+                if convert is not None:
+                    self.conversions.append((dest, convert))
+
+            self.defaults[dest] = param.default
+            self.options.update((x, option) for x in strings)
+
+        # `-h` and `--help` (or the same strings with the first of custom
+        # prefixes) are reserved for help (see `CommandSpec.of`).
+        help = '-' if '-' in self.prefixes else self.prefixes[0]
+        self.strings = sorted([*self.options, help + 'h', help * 2 + 'help'])
+
+        self.singles = sum(not many for _, many, _ in self.positionals)
+        self.trie = Trie(command.subcommands) if command.subcommands else None
+
+        if command.subcommands and self.singles != len(self.positionals):
+            # `argparse` matches list arguments and a subcommand name
+            # against the same tokens, which is not worth replicating.
+            raise Unsupported
+
+    def parse(self, args: List[str], start: int) \
+            -> Tuple[Dict[str, Any], Optional[str], int]:
+        """Parses the arguments of the command.
+
+        Args:
+            args: A list of command line arguments.
+            start: An index of the first argument that belongs to
+                the command.
+
+        Returns:
+            A tuple of (<values>, <next-command>, <next-index>).
+
+        Raises:
+            `Unsupported` if the command line has to be parsed
+            by a fallback parser (for example, to report an error).
+        """
+
+        prefixes = self.prefixes
+        options = self.options
+        values = dict(self.defaults)
+        seen = set()
+        positionals = []
+        split = False
+        next = None
+        i, n = start, len(args)
+
+        while i < n:
+            token = args[i]
+
+            if token and token[0] in prefixes:
+                option = options.get(token) or self.abbreviated(token)
+
+                i += 1
+
+                if option.flag:
+                    value = True
+                elif option.many:
+                    j = end_of(args, i, prefixes)
+                    value = converted(option.convert, args[i:j])
+                    i = j
+                elif i < n and not (args[i] and args[i][0] in prefixes):
+                    value = converted(option.convert, args[i])
+                    i += 1
+                else:
+                    raise Unsupported
+
+                values[option.dest] = value
+                seen.add(option.dest)
+                split = split or bool(positionals)
+            elif self.command.subcommands and \
+                    len(positionals) == len(self.positionals):
+                if token in self.command.subcommands:
+                    next = token
+                else:
+                    names = self.trie.candidates(token)
+
+                    # Ambiguous names are reported by the fallback parser.
+                    if len(names) != 1:
+                        raise Unsupported
+
+                    next, = names
+
+                i += 1
+                break
+            elif self.command.subcommands:
+                positionals.append(token)
+                i += 1
+            else:
+                if split and self.singles != len(self.positionals):
+                    raise Unsupported
+
+                # Consume the whole run of positional tokens at once,
+                # since there may be millions of them.
+                j = end_of(args, i, prefixes)
+
+                if positionals:
+                    positionals.extend(map(args.__getitem__, range(i, j)))
+                else:
+                    positionals = args[i:j]
+
+                i = j
+
+        if not self.required <= seen:
+            raise Unsupported
+
+        self.allocate(positionals, values)
+
+        # `argparse` also converts default values of options
+        # if they are strings.
+        for dest, convert in self.conversions:
+            if dest not in seen and isinstance(values[dest], str):
+                values[dest] = converted(convert, values[dest])
+
+        return values, next, i
+
+    def abbreviated(self, token: str) -> Option:
+        """Returns an option the `token` is an unambiguous abbreviation of.
+
+        As in `argparse`, only long option strings (such as `--verbose` or
+        `++verbose`) may be abbreviated. The abbreviation is looked up with
+        a binary search, since option strings that start with it are
+        adjacent in the sorted `strings`.
+
+        Raises:
+            `Unsupported` if the `token` is not an unambiguous abbreviation
+            of an option (including the ones reserved for help).
+        """
+
+        if len(token) < 3 or token[1] not in self.prefixes or '=' in token:
+            raise Unsupported
+
+        strings = self.strings
+        i = bisect_left(strings, token)
+
+        if i == len(strings) or not strings[i].startswith(token) or \
+                i + 1 < len(strings) and strings[i + 1].startswith(token):
+            raise Unsupported
+
+        option = self.options.get(strings[i])
+
+        if option is None:
+            raise Unsupported
+
+        return option
+
+    def allocate(self, tokens: List[str], values: Dict[str, Any]):
+        """Distributes positional tokens between positional arguments.
+
+        Single arguments receive exactly one token each, while the first
+        list argument receives all the remaining tokens (in the same way
+        as greedy `argparse` patterns do).
+        """
+
+        if len(tokens) < self.singles:
+            raise Unsupported
+
+        rest = len(tokens) - self.singles
+        i = 0
+
+        for name, many, convert in self.positionals:
+            if many:
+                # The list of tokens is reused if it's taken entirely,
+                # so a huge list is not copied once again.
+                values[name] = converted(convert, tokens if rest == len(tokens)
+                                         else tokens[i:i + rest])
+                i, rest = i + rest, 0
+            else:
+                values[name] = converted(convert, tokens[i])
+                i += 1
+
+        if i != len(tokens):
+            raise Unsupported
+
+
+class FastParser(Parser):
+    """A parser that does not use `argparse` for common command lines.
+
+    Precomputes a table of flags, options, positional arguments and
+    subcommands for each command once, and then parses a command line
+    in a single linear pass over its tokens.
+
+    Anything the parser does not handle by itself (help messages, errors,
+    ambiguous abbreviations, `--x=1` notation, etc.) is delegated to
+    the `fallback` parser, so the behaviour of both parsers is the same.
+
+    Attributes:
+        cli: An instance of `CLI` to parse command lines for.
+        fallback: A parser to delegate unsupported command lines to
+            (`StandardParser` if not specified).
+    """
+
+    def __init__(self, cli, fallback: Optional[Parser] = None):
+        self.cli = cli
+        self._fallback = fallback
+        self._tables = {}
+
+    @property
+    def fallback(self) -> Parser:
+        if self._fallback is None:
+            # Imported here, so `argparse` is not loaded
+            # until a command line actually needs it.
+            from mints.parsers.standard import StandardParser
+
+            self._fallback = StandardParser(self.cli)
+
+        return self._fallback
+
+    def parse(self, args: Iterable[str]) -> Iterable[Invocation]:
+        args = args if isinstance(args, list) else list(args)
+
+        try:
+            return self.parsed(args)
+        except Unsupported:
+            return self.fallback.parse(args)
+
+    def parsed(self, args: List[str]) -> List[Invocation]:
+        """Parses the arguments or raises `Unsupported`."""
+
+        invocations = []
+        command = self.cli.main
+        i = 0
+
+        while command is not None:
+            values, next, i = self.table(command).parse(args, i)
+
+            invocations.append(Invocation(values, next))
+
+            command = command.subcommands[next] if next is not None else \
+                      None
+
+        return invocations
+
+    def table(self, command: Command) -> Table:
+        """Returns a table for the `command` (computing it if needed)."""
+
+        key = command.revision, self.cli.revision
+        cached = self._tables.get(command)
+
+        if cached is not None and cached[0] == key:
+            table = cached[1]
+        else:
+            try:
+                table = Table(command, self.cli.parsers)
+            except Unsupported:
+                table = None
+
+            self._tables[command] = key, table
+
+        if table is None:
+            raise Unsupported
+
+        return table
+
+
+def converted(convert: Optional[Callable], value: Any) -> Any:
+    """Converts either a single value or a list of values."""
+
+    if convert is None:
+        return value
+
+    try:
+        if isinstance(value, list):
+            return list(map(convert, value))
+        else:
+            return convert(value)
+    except Exception:
+        # Let the fallback parser report (or raise) the error.
+        raise Unsupported
+
+
+def end_of(args: List[str], start: int, prefixes: str) -> int:
+    """Returns an index of the first flag or option starting from `start`
+    (`len(args)` if there is no such).
+
+    Tokens are checked by builtins rather than by a loop in Python, which
+    matters for runs of millions of values (e.g., from `xargs`).
+    """
+
+    starts = map(str.startswith,
+                 map(args.__getitem__, range(start, len(args))),
+                 repeat(tuple(prefixes)))
+
+    return next(compress(count(start), starts), len(args))
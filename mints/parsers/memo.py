@@ -0,0 +1,168 @@
+from collections import OrderedDict
+from typing import Any, Iterable, List, Optional, TypeVar
+
+from mints.command import Command
+from mints.parsers.parser import Parser, Invocation
+
+
+T = TypeVar('T')
+
+# Types of values that cannot be changed after they are parsed.
+IMMUTABLE = (str, int, float, complex, bool, bytes, frozenset, type(None))
+
+
+def pure(x: T) -> T:
+    """Marks a converter of a custom type as pure.
+
+    A pure converter always returns the same (or an equal) value for the
+    same string, and the values it returns are never changed, so they can
+    be shared between parses (see `MemoParser`).
+
+    Examples:
+        @cli.parse
+        @pure
+        def money(x: str) -> Money:
+            ...
+    """
+
+    x.__mints_pure__ = True
+
+    return x
+
+
+class MemoParser(Parser):
+    """A parser that remembers results of recently parsed command lines.
+
+    Meant for batch and resident modes, where the same command lines
+    (health checks, polling commands, etc.) are parsed over and over:
+    a repeated command line is neither parsed nor converted again.
+
+    A result is remembered only if all of its values are immutable (strings,
+    numbers, tuples of them, etc.), lists of such values (which are copied
+    for each parse) or values of custom types converted by pure converters
+    (see `pure`). Command lines that fail to parse (or show a help page)
+    are never remembered.
+
+    Attributes:
+        cli: An instance of `CLI` to parse command lines for.
+        parser: A parser to parse command lines that are not remembered
+            (`StandardParser` if not specified).
+        size: A maximum number of remembered command lines. The least
+            recently used one is forgotten once the limit is reached.
+        hits: A number of command lines that were remembered.
+        misses: A number of command lines that had to be parsed.
+        hit_rate: A share of command lines that were remembered.
+
+    Examples:
+        cli.parser = MemoParser(cli, FastParser(cli), size=256)
+    """
+
+    def __init__(self, cli, parser: Optional[Parser] = None, size: int = 128):
+        self.cli = cli
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+        self._parser = parser
+        self._key = None
+        self._entries = OrderedDict()
+
+    @property
+    def parser(self) -> Parser:
+        if self._parser is None:
+            from mints.parsers.standard import StandardParser
+
+            self._parser = StandardParser(self.cli)
+
+        return self._parser
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+
+        return self.hits / total if total else 0.0
+
+    def parse(self, args: Iterable[str]) -> Iterable[Invocation]:
+        args = tuple(args)
+        main = self.cli.main
+        key = main, main.revision, self.cli.revision
+
+        # Results of the previous command tree are no longer valid.
+        if self._key != key:
+            self._key = key
+            self._entries.clear()
+
+        entry = self._entries.get(args)
+
+        if entry is not None:
+            self.hits += 1
+            self._entries.move_to_end(args)
+
+            return copied(entry)
+
+        self.misses += 1
+        invocations = list(self.parser.parse(list(args)))
+
+        if self.size > 0 and self.shareable(invocations):
+            self._entries[args] = copied(invocations)
+
+            if len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+        return invocations
+
+    def shareable(self, invocations: List[Invocation]) -> bool:
+        """Checks whether values of the `invocations` can be shared."""
+
+        command = self.cli.main
+
+        for invocation in invocations:
+            converters = None
+
+            for name, value in invocation.args.items():
+                values = value if type(value) is list else (value,)
+
+                for x in values:
+                    if immutable(x):
+                        continue
+
+                    if converters is None:
+                        converters = converters_of(command, self.cli.parsers)
+
+                    if not getattr(converters.get(name), '__mints_pure__',
+                                   False):
+                        return False
+
+            if invocation.next is not None:
+                command = command.subcommands[invocation.next]
+
+        return True
+
+    def clear(self):
+        """Forgets all remembered command lines."""
+
+        self._entries.clear()
+
+
+def copied(invocations: List[Invocation]) -> List[Invocation]:
+    """Copies invocations along with lists of values in them."""
+
+    return [Invocation({k: list(v) if type(v) is list else v
+                        for k, v in x.args.items()}, x.next)
+            for x in invocations]
+
+
+def immutable(x: Any) -> bool:
+    """Checks whether a value cannot be changed."""
+
+    if type(x) is tuple:
+        return all(map(immutable, x))
+
+    return isinstance(x, IMMUTABLE)
+
+
+def converters_of(command: Command, parsers: dict) -> dict:
+    """Returns a dictionary that maps names of parameters of the `command`
+    to their converters."""
+
+    return {x.name: parsers.get(x.type, x.type)
+            for x in command.spec.params if x.type is not None}
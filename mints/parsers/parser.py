@@ -1,7 +1,71 @@
 from abc import ABCMeta, abstractmethod
-from typing import Iterable, Dict, Any, Optional, Tuple
+from typing import Iterable, Dict, Any, Callable, List, Optional, Tuple, \
+    Union
 
-from mints.command import Command
+from mints.args.arg import Arg
+from mints.args.flag import Flag
+from mints.command import Command, context_of
+from mints.spec import ParamSpec
+
+
+class ParseError(Exception):
+    """Raised when a command line is invalid (instead of printing a usage
+    and exiting, see `StandardParser.exit_on_error`).
+
+    The error is cheap to raise: its usage text is formatted only once
+    `usage` is accessed.
+
+    Attributes:
+        path: A path of names of subcommands the error is reported for
+            (an empty tuple for the main command).
+        param: A name of the parameter the error is about (`None` if the
+            error is not about a single parameter, e.g. an unrecognized
+            argument or an invalid subcommand).
+        reason: A description of the error (the message of the error may
+            also mention the parameter, as `argparse` does).
+        prog: A name of the program (including the subcommands)
+            as shown in the usage.
+        usage: A usage text of the command the error is reported for.
+
+    Examples:
+        try:
+            invocations = cli.invocations(line)
+        except ParseError as e:
+            log.warning('%s (in %s)', e.reason, ' '.join(e.path))
+    """
+
+    def __init__(self,
+                 path: Tuple[str, ...],
+                 param: Optional[str],
+                 reason: str,
+                 message: Optional[str] = None,
+                 prog: str = '',
+                 usage: Optional[Callable[[], str]] = None):
+        super().__init__(message or reason)
+        self.path = path
+        self.param = param
+        self.reason = reason
+        self.prog = prog
+        self._usage = usage
+
+    def __repr__(self):
+        return f'ParseError(' \
+               f'path={repr(self.path)}, ' \
+               f'param={repr(self.param)}, ' \
+               f'reason={repr(self.reason)}' \
+               f')'
+
+    @property
+    def usage(self) -> str:
+        if callable(self._usage):
+            self._usage = self._usage()
+
+        return self._usage or ''
+
+    def format(self) -> str:
+        """Formats the error in the same way as `argparse` prints it."""
+
+        return f'{self.usage}{self.prog}: error: {self}\n'
 
 
 class Invocation:
@@ -10,11 +74,19 @@ class Invocation:
     Attributes:
         args: A dictionary of arguments that maps arguments' names to values.
         next: A name of the command to be executed next.
+        command: A command to invoke (`None` until the invocation is
+            attached to its command, see `CLI.invocations`).
     """
 
-    def __init__(self, args: Dict[str, Any], next: Optional[str] = None):
+    __slots__ = ('args', 'next', 'command')
+
+    def __init__(self,
+                 args: Dict[str, Any],
+                 next: Optional[str] = None,
+                 command: Optional[Command] = None):
         self.args = args
         self.next = next
+        self.command = command
 
     def __repr__(self):
         return f'Invocation(' \
@@ -26,18 +98,36 @@ class Invocation:
             -> Tuple[Optional[Command], Any]:
         """Invokes the `command` with the provided `context`.
 
+        The context (a result of the parent command) is passed to
+        the parameter of the `command` that is not a part of the command
+        line (see `context_of`). It's passed as is, so a generator returned
+        by the parent command is consumed by the `command` lazily.
+
         Args:
             command: An instance of a `Command` to execute.
-            context: A context to execute the `command` with.
+            context: A context to execute the `command` with
+                (`None` if there is no context to pass).
 
         Returns:
             A pair of (<next-command>, <next-context>).
+
+        Raises:
+            `ValueError` if the `command` cannot accept the `context`.
         """
 
-        if context is not None:
-            raise NotImplementedError
+        if context is None:
+            context = command.func(**self.args)
+        else:
+            name = context_of(command)
+
+            if name is None:
+                raise ValueError(f"Cannot pass a result of the parent "
+                                 f"command to '{command.name}': it does "
+                                 f"not have a parameter for it (that is "
+                                 f"not annotated with `Arg`, `Opt` or "
+                                 f"`Flag`).")
 
-        context = command.func(**self.args)
+            context = command.func(**self.args, **{name: context})
 
         if self.next is not None:
             return command.subcommands[self.next], context
@@ -45,8 +135,59 @@ class Invocation:
             return None, context
 
 
+class Partial:
+    """A state of a partially parsed (for example, incomplete) command line.
+
+    Attributes:
+        command: A command the end of the command line belongs to.
+        path: Names of the subcommands from the main command to `command`.
+        values: A list of dictionaries (one per command on the path, starting
+            with the main one) that map names of parameters to the values
+            consumed so far. Values are not converted: an option or an
+            argument has a string (or a list of strings), and a flag
+            has `True`.
+        pending: A parameter of `command` that expects a value next: either
+            an option specified without a value or the next positional
+            argument (`None` if there is no such; in this case, a name
+            of a subcommand is expected if `command` has any).
+        errors: A list of messages about tokens that could not be parsed
+            (unknown options, ambiguous abbreviations, etc.); such tokens
+            are skipped.
+    """
+
+    __slots__ = ('command', 'path', 'values', 'pending', 'errors')
+
+    def __init__(self,
+                 command: Command,
+                 path: Tuple[str, ...],
+                 values: List[Dict[str, Any]],
+                 pending: Optional[ParamSpec],
+                 errors: List[str]):
+        self.command = command
+        self.path = path
+        self.values = values
+        self.pending = pending
+        self.errors = errors
+
+    def __repr__(self):
+        return f'Partial(' \
+               f'path={repr(self.path)}, ' \
+               f'values={repr(self.values)}, ' \
+               f'pending={repr(getattr(self.pending, "name", None))}, ' \
+               f'errors={repr(self.errors)}' \
+               f')'
+
+
 class Parser(metaclass=ABCMeta):
-    """A parser for command line arguments."""
+    """A parser for command line arguments.
+
+    Attributes:
+        cli: An instance of `CLI` to parse command lines for (`None` if
+            the parser is only used as a fallback of another one).
+    """
+
+    def __init__(self, cli=None):
+        self.cli = cli
 
     @abstractmethod
     def parse(self, args: Iterable[str]) -> Iterable[Invocation]:
@@ -67,3 +208,150 @@ class Parser(metaclass=ABCMeta):
                     Invocation(args={'remote': 'origin'})
                 ]
         """
+
+    def parse_partial(self, args: Iterable[str]) -> Partial:
+        """Parses a command line that may be incomplete or incorrect.
+
+        Meant for completion and editor integration: the method does not
+        raise for an invalid command line, never prints or builds a help
+        page, and does not convert values, so it is cheap enough to be
+        called on every keystroke.
+
+        Tokens are consumed from left to right in a single pass: flags and
+        options (including unambiguous abbreviations and `--x=1` notation)
+        anywhere, positional arguments in the order they are declared
+        (a list argument consumes all the remaining positional tokens
+        except for names of subcommands), and then a subcommand. As in
+        `argparse`, `--` ends options, so the tokens after it are
+        positional arguments and names of subcommands.
+
+        Args:
+            args: A list of command line arguments (see `parse`).
+
+        Returns:
+            A state of the command line (see `Partial`). For example,
+            'tool deploy --reg' could be parsed as
+
+                Partial(path=('deploy',),
+                        values=[{}, {}],
+                        pending='region',
+                        errors=[])
+
+        Raises:
+            `ValueError` if the parser is not bound to a CLI with the main
+            command set.
+        """
+
+        command = getattr(self.cli, 'main', None)
+
+        if command is None:
+            raise ValueError("Cannot parse a command line: "
+                             "the main command is not set.")
+
+        path = ()
+        values = [{}]
+        errors = []
+        params = command.spec.params
+        positionals = [x for x in params if x.kind is Arg]
+        option = None
+        options = True
+        k = 0
+
+        for token in args:
+            prefixes = command.spec.prefixes
+
+            if options and token == '--':
+                options = False
+                option = None
+            elif options and len(token) > 1 and token[0] in prefixes:
+                string, eq, value = token.partition('=')
+                option = None
+                found = option_of(params, prefixes, string)
+
+                if found is None:
+                    continue
+                elif isinstance(found, str):
+                    errors.append(found)
+                elif found.kind is Flag:
+                    values[-1][found.name] = True
+                elif eq:
+                    values[-1][found.name] = [value] if found.many else value
+                else:
+                    option = found
+
+                    if found.many:
+                        values[-1][found.name] = []
+            elif option is not None:
+                if option.many:
+                    values[-1][option.name].append(token)
+                else:
+                    values[-1][option.name] = token
+                    option = None
+            elif k < len(positionals) and not (positionals[k].many and
+                                               token in command.subcommands):
+                if positionals[k].many:
+                    values[-1].setdefault(positionals[k].name, []) \
+                        .append(token)
+                else:
+                    values[-1][positionals[k].name] = token
+                    k += 1
+            elif command.subcommands:
+                names = [token] if token in command.subcommands else \
+                    [x for x in command.subcommands
+                     if token and x.startswith(token)]
+
+                if len(names) != 1:
+                    errors.append(f"invalid choice: '{token}'" if not names
+                                  else f"ambiguous choice: '{token}' could "
+                                       f"match {', '.join(map(repr, names))}")
+                    continue
+
+                command = command.subcommands[names[0]]
+                path += names[0],
+                values.append({})
+                params = command.spec.params
+                positionals = [x for x in params if x.kind is Arg]
+                k = 0
+            else:
+                errors.append(f'unrecognized argument: {token}')
+
+        pending = option if option is not None else \
+            positionals[k] if k < len(positionals) else None
+
+        return Partial(command, path, values, pending, errors)
+
+
+def option_of(params: Iterable[ParamSpec], prefixes: str, string: str) \
+        -> Union[ParamSpec, str, None]:
+    """Finds a flag or an option by its option string or an unambiguous
+    abbreviation of a long one.
+
+    Returns:
+        Either the found parameter, an error message or `None` if the
+        string is reserved for help.
+    """
+
+    # See `CommandSpec.of`.
+    help = '-' if '-' in prefixes else prefixes[0]
+
+    if string in (help + 'h', help * 2 + 'help'):
+        return None
+
+    long = []
+
+    for param in params:
+        strings = param.strings
+
+        if string in strings:
+            return param
+        if strings and strings[0].startswith(string) and \
+                len(string) > 2 and string[1] == string[0]:
+            long.append(param)
+
+    if len(long) == 1:
+        return long[0]
+    if long:
+        return f"ambiguous option: {string} could match " \
+               f"{', '.join(x.strings[0] for x in long)}"
+
+    return f'unrecognized argument: {string}'
@@ -1,13 +1,18 @@
-from argparse import ArgumentParser, HelpFormatter
-from typing import Iterable, Any, Callable, Type, Dict, Optional, Tuple, TypeVar
-import inspect
+from argparse import Action, ArgumentError, ArgumentParser, HelpFormatter, \
+    _SubParsersAction
+from functools import partial
+from typing import Iterable, Any, Callable, Type, Dict, Optional, Tuple
+import sys
 
 from mints.args.arg import Arg
 from mints.args.flag import Flag
-from mints.args.opt import Opt
-from mints.args.typed import Typed
 from mints.command import Command
-from mints.parsers.parser import Parser, Invocation
+from mints.parsers.parser import Parser, Invocation, ParseError
+from mints.parsers.trie import Trie
+
+
+# A prefix of an `argparse` message about missing required arguments.
+REQUIRED = 'the following arguments are required: '
 
 
 class StandardParser(Parser):
@@ -29,17 +34,45 @@ class StandardParser(Parser):
     The parser may also be provided with a help text (taken from the function's
     docstring) and default values for arguments.
 
+    The constructed `ArgumentParser` is cached and reused for subsequent calls
+    until either the CLI or its command tree changes (see `CLI.revision` and
+    `Command.revision`).
+
     Attributes:
         cli: An instance of `CLI` to initialise a parser for.
+        lazy: Whether subparsers should be constructed only for subcommands
+            that are selected by the command line (`True` by default).
+            Otherwise, the whole command tree is configured upfront.
+        exit_on_error: Whether to print a usage and an error message and
+            exit when a command line is invalid, as `argparse` does
+            (`True` by default). Otherwise, a `ParseError` is raised,
+            which is cheaper for batch, daemon and embedded use.
+        hits: A number of times the cached `ArgumentParser` was reused.
+        misses: A number of times an `ArgumentParser` had to be constructed.
     """
 
-    def __init__(self, cli):
+    def __init__(self, cli, lazy: bool = True, exit_on_error: bool = True):
         self.cli = cli
+        self.lazy = lazy
+        self.exit_on_error = exit_on_error
+        self.hits = 0
+        self.misses = 0
+        self._key = None
+        self._parser = None
 
     def parse(self, args: Iterable[str]) -> Iterable[Invocation]:
-        parser = configured(new_parser, self.cli.main, self.cli.parsers)
+        parser = self.compiled()
+
+        try:
+            args = parser.parse_args(list(args))
+        except ParseError as error:
+            if not self.exit_on_error:
+                raise
+
+            sys.stderr.write(error.format())
+
+            raise SystemExit(2) from None
 
-        args = parser.parse_args(list(args))
         args = args.__dict__
 
         # It's assumed that the entries preserve the insertion order.
@@ -62,59 +95,193 @@ class StandardParser(Parser):
 
         return invocations
 
+    def compiled(self) -> ArgumentParser:
+        """Returns an `argparse.ArgumentParser` for the CLI.
 
-def help(command: Command) -> Type[HelpFormatter]:
-    """Constructs a subclass of `argparse.HelpFormatter` for `command`."""
+        The parser is constructed only if it has not been constructed yet
+        or if the CLI has changed since then; otherwise, the cached one
+        is returned.
+        """
 
-    class Help(HelpFormatter):
-        """Defines a format of the `--help` message."""
+        main = self.cli.main
+        key = main, main.revision, self.cli.revision
 
-        def format_help(self):
-            if command.help_ is not None:
-                return command.help_(command)
-            else:
-                return super(Help, self).format_help()
+        if self._parser is not None and self._key == key:
+            self.hits += 1
+        else:
+            self.misses += 1
+            self._parser = configured(new_parser, main, self.cli.parsers,
+                                      lazy=self.lazy)
+            self._key = key
 
-    return Help
+        return self._parser
 
+    def clear(self):
+        """Drops the cached `argparse.ArgumentParser`."""
 
-def prefixes(signature: inspect.Signature) -> str:
-    """Constructs a prefixes string for a `signature`.
+        self._key = None
+        self._parser = None
 
-    For example, if `signature` has `Opt(prefix='/')` and `Opt(prefix='+')`
-    arguments, then the resulting string would be `/+`.
+
+class ArgParser(ArgumentParser):
+    """An `argparse.ArgumentParser` that raises `ParseError`s
+    instead of printing them and exiting.
+
+    Attributes:
+        command: A command the parser is configured for
+            (see `configured`).
     """
 
-    def prefix_of(x: inspect.Parameter) -> str:
-        prefix = getattr(x.annotation, 'prefix', '-')
+    command = None
+
+    def error(self, message: str):
+        # `argparse` reports most errors from the handler
+        # of the `ArgumentError` that describes them.
+        error = sys.exc_info()[1]
+        name = None
+        reason = message
+
+        if isinstance(error, ArgumentError) and str(error) == message:
+            name, reason = error.argument_name, error.message
+        elif message.startswith(REQUIRED):
+            name = message[len(REQUIRED):].split(', ')[0]
+
+        raise ParseError(path_of(self.command), self.dest(name), reason,
+                         message, self.prog, self.format_usage)
+
+    def _check_value(self, action: Action, value: Any):
+        # `argparse` checks that a subcommand name is one of the choices
+        # before the subparsers action is called, so an abbreviation
+        # (either an unambiguous or an ambiguous one, to report the
+        # candidates) has to pass the check first.
+        if isinstance(action, Subparsers) and isinstance(value, str) and \
+                action.choices.candidates(value):
+            return
+
+        super()._check_value(action, value)
+
+    def dest(self, name: Optional[str]) -> Optional[str]:
+        """Returns a name of the parameter an `argparse` name refers to."""
+
+        if name is None:
+            return None
+
+        for action in self._actions:
+            if action.dest.startswith('.'):
+                continue
+
+            if name in action.option_strings or \
+                    name in ('/'.join(action.option_strings),
+                             action.metavar, action.dest):
+                return action.dest
+
+        return None
+
+
+class Choices(dict):
+    """Subparsers by their names that also resolve abbreviations.
+
+    Membership is exact (`argparse` relies on it to find conflicting
+    names), while abbreviations are resolved by `candidates` only
+    (see `ArgParser._check_value` and `Subparsers`).
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._trie = None
+
+    def __setitem__(self, name: str, value: Any):
+        if name not in self.keys():
+            self._trie = None
+
+        super().__setitem__(name, value)
+
+    def candidates(self, name: str) -> Tuple[str, ...]:
+        """Returns names of subparsers the `name` may stand for
+        (see `Trie.candidates`)."""
+
+        if self._trie is None:
+            self._trie = Trie(self.keys())
+
+        return self._trie.candidates(name)
+
+
+class Subparsers(_SubParsersAction):
+    """An `argparse` action that constructs subparsers on demand.
+
+    Subparsers are registered by their names only (see `defer`), which is
+    enough for `argparse` to validate a choice and to format a help message.
+    A subparser itself is configured once it is selected by the command line,
+    and is then kept for subsequent calls.
+
+    A subparser may also be selected by an unambiguous abbreviation of its
+    name (for example, `dep` for `deploy`).
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self._name_parser_map = self.choices = Choices()
+        self._pending = {}
+
+    def defer(self, name: str, configure: Callable[[Callable], ArgumentParser]):
+        """Registers a subparser to be configured when it is selected.
+
+        Args:
+            name: A name of the subparser.
+            configure: A function that accepts a function to create a new
+                subparser with and returns the configured subparser.
+        """
+
+        self._name_parser_map[name] = None
+        self._pending[name] = configure
+
+    def new(self, name: str, **kwargs: Any) -> ArgumentParser:
+        """Creates a new subparser in the same way as `add_parser` does."""
+
+        if kwargs.get('prog') is None:
+            kwargs['prog'] = f'{self._prog_prefix} {name}'
 
-        if prefix is None:
-            raise ValueError(f"Argument '{x.name}' has an invalid prefix "
-                             f"'{prefix}': "
-                             f"it is None")
+        return self._parser_class(**kwargs)
 
-        if prefix == '':
-            raise ValueError(f"Argument '{x.name}' has an invalid prefix "
-                             f"'{prefix}': "
-                             f"it is an empty string")
+    def __call__(self, parser, namespace, values, option_string=None):
+        names = self._name_parser_map.candidates(values[0])
 
-        if len(prefix) > 1:
-            raise ValueError(f"Argument '{x.name}' has an invalid prefix "
-                             f"'{prefix}': "
-                             f"it consists of more than one character")
+        if len(names) > 1:
+            raise ArgumentError(self, f"ambiguous choice: '{values[0]}' "
+                                      f"could match "
+                                      f"{', '.join(map(repr, names))}")
 
-        return prefix
+        name = names[0]
+        values = [name, *values[1:]]
 
-    params = signature.parameters.values()
-    prefixes = map(prefix_of, params)
-    prefixes = set(prefixes)
+        if name in self._pending:
+            # Assign to the existing key to preserve the order of choices,
+            # as it's used in error messages. The subparser stays pending
+            # until it's configured, so a failure is raised again next time.
+            self._name_parser_map[name] = self._pending[name](self.new)
+            del self._pending[name]
 
-    return ''.join(prefixes) or '-'
+        super().__call__(parser, namespace, values, option_string)
+
+
+def help(command: Command) -> Type[HelpFormatter]:
+    """Constructs a subclass of `argparse.HelpFormatter` for `command`."""
+
+    class Help(HelpFormatter):
+        """Defines a format of the `--help` message."""
+
+        def format_help(self):
+            if command.help_ is not None:
+                return command.help_(command)
+            else:
+                return super(Help, self).format_help()
+
+    return Help
 
 
 def new_parser(*args, **kwargs) -> ArgumentParser:
     """Creates a new parser."""
-    return ArgumentParser(*args, **kwargs)
+    return ArgParser(*args, **kwargs)
 
 
 def new_subparser(subparsers: Any) -> Callable[[Any], ArgumentParser]:
@@ -125,7 +292,8 @@ def new_subparser(subparsers: Any) -> Callable[[Any], ArgumentParser]:
 def configured(new: Callable,
                command: Command,
                parsers: Dict[Type, Callable],
-               prefix: str = '.') \
+               prefix: str = '.',
+               lazy: bool = False) \
         -> ArgumentParser:
     """Configures an `argparse.ArgumentParser` from the specified `command`.
 
@@ -138,136 +306,81 @@ def configured(new: Callable,
 
     For example, 'dotnet.py tool install -g something' would be parsed as
         {'.command': 'tool', '..command': 'install', 'g': 'something'}.
+
+    If `lazy` is set, subparsers are configured only when they are selected
+    (see `Subparsers`).
     """
 
-    signature = inspect.signature(command.func)
+    spec = command.spec
     parser = new(command.name,
                  description=command.description,
                  formatter_class=help(command),
-                 prefix_chars=prefixes(signature))
-
-    def short_of(x: inspect.Parameter, kind: Any) -> Optional[str]:
-        short = getattr(kind, 'short', None)
-
-        if short is None:
-            # If `None`, then considered as omitted.
-            return short
-
-        if short == '':
-            raise ValueError(f"Argument '{x.name}' has an invalid short name "
-                             f"'{short}': "
-                             f"it is an empty string")
-
-        if len(short) > 1:
-            raise ValueError(f"Argument '{x.name}' has an invalid short name "
-                             f"'{short}': "
-                             f"it consists of more than one character")
-
-        if not short.isalpha():
-            raise ValueError(f"Argument '{x.name}' has an invalid short name "
-                             f"'{short}': "
-                             f"it is not an alphabet character")
-
-        return short
-
-    def prefixes_of(x: inspect.Parameter, kind: Any) -> Tuple[str, str]:
-        prefix = getattr(kind, 'prefix', '-')
-
-        return prefix, prefix * 2
-
-    def is_(x: Any, of: Type) -> bool:
-        return isinstance(x, of) or x == of
-
-    def configure_arg(x: inspect.Parameter, kind: Any, config: Dict):
-        parser.add_argument(x.name, **config)
-
-    def configure_named_arg(x: inspect.Parameter, kind: Any, config: Dict):
-        short = short_of(x, kind)
-        short_prefix, long_prefix = prefixes_of(x, kind)
-
-        if short is None:
-            parser.add_argument(f'{long_prefix}{x.name}',
-                                **config)
-        else:
-            parser.add_argument(f'{long_prefix}{x.name}',
-                                f'{short_prefix}{short}',
-                                **config)
-
-    def configure_flag(x: inspect.Parameter, kind: Any, config: Dict):
-        # This actually makes an arg to behave like a flag,
-        # so one could call `--x` instead of `--x y`.
-        config['action'] = 'store_true'
-
-        if x.default is x.empty:
-            config['default'] = False
-        elif isinstance(x.default, bool):
-            config['default'] = x.default
-        else:
-            raise ValueError(f"Expected a `bool` default value for "
-                             f"the flag '{x.name}' but got {x.default}.")
-
-        configure_named_arg(x, kind, config)
-
-    def configure_opt(x: inspect.Parameter, kind: Any, config: Dict):
-        if x.default is not x.empty:
-            config['default'] = x.default
-            config['required'] = False
-        else:
-            config['required'] = True
-
-        configure_named_arg(x, kind, config)
+                 prefix_chars=spec.prefixes)
+    parser.command = command
 
     # Add parameters to the parser.
-    for parameter in signature.parameters.values():
-        if parameter.annotation is parameter.default:
-            raise ValueError(f"The parameter '{parameter.name}' "
-                             f"must have an annotation.")
-
+    for param in spec.params:
         config = {}
 
-        type = getattr(parameter.annotation, 'type', None)
-        if type is not None:
-            if getattr(type, '__origin__', None) is list:
-                arg, = type.__args__
-
-                config['nargs'] = '*'
-                config['type'] = str if isinstance(arg, TypeVar) else arg
-            elif type is list:
-                config['nargs'] = '*'
-                config['type'] = str
-            else:
-                config['type'] = type
-
+        if param.type is not None:
             # Override the conversion.
-            if config['type'] in parsers:
-                config['type'] = parsers[config['type']]
+            config['type'] = parsers.get(param.type, param.type)
 
-        if isinstance(parameter.annotation, Typed):
-            kind = parameter.annotation.kind
-        else:
-            kind = parameter.annotation
+        if param.many:
+            config['nargs'] = '*'
 
-        description = getattr(kind, 'description', None)
-        if description is not None:
+        if param.description is not None:
             # Here the following issue is addressed:
             # https://bugs.python.org/issue38584.
+            description = param.description
             config['help'] = description if not description.isspace() else ''
 
-        if is_(kind, Arg):
-            configure_arg(parameter, kind, config)
+        if param.kind is Arg:
+            parser.add_argument(param.name, **config)
+            continue
 
-        if is_(kind, Flag):
-            configure_flag(parameter, kind, config)
+        if param.kind is Flag:
+            # This actually makes an arg to behave like a flag,
+            # so one could call `--x` instead of `--x y`.
+            config['action'] = 'store_true'
+            config['default'] = param.default
+        elif param.required:
+            config['required'] = True
+        else:
+            config['default'] = param.default
+            config['required'] = False
 
-        if is_(kind, Opt):
-            configure_opt(parameter, kind, config)
+        parser.add_argument(*param.strings, **config)
 
     # Add subparsers to the parser.
-    if command.subcommands:
-        subparsers = parser.add_subparsers(dest=prefix + 'command')
+    if command.subcommands and lazy:
+        subparsers = parser.add_subparsers(dest=prefix + 'command',
+                                           action=Subparsers)
+
+        for name, subcommand in command.subcommands.items():
+            subparsers.defer(name, partial(configured,
+                                           command=subcommand,
+                                           parsers=parsers,
+                                           prefix=prefix + '.',
+                                           lazy=lazy))
+    elif command.subcommands:
+        subparsers = parser.add_subparsers(dest=prefix + 'command',
+                                           action=Subparsers)
 
         for name, subcommand in command.subcommands.items():
             _ = configured(new_subparser(subparsers), subcommand,
                            parsers, prefix + '.')
 
     return parser
+
+
+def path_of(command: Optional[Command]) -> Tuple[str, ...]:
+    """Returns names of subcommands that lead to the `command`."""
+
+    path = []
+
+    while command is not None and command.parent is not None:
+        path.append(command.name)
+        command = command.parent
+
+    return tuple(reversed(path))
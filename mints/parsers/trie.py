@@ -0,0 +1,113 @@
+from typing import Iterable, Optional, Tuple
+
+
+class Node:
+    """A node of a `Trie`.
+
+    Attributes:
+        children: A dictionary that maps the next character of a name
+            to the node of the longer prefix.
+        name: A name that ends at the node (`None` if there is no such).
+        first: The first added name that starts with the prefix
+            of the node.
+        count: A number of names that start with the prefix of the node.
+    """
+
+    __slots__ = ('children', 'name', 'first', 'count')
+
+    def __init__(self):
+        self.children = {}
+        self.name = None
+        self.first = None
+        self.count = 0
+
+
+class Trie:
+    """A prefix tree of subcommand names.
+
+    Resolves an abbreviated name (for example, `dep` for `deploy`) in time
+    proportional to the length of the abbreviation rather than the number
+    of names, which matters for commands with hundreds of subcommands.
+
+    Attributes:
+        names: A list of the names in the order they were added.
+
+    Examples:
+        trie = Trie(['deploy', 'delete', 'status'])
+
+        trie.candidates('dep')  # ('deploy',)
+        trie.candidates('de')   # ('deploy', 'delete')
+        trie.candidates('x')    # ()
+        trie.candidates('')     # ()
+    """
+
+    __slots__ = ('names', '_root')
+
+    def __init__(self, names: Iterable[str] = ()):
+        self.names = []
+        self._root = Node()
+
+        for name in names:
+            self.add(name)
+
+    def add(self, name: str):
+        """Adds a name to the tree (if it has not been added yet)."""
+
+        existing = self.find(name)
+
+        if existing is not None and existing.name is not None:
+            return
+
+        self.names.append(name)
+        node = self._root
+
+        for char in name:
+            node.count += 1
+            node.first = node.first or name
+            node = node.children.setdefault(char, Node())
+
+        node.count += 1
+        node.first = node.first or name
+        node.name = name
+
+    def candidates(self, prefix: str) -> Tuple[str, ...]:
+        """Returns names the `prefix` may stand for.
+
+        A name that matches the `prefix` exactly is preferred over longer
+        ones (for example, `up` stands for `up` even if there is `update`).
+
+        Returns:
+            An empty tuple if no name starts with the `prefix` (or if the
+            `prefix` is empty), a tuple of a single name if the `prefix`
+            is not ambiguous, or a tuple of all names that start with
+            the `prefix` otherwise.
+        """
+
+        # An empty string is not an abbreviation of any name.
+        if not prefix:
+            return ()
+
+        node = self.find(prefix)
+
+        if node is None or node.count == 0:
+            return ()
+        if node.name is not None:
+            return node.name,
+        if node.count == 1:
+            return node.first,
+
+        # Ambiguity is an error, so it's fine to scan all names here.
+        return tuple(x for x in self.names if x.startswith(prefix))
+
+    def find(self, prefix: str) -> Optional[Node]:
+        """Returns a node of the `prefix` (`None` if there is no such)."""
+
+        node = self._root
+
+        for char in prefix:
+            node = node.children.get(char)
+
+            if node is None:
+                return None
+
+        return node
@@ -0,0 +1,414 @@
+from typing import Any, Callable, NamedTuple, Optional, Tuple, TypeVar
+import sys
+import types
+
+from mints.args.arg import Arg
+from mints.args.flag import Flag
+from mints.args.opt import Opt
+from mints.args.typed import Typed
+
+
+class Empty:
+    """A marker of a missing annotation or default value."""
+
+    def __repr__(self):
+        return 'EMPTY'
+
+
+EMPTY = Empty()
+
+
+class Parameter(NamedTuple):
+    """A parameter of a function (a light version of `inspect.Parameter`).
+
+    Attributes:
+        name: A name of the parameter.
+        annotation: An annotation of the parameter (`EMPTY` if missing).
+        default: A default value of the parameter (`EMPTY` if missing).
+    """
+
+    name: str
+    annotation: Any = EMPTY
+    default: Any = EMPTY
+
+
+class ParamSpec(NamedTuple):
+    """A specification of a command parameter.
+
+    Attributes:
+        name: A name of the parameter.
+        kind: A kind of the parameter (`Arg`, `Opt` or `Flag`).
+        type: A type to convert a value (or each value of a list) to
+            (`None` if a value should be kept as a string).
+        many: Whether the parameter accepts a list of values.
+        description: A description of the parameter. Shown in help page.
+        short: A short name of a flag or an option.
+        prefix: A prefix of a flag or an option (`-` for arguments).
+        default: A default value of the parameter.
+        required: Whether the parameter must be specified
+            in the command line.
+    """
+
+    name: str
+    kind: type
+    type: Optional[Any]
+    many: bool
+    description: Optional[str]
+    short: Optional[str]
+    prefix: str
+    default: Any
+    required: bool
+
+    @property
+    def strings(self) -> Tuple[str, ...]:
+        """Option strings of a flag or an option (for example, `--x, -x`)."""
+
+        if self.kind is Arg:
+            return ()
+        if self.short is None:
+            return self.prefix * 2 + self.name,
+        else:
+            return self.prefix * 2 + self.name, self.prefix + self.short
+
+    @classmethod
+    def of(cls, parameter: Parameter) -> Optional['ParamSpec']:
+        """Analyzes a parameter of a function.
+
+        Returns:
+            A specification of the parameter or `None` if the parameter
+            is not annotated with either `Arg`, `Opt` or `Flag` (and thus
+            is not a part of the command line).
+
+        Raises:
+            `ValueError` if the parameter is defined incorrectly.
+        """
+
+        annotation = parameter.annotation
+
+        if annotation is EMPTY:
+            # A parameter with a default value may be left for the code
+            # that calls the function directly (or for a parent's result).
+            if parameter.default is EMPTY:
+                raise ValueError(f"The parameter '{parameter.name}' "
+                                 f"must have an annotation.")
+
+            return None
+
+        if isinstance(annotation, Typed):
+            kind = annotation.kind
+        else:
+            kind = annotation
+
+        if is_(kind, Arg):
+            kind_ = Arg
+        elif is_(kind, Flag):
+            kind_ = Flag
+        elif is_(kind, Opt):
+            kind_ = Opt
+        else:
+            return None
+
+        # A class (e.g., `x: Arg`) has no description, short name, etc.
+        # (and its slots must not be mistaken for them).
+        if isinstance(kind, type):
+            kind = None
+
+        type_, many = type_of(annotation)
+        short = short_of(parameter, kind)
+        prefix = prefix_of(parameter, kind)
+        default, required = defaulted(parameter.name, kind_,
+                                      parameter.default)
+
+        return cls(name=parameter.name,
+                   kind=kind_,
+                   type=type_,
+                   many=many,
+                   description=getattr(kind, 'description', None),
+                   short=short,
+                   prefix=prefix,
+                   default=default,
+                   required=required)
+
+
+class CommandSpec(NamedTuple):
+    """A specification of a command that is computed from its function.
+
+    Parsers read the specification instead of analyzing the function
+    on each call.
+
+    Attributes:
+        params: A tuple of specifications of the command parameters
+            in the order they are declared.
+        prefixes: A string of all prefixes of flags and options
+            (for example, `-+` if some options are prefixed with `+`).
+    """
+
+    params: Tuple[ParamSpec, ...]
+    prefixes: str
+
+    @classmethod
+    def of(cls, func: Callable) -> 'CommandSpec':
+        """Analyzes a function of a command.
+
+        Raises:
+            `ValueError` if any of the parameters is defined incorrectly
+            or two parameters have the same option string.
+        """
+
+        params = map(ParamSpec.of, signature_of(func)[0])
+        params = tuple(x for x in params if x is not None)
+
+        # `dict` is used instead of `set` to preserve the order of prefixes.
+        prefixes = ''.join(dict.fromkeys(x.prefix for x in params)) or '-'
+
+        # `-h` and `--help` (or the same strings with the first of custom
+        # prefixes) are reserved for help.
+        default = '-' if '-' in prefixes else prefixes[0]
+        strings = {default + 'h', default * 2 + 'help'}
+
+        for param in params:
+            for string in param.strings:
+                if string in strings:
+                    raise ValueError(f"Argument '{param.name}' has "
+                                     f"a conflicting option string "
+                                     f"'{string}'")
+
+                strings.add(string)
+
+        return cls(params=params, prefixes=prefixes)
+
+
+def signature_of(func: Callable) -> Tuple[Tuple[Parameter, ...], Any]:
+    """Returns a pair of (<parameters>, <return-annotation>) of `func`.
+
+    Plain functions are analyzed by their code objects, which is much faster
+    than `inspect.signature` (and does not require importing `inspect`).
+    Anything else (classes, partials, decorated functions, etc.) is passed
+    to `inspect.signature`.
+
+    String annotations of parameters (for example, in modules with
+    `from __future__ import annotations`, see PEP 563) are evaluated (see
+    `annotation_of`), while the return annotation is returned as is, since
+    only parsers of custom types need it (see `evaluated`).
+
+    Raises:
+        `ValueError` if a string annotation of `Arg`, `Opt` or `Flag`
+        cannot be evaluated.
+    """
+
+    if not isinstance(func, types.FunctionType) or \
+            hasattr(func, '__wrapped__') or hasattr(func, '__signature__'):
+        import inspect
+
+        signature = inspect.signature(func)
+
+        def value(x):
+            return EMPTY if x is inspect.Parameter.empty else x
+
+        return tuple(Parameter(x.name,
+                               annotation_of(value(x.annotation), func),
+                               value(x.default))
+                     for x in signature.parameters.values()), \
+            value(signature.return_annotation)
+
+    code = func.__code__
+    annotations = func.__annotations__
+    defaults = func.__defaults__ or ()
+    kwdefaults = func.__kwdefaults__ or {}
+
+    names = code.co_varnames
+    positional = code.co_argcount
+    keyword = code.co_kwonlyargcount
+    first = positional - len(defaults)
+
+    params = []
+
+    def add(name, default):
+        params.append(Parameter(name,
+                                annotation_of(annotations.get(name, EMPTY),
+                                              func),
+                                default))
+
+    for i in range(positional):
+        add(names[i], defaults[i - first] if i >= first else EMPTY)
+
+    # See `CO_VARARGS` and `CO_VARKEYWORDS` in `inspect`.
+    if code.co_flags & 0x04:
+        add(names[positional + keyword], EMPTY)
+
+    for name in names[positional:positional + keyword]:
+        add(name, kwdefaults.get(name, EMPTY))
+
+    if code.co_flags & 0x08:
+        add(names[positional + keyword + bool(code.co_flags & 0x04)], EMPTY)
+
+    return tuple(params), annotations.get('return', EMPTY)
+
+
+def postponed(func: Callable) -> bool:
+    """Checks whether a function has string annotations (see PEP 563)."""
+
+    annotations = getattr(func, '__annotations__', None)
+
+    return isinstance(annotations, dict) and \
+        any(isinstance(x, str) for x in annotations.values())
+
+
+def evaluated(annotation: Any, func: Callable) -> Any:
+    """Evaluates a string annotation of `func` in the namespace of its module
+    (in the same way as `typing.get_type_hints` does).
+
+    Any other annotation is returned as is.
+
+    Raises:
+        `ValueError` if the annotation cannot be evaluated.
+    """
+
+    if not isinstance(annotation, str):
+        return annotation
+
+    namespace = getattr(func, '__globals__', None)
+
+    if namespace is None:
+        module = sys.modules.get(getattr(func, '__module__', None))
+        namespace = vars(module) if module is not None else {}
+
+    try:
+        return eval(annotation, namespace)
+    except Exception as e:
+        name = getattr(func, '__qualname__', func)
+
+        raise ValueError(f"Cannot evaluate the annotation '{annotation}' "
+                         f"of '{name}': {e}") from None
+
+
+def annotation_of(annotation: Any, func: Callable) -> Any:
+    """Evaluates a string annotation of a parameter of `func`
+    (see `evaluated`).
+
+    An annotation that cannot be evaluated is returned as is, so the
+    parameter is not a part of the command line (for example, `Decimal`
+    imported only under `TYPE_CHECKING`), unless it's meant to be `Arg`,
+    `Opt` or `Flag` (for example, `Opt[Unknown]`).
+
+    Raises:
+        `ValueError` if an annotation of `Arg`, `Opt` or `Flag` cannot be
+        evaluated.
+    """
+
+    try:
+        return evaluated(annotation, func)
+    except ValueError:
+        # E.g., `Opt` for `Opt[int](short='x')`.
+        head = annotation.partition('[')[0].partition('(')[0].strip()
+
+        try:
+            kind = evaluated(head, func)
+        except ValueError:
+            return annotation
+
+        if is_(kind, Arg) or is_(kind, Opt) or is_(kind, Flag):
+            raise
+
+        return annotation
+
+
+def defaulted(name: str, kind: type, default: Any) -> Tuple[Any, bool]:
+    """Applies the rules of default values of a kind of parameters.
+
+    Returns:
+        A pair of (<default>, <required>).
+
+    Raises:
+        `ValueError` if the default value of a flag is not a `bool`.
+    """
+
+    if kind is Flag:
+        if default is EMPTY:
+            default = False
+        elif not isinstance(default, bool):
+            raise ValueError(f"Expected a `bool` default value for "
+                             f"the flag '{name}' "
+                             f"but got {default}.")
+
+        return default, False
+
+    required = kind is Arg or default is EMPTY
+
+    return (None if default is EMPTY else default), required
+
+
+def is_(x: Any, of: type) -> bool:
+    return isinstance(x, of) or x == of
+
+
+def type_of(annotation: Any) -> Tuple[Optional[Any], bool]:
+    """Returns a pair of (<type>, <many>) for a parameter annotation.
+
+    For example, `Opt[List[int]]` has a type `int` and accepts many values.
+    """
+
+    type = getattr(annotation, 'type', None)
+
+    if type is None:
+        return None, False
+
+    if getattr(type, '__origin__', None) is list:
+        arg, = type.__args__
+
+        return (str if isinstance(arg, TypeVar) else arg), True
+
+    if type is list:
+        return str, True
+
+    return type, False
+
+
+def short_of(x: Parameter, kind: Any) -> Optional[str]:
+    """Returns a validated short name of a flag or an option."""
+
+    short = getattr(kind, 'short', None)
+
+    if short is None:
+        # If `None`, then considered as omitted.
+        return short
+
+    if short == '':
+        raise ValueError(f"Argument '{x.name}' has an invalid short name "
+                         f"'{short}': "
+                         f"it is an empty string")
+
+    if len(short) > 1:
+        raise ValueError(f"Argument '{x.name}' has an invalid short name "
+                         f"'{short}': "
+                         f"it consists of more than one character")
+
+    if not short.isalpha():
+        raise ValueError(f"Argument '{x.name}' has an invalid short name "
+                         f"'{short}': "
+                         f"it is not an alphabet character")
+
+    return short
+
+
+def prefix_of(x: Parameter, kind: Any) -> str:
+    """Returns a validated prefix of a flag or an option."""
+
+    prefix = getattr(kind, 'prefix', '-')
+
+    if prefix is None:
+        raise ValueError(f"Argument '{x.name}' has an invalid prefix "
+                         f"'{prefix}': "
+                         f"it is None")
+
+    if prefix == '':
+        raise ValueError(f"Argument '{x.name}' has an invalid prefix "
+                         f"'{prefix}': "
+                         f"it is an empty string")
+
+    if len(prefix) > 1:
+        raise ValueError(f"Argument '{x.name}' has an invalid prefix "
+                         f"'{prefix}': "
+                         f"it consists of more than one character")
+
+    return prefix
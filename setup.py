@@ -8,7 +8,8 @@ setup(
     description='Clean and elegant CLI development kit',
     long_description=open('README.md').read(),
     long_description_content_type='text/markdown',
-    install_requires=[''],
+    install_requires=['importlib_metadata; python_version < "3.8"'],
+    entry_points={'console_scripts': ['mints = mints.__main__:cli']},
     url='https://github.com/candy-kingdom/mints',
     author='Candy Kingdom',
     author_email='candy.kingdom.github@gmail.com',
@@ -0,0 +1,139 @@
+"""Tests for subcommands selected by abbreviations of their names."""
+
+from functools import partial
+
+import pytest
+
+from mints.args.arg import Arg
+from mints.args.opt import Opt
+from mints.cli import cli, CLI
+from mints.compiler import Compiler
+from mints.parsers.fast import FastParser
+from mints.parsers.standard import StandardParser
+from mints.parsers.trie import Trie
+
+from tests.execution import execute, redirect_stderr
+
+
+@pytest.fixture(autouse=True, params=[StandardParser,
+                                      partial(StandardParser, lazy=False),
+                                      FastParser])
+def reset(request):
+    # Reset `cli` before each test
+    # as if we have just imported it,
+    # and run the test with each parser.
+    globals()['cli'] = CLI()
+    globals()['cli'].parser = request.param(globals()['cli'])
+
+    # Define a typical CLI with abbreviations.
+    @cli
+    def tool():
+        pass
+
+    @tool.command
+    def deploy():
+        pass
+
+    @tool.command
+    def delete(service: Arg):
+        return 'delete', service
+
+    @tool.command
+    def status():
+        return 'status'
+
+    @deploy.command
+    def update(region: Opt = 'eu'):
+        return 'update', region
+
+    @deploy.command
+    def up():
+        return 'up'
+
+    @deploy.command
+    def rollback():
+        return 'rollback'
+
+
+def test_unambiguous_abbreviation_is_resolved():
+    # Act.
+    cx_a = execute(cli, 'st')
+    cx_b = execute(cli, 'del api')
+    cx_c = execute(cli, 'dep upd --region us')
+    cx_d = execute(cli, 'dep r')
+
+    # Assert.
+    assert cx_a == 'status'
+    assert cx_b == ('delete', 'api')
+    assert cx_c == ('update', 'us')
+    assert cx_d == 'rollback'
+
+
+def test_exact_name_is_preferred_over_longer_one():
+    # Act.
+    cx = execute(cli, 'deploy up')
+
+    # Assert.
+    assert cx == 'up'
+
+
+def test_ambiguous_abbreviation_reports_candidates():
+    # Act.
+    cx_a, err_a = execute(cli, 'de', redirect_stderr)
+    cx_b, err_b = execute(cli, 'deploy u', redirect_stderr)
+
+    # Assert.
+    assert isinstance(cx_a, SystemExit)
+    assert isinstance(cx_b, SystemExit)
+    assert "'de' could match 'deploy', 'delete'" in err_a
+    assert "'u' could match 'update', 'up'" in err_b
+
+
+def test_unknown_name_is_refused():
+    # Act.
+    cx, err = execute(cli, 'x', redirect_stderr)
+
+    # Assert.
+    assert isinstance(cx, SystemExit)
+    assert "invalid choice: 'x'" in err
+
+
+def test_empty_name_is_refused():
+    # Arrange.
+    @cli.main.subcommands['status'].command
+    def verbose():
+        return 'verbose'
+
+    # Act.
+    cx_a, err_a = execute(lambda _: cli(['']), '', redirect_stderr)
+    cx_b, err_b = execute(lambda _: cli(['status', '']), '',
+                          redirect_stderr)
+
+    # Assert.
+    assert isinstance(cx_a, SystemExit)
+    assert isinstance(cx_b, SystemExit)
+    assert "invalid choice: ''" in err_a
+    assert "invalid choice: ''" in err_b
+
+
+def test_name_that_is_prefix_of_another_is_not_conflicting():
+    # Act.
+    source = Compiler(cli, 'tools:cli').source()
+
+    # Assert.
+    assert "'up'" in source
+    assert "'update'" in source
+
+
+def test_trie_candidates():
+    # Arrange.
+    trie = Trie([*(f'command-{i}' for i in range(1000)), 'deploy'])
+
+    # Act & Assert.
+    assert trie.candidates('command-999') == ('command-999',)
+    assert trie.candidates('command-9') == ('command-9',)
+    assert trie.candidates('command-1000') == ()
+    assert trie.candidates('d') == ('deploy',)
+    assert trie.candidates('x') == ()
+    assert trie.candidates('') == ()
+    assert len(trie.candidates('command-')) == 1000
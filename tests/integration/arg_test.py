@@ -5,16 +5,20 @@ from typing import Any
 import pytest
 
 from mints.cli import cli, CLI
+from mints.parsers.fast import FastParser
+from mints.parsers.standard import StandardParser
 from mints.args.arg import Arg
 
 from tests.execution import execute, redirect_stderr
 
 
-@pytest.fixture(autouse=True)
-def reset():
+@pytest.fixture(autouse=True, params=[StandardParser, FastParser])
+def reset(request):
     # Reset `cli` before each test
-    # as if we have just imported it.
+    # as if we have just imported it,
+    # and run the test with each parser.
     globals()['cli'] = CLI()
+    globals()['cli'].parser = request.param(globals()['cli'])
 
 
 def test_no_args():
@@ -31,17 +35,25 @@ def test_no_args():
 
 
 def test_arg_without_annotation():
+    # Act & Assert.
+    with pytest.raises(ValueError, match="'x' must have an annotation"):
+        @cli
+        def main(x):
+            return x
+
+
+def test_param_with_default_without_annotation_is_skipped():
     # Arrange.
     @cli
-    def main(x):
-        return x
+    def main(x: Arg, d=5):
+        return x, d
 
     # Act.
-    ex = execute(cli, with_='')
+    cx = execute(cli, with_='1')
 
     # Assert.
-    assert isinstance(ex, ValueError)
-    assert "'x' must have an annotation" in str(ex)
+    assert cx == ('1', 5)
+    assert [x.name for x in cli.main.spec.params] == ['x']
 
 
 def test_one_arg():
@@ -0,0 +1,133 @@
+"""Tests for asynchronous (`async def`) commands."""
+
+import asyncio
+from typing import Any
+
+import pytest
+
+from mints.args.arg import Arg
+from mints.args.opt import Opt
+from mints.cli import cli, CLI
+from mints.parsers.fast import FastParser
+from mints.parsers.standard import StandardParser
+
+from tests.execution import execute
+
+
+@pytest.fixture(autouse=True, params=[StandardParser, FastParser])
+def reset(request):
+    # Reset `cli` before each test
+    # as if we have just imported it,
+    # and run the test with each parser.
+    globals()['cli'] = CLI()
+    globals()['cli'].parser = request.param(globals()['cli'])
+
+
+def test_async_main_is_awaited():
+    # Arrange.
+    @cli
+    async def main(x: Arg[int]):
+        await asyncio.sleep(0)
+
+        return x
+
+    # Act.
+    cx = execute(cli, '1')
+
+    # Assert.
+    assert cx == 1
+
+
+def test_awaited_results_are_chained():
+    # Arrange.
+    @cli
+    async def main(x: Arg[int]):
+        return x + 1
+
+    @main.command
+    def one(x: int):
+        return x * 10
+
+    @one.command
+    async def two(x: int, y: Opt[int] = 1):
+        await asyncio.sleep(0)
+
+        return x + y
+
+    # Act.
+    cx = execute(cli, '1 one two --y 2')
+
+    # Assert.
+    assert cx == 22
+
+
+def test_async_subcommand_of_sync_command():
+    # Arrange.
+    @cli
+    def main():
+        return 'context'
+
+    @main.command
+    async def one(context: Any):
+        return context
+
+    # Act.
+    cx = execute(cli, 'one')
+
+    # Assert.
+    assert cx == 'context'
+
+
+def test_one_loop_is_used_per_call():
+    # Arrange.
+    loops = []
+
+    @cli
+    async def main():
+        loops.append(asyncio.get_running_loop())
+
+    @main.command
+    async def one():
+        loops.append(asyncio.get_running_loop())
+
+    # Act.
+    execute(cli, 'one')
+    execute(cli, 'one')
+
+    # Assert.
+    assert loops[0] is loops[1]
+    assert loops[1] is not loops[2]
+    assert loops[2] is loops[3]
+
+
+def test_shared_loop_is_reused():
+    # Arrange.
+    loops = []
+
+    @cli
+    async def main():
+        loops.append(asyncio.get_running_loop())
+
+    cli.loop = asyncio.new_event_loop()
+
+    # Act.
+    execute(cli, '')
+    cli.invoke()
+    cli.loop.close()
+
+    # Assert.
+    assert loops == [cli.loop, cli.loop]
+
+
+def test_async_command_is_invoked_directly():
+    # Arrange.
+    @cli
+    async def main(x: Arg[int]):
+        return x
+
+    # Act.
+    result_a = cli.invoke(x=1)
+    result_b = asyncio.run(main.invoke(x='2'))
+
+    # Assert.
+    assert (result_a, result_b) == (1, 2)
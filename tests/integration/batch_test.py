@@ -0,0 +1,339 @@
+"""Tests for `CLI.batch` and `--mints-batch`."""
+
+import asyncio
+import io
+import os
+import sys
+from typing import List
+
+import pytest
+
+from mints.args.arg import Arg
+from mints.args.flag import Flag
+from mints.args.opt import Opt
+from mints.batch import Journal, digest_of
+from mints.cli import cli, CLI
+from mints.parsers.fast import FastParser
+from mints.parsers.standard import StandardParser
+
+from tests.execution import execute, redirect_stderr, redirect_stdout
+
+
+LINES = '''\
+add 1 2
+add 1 x
+
+# A comment.
+add 'a b' 3 --twice
+fail --code 3
+crash
+add "1
+'''
+
+
+@pytest.fixture(autouse=True, params=[StandardParser, FastParser])
+def reset(request):
+    # Reset `cli` before each test
+    # as if we have just imported it,
+    # and run the test with each parser.
+    globals()['cli'] = CLI()
+    globals()['cli'].parser = request.param(globals()['cli'])
+
+    # Define a typical CLI to execute lines with.
+    @cli
+    def tool():
+        pass
+
+    @tool.command
+    def add(a: Arg, b: Arg[int], twice: Flag = False):
+        print(f'{a} + {b}' * (2 if twice else 1))
+
+    @tool.command
+    def fail(code: Opt[int]):
+        sys.exit(code)
+
+    @tool.command
+    def crash():
+        raise RuntimeError('Crashed.')
+
+
+def test_lines_are_executed():
+    # Act.
+    (results, err), out = execute(
+        lambda _: execute(lambda _: cli.batch(io.StringIO(LINES)), '',
+                          redirect_stderr),
+        '', redirect_stdout)
+
+    # Assert.
+    assert [(x.number, x.line, x.status) for x in results] == [
+        (1, 'add 1 2', 0),
+        (2, 'add 1 x', 2),
+        (5, "add 'a b' 3 --twice", 0),
+        (6, 'fail --code 3', 3),
+        (7, 'crash', 1),
+        (8, 'add "1', 2),
+    ]
+    assert all(x.duration >= 0 for x in results)
+    assert out == '1 + 2\na b + 3a b + 3\n'
+    assert "invalid int value: 'x'" in err
+    assert 'RuntimeError: Crashed.' in err
+    assert 'No closing quotation' in err
+
+
+def test_parser_is_reused():
+    # Arrange.
+    cli.parser = StandardParser(cli)
+
+    # Act.
+    execute(lambda _: cli.batch(['add 1 2'] * 5), '', redirect_stdout)
+
+    # Assert.
+    assert (cli.parser.hits, cli.parser.misses) == (4, 1)
+
+
+def test_loop_is_shared():
+    # Arrange.
+    loops = []
+
+    @cli.main.command
+    async def wait():
+        loops.append(asyncio.get_running_loop())
+
+    # Act.
+    cli.batch(['wait', 'wait'])
+
+    # Assert.
+    assert loops[0] is loops[1]
+    assert loops[0].is_closed()
+    assert cli.loop is None
+
+
+def test_batch_option(tmp_path):
+    # Arrange.
+    path = tmp_path / 'lines.txt'
+    path.write_text('add 1 2\ncrash\n')
+
+    # Act.
+    (ex, err), out = execute(
+        lambda _: execute(cli, f'--mints-batch {path}', redirect_stderr),
+        '', redirect_stdout)
+
+    # Assert.
+    assert isinstance(ex, SystemExit)
+    assert ex.code == 1
+    assert out == '1 + 2\n'
+    assert err.splitlines()[-3].startswith('1    0')
+    assert err.splitlines()[-3].endswith('ms  add 1 2')
+    assert err.splitlines()[-2].startswith('2    1')
+    assert err.splitlines()[-1].startswith('2 lines: 1 succeeded, 1 failed')
+
+
+def test_batch_option_reads_stdin(monkeypatch):
+    # Arrange.
+    monkeypatch.setattr(sys, 'stdin', io.StringIO('add 1 2\n'))
+
+    # Act.
+    (ex, err), out = execute(
+        lambda _: execute(cli, '--mints-batch -', redirect_stderr),
+        '', redirect_stdout)
+
+    # Assert.
+    assert ex.code == 0
+    assert out == '1 + 2\n'
+    assert err.splitlines()[-1].startswith('1 lines: 1 succeeded, 0 failed')
+
+
+@pytest.mark.parametrize('ordered', [True, False])
+def test_lines_are_executed_by_jobs(ordered):
+    # Act.
+    (results, err), out = execute(
+        lambda _: execute(lambda _: cli.batch(io.StringIO(LINES), jobs=2,
+                                              ordered=ordered),
+                          '', redirect_stderr),
+        '', redirect_stdout)
+
+    # Assert.
+    assert sorted((x.number, x.status) for x in results) == \
+        [(1, 0), (2, 2), (5, 0), (6, 3), (7, 1), (8, 2)]
+    assert sorted(out.splitlines()) == ['1 + 2', 'a b + 3a b + 3']
+    assert "invalid int value: 'x'" in err
+    assert 'RuntimeError: Crashed.' in err
+
+    if ordered:
+        assert [x.number for x in results] == [1, 2, 5, 6, 7, 8]
+        assert out == '1 + 2\na b + 3a b + 3\n'
+
+
+def test_output_of_jobs_does_not_interleave():
+    # Arrange.
+    @cli.main.command
+    def chunks(n: Arg[int]):
+        for i in range(100):
+            print(f'{n}:{i}', end=' ', flush=True)
+
+        print()
+
+    # Act.
+    _, out = execute(
+        lambda _: cli.batch(f'chunks {i}' for i in range(8)), '',
+        redirect_stdout)
+    results, out_jobs = execute(
+        lambda _: cli.batch((f'chunks {i}' for i in range(8)), jobs=4),
+        '', redirect_stdout)
+
+    # Assert.
+    assert out_jobs == out
+    assert [x.status for x in results] == [0] * 8
+
+
+def test_jobs_option(tmp_path):
+    # Arrange.
+    path = tmp_path / 'lines.txt'
+    path.write_text('add 1 2\nadd 3 4\nadd 5 x\n')
+
+    # Act.
+    (ex, err), out = execute(
+        lambda _: execute(cli, f'--mints-batch {path} --mints-jobs 2 '
+                               f'--mints-unordered',
+                          redirect_stderr),
+        '', redirect_stdout)
+
+    # Assert.
+    assert ex.code == 1
+    assert sorted(out.splitlines()) == ['1 + 2', '3 + 4']
+    assert [x.split()[:2] for x in err.splitlines()[-4:-1]] == \
+        [['1', '0'], ['2', '0'], ['3', '2']]
+
+
+@pytest.mark.parametrize('line, message', [
+    ('--mints-batch', 'expected a value'),
+    ('--mints-batch - --mints-jobs x', 'invalid literal'),
+    ('--mints-batch - --x', 'unrecognized argument: --x'),
+])
+def test_invalid_batch_options(line, message):
+    # Act.
+    ex, err = execute(cli, line, redirect_stderr)
+
+    # Assert.
+    assert ex.code == 2
+    assert message in err
+
+
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_succeeded_lines_are_skipped_on_restart(tmp_path, jobs):
+    # Arrange.
+    journal = str(tmp_path / 'batch.journal')
+    lines = ['add 1 2', 'add 1 x', 'add 3 4', 'add 1 2']
+
+    # Act.
+    results_a, out_a = execute(
+        lambda _: cli.batch(lines, jobs=jobs, journal=journal), '',
+        redirect_stdout)
+    results_b, out_b = execute(
+        lambda _: cli.batch(lines + ['add 5 6'], jobs=jobs, journal=journal),
+        '', redirect_stdout)
+
+    # Assert.
+    assert [x.number for x in results_a] == [1, 2, 3, 4]
+    assert out_a == '1 + 2\n3 + 4\n1 + 2\n'
+    assert [(x.number, x.status) for x in results_b] == [(2, 2), (5, 0)]
+    assert out_b == '5 + 6\n'
+
+
+def test_partial_record_is_dropped(tmp_path):
+    # Arrange.
+    journal = tmp_path / 'batch.journal'
+
+    execute(lambda _: cli.batch(['add 1 2', 'add 3 4'],
+                                journal=str(journal)), '', redirect_stdout)
+
+    # Simulate a crash while the last record was written.
+    journal.write_bytes(journal.read_bytes()[:-5])
+
+    # Act.
+    results, out = execute(
+        lambda _: cli.batch(['add 1 2', 'add 3 4', 'add 5 6'],
+                            journal=str(journal)), '', redirect_stdout)
+
+    # Assert.
+    assert [x.number for x in results] == [2, 3]
+    assert out == '3 + 4\n5 + 6\n'
+    assert len(journal.read_bytes()) == 3 * 17
+
+
+def test_journal_is_synced_in_batches(tmp_path, monkeypatch):
+    # Arrange.
+    synced = []
+    monkeypatch.setattr(os, 'fsync', synced.append)
+
+    # Act.
+    with Journal(str(tmp_path / 'batch.journal'), sync=3,
+                 interval=60) as journal:
+        for i in range(7):
+            journal.add(digest_of(i, 'x'), 0)
+
+    # Assert.
+    assert len(synced) == 3
+
+
+def test_journal_option(tmp_path):
+    # Arrange.
+    path = tmp_path / 'lines.txt'
+    path.write_text('add 1 2\nadd 3 x\n')
+    line = f'--mints-batch {path} --mints-journal {tmp_path / "journal"}'
+
+    # Act.
+    execute(cli, line, redirect_stdout)
+    (ex, err), out = execute(
+        lambda _: execute(cli, line, redirect_stderr), '', redirect_stdout)
+
+    # Assert.
+    assert ex.code == 1
+    assert out == ''
+    assert err.splitlines()[-1].startswith(
+        '1 lines: 0 succeeded, 1 failed, 1 skipped')
+
+
+def test_hash_within_line_is_not_comment():
+    # Arrange.
+    @cli.main.command
+    def fetch(url: Arg, names: Arg[List[str]]):
+        print(url, names)
+
+    # Act.
+    results, out = execute(
+        lambda _: cli.batch(['fetch http://h/p#frag a b',
+                             'fetch issue#12 x',
+                             '  # fetch x y']),
+        '', redirect_stdout)
+
+    # Assert.
+    assert [(x.number, x.status) for x in results] == [(1, 0), (2, 0)]
+    assert out == "http://h/p#frag ['a', 'b']\nissue#12 ['x']\n"
+
+
+@pytest.mark.parametrize('ordered', [True, False])
+def test_line_that_kills_worker_is_reported(ordered):
+    # Arrange.
+    @cli.main.command
+    def die(code: Arg[int]):
+        os._exit(code)
+
+    lines = ['add 1 2', 'die 9', 'add 3 4', 'add 5 6', 'die 3', 'add 7 8']
+
+    # Act.
+    (results, err), out = execute(
+        lambda _: execute(lambda _: cli.batch(lines, jobs=2,
+                                              ordered=ordered),
+                          '', redirect_stderr),
+        '', redirect_stdout)
+
+    # Assert.
+    assert sorted((x.number, x.status) for x in results) == \
+        [(1, 0), (2, 1), (3, 0), (4, 0), (5, 1), (6, 0)]
+    assert sorted(out.splitlines()) == ['1 + 2', '3 + 4', '5 + 6', '7 + 8']
+    assert 'has died while executing the line 2: die 9' in err
+    assert 'has died while executing the line 5: die 3' in err
+
+    if ordered:
+        assert [x.number for x in results] == [1, 2, 3, 4, 5, 6]
@@ -0,0 +1,185 @@
+"""Various tests for `mints build` (see `mints.bundle.Bundle`)."""
+
+import importlib
+import os
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+from mints.args.arg import Arg
+from mints.bundle import Bundle
+from mints.cli import CLI
+
+
+MODULES = {
+    '__init__': '',
+    'cli': '''
+        from mints import CLI, Flag
+
+        cli = CLI()
+
+
+        @cli
+        def app(verbose: Flag(short='v')):
+            """An application."""
+
+
+        @app.command
+        def status():
+            print('clean')
+
+
+        @status.help
+        def status_help(command):
+            return 'Custom help.\\n'
+
+
+        cli.main.command('bundled.fetch:fetch')
+        cli.main.command('bundled.merge:merge', description='Merges.')
+    ''',
+    'fetch': '''
+        from mints import Arg, Opt
+
+        from bundled.types import Depth
+
+
+        def fetch(remote: Arg('A remote.'), depth: Opt[Depth] = None):
+            """Fetches a remote."""
+            print(f'fetching {remote} {depth}')
+    ''',
+    'merge': '''
+        from mints import Arg
+
+
+        def merge(branch: Arg):
+            print(f'merging {branch}')
+    ''',
+    'types': '''
+        class Depth:
+            def __init__(self, value):
+                self.value = int(value)
+
+            def __str__(self):
+                return f'depth={self.value}'
+    ''',
+}
+
+
+@pytest.fixture
+def zipapp(tmp_path):
+    """Writes a package with a CLI, builds a zipapp and returns its path."""
+
+    package = tmp_path / 'src' / 'bundled'
+    package.mkdir(parents=True)
+
+    for name, source in MODULES.items():
+        (package / f'{name}.py').write_text(textwrap.dedent(source))
+
+    sys.path.insert(0, str(tmp_path / 'src'))
+    output = tmp_path / 'tool.pyz'
+
+    module = importlib.import_module('bundled.cli')
+    Bundle(module.cli, 'bundled.cli:cli').build(str(output))
+
+    yield output
+
+    sys.path.remove(str(tmp_path / 'src'))
+
+    for name in [x for x in sys.modules if x.startswith('bundled')]:
+        del sys.modules[name]
+
+
+def run(zipapp, line: str):
+    """Runs the zipapp in a fresh interpreter without `mints` installed.
+
+    Returns:
+        A tuple of (<output>, <names-of-imported-modules>).
+    """
+
+    code = textwrap.dedent(f'''
+        import runpy
+        import sys
+
+        sys.argv = [{str(zipapp)!r}, *{line.split()!r}]
+
+        try:
+            runpy.run_path({str(zipapp)!r}, run_name='__main__')
+        except SystemExit:
+            pass
+
+        print(' '.join(sorted(sys.modules)), file=sys.stderr)
+    ''')
+
+    env = {k: v for k, v in os.environ.items() if k != 'PYTHONPATH'}
+    env['COLUMNS'] = '80'
+
+    process = subprocess.run([sys.executable, '-c', code],
+                             env=env, check=True, text=True,
+                             stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                             cwd=str(zipapp.parent))
+    modules = process.stderr.splitlines()[-1].split()
+
+    return process.stdout.strip(), \
+        {x for x in modules if x.startswith('bundled')}
+
+
+def test_only_selected_command_is_imported(zipapp):
+    # Act.
+    out, modules = run(zipapp, 'fetch origin --depth 3')
+
+    # Assert.
+    assert out == 'fetching origin depth=3'
+    assert modules == {'bundled', 'bundled.cli', 'bundled.fetch',
+                       'bundled.types'}
+
+
+def test_command_with_fallback_is_run(zipapp):
+    # Act.
+    out, modules = run(zipapp, '--verb merge develop')
+
+    # Assert.
+    assert out == 'merging develop'
+    assert 'bundled.fetch' not in modules
+
+
+def test_help_does_not_import_commands(zipapp):
+    # Act.
+    out, modules = run(zipapp, 'fetch --help')
+
+    # Assert.
+    assert 'Fetches a remote.' in out
+    assert 'bundled.fetch' not in modules
+    assert 'bundled.merge' not in modules
+
+
+def test_custom_help_is_used(zipapp):
+    # Act.
+    out, _ = run(zipapp, 'status --help')
+
+    # Assert.
+    assert out == 'Custom help.'
+
+
+def test_zipapp_is_executable(zipapp):
+    # Act.
+    out = subprocess.run([sys.executable, str(zipapp), 'status'],
+                         check=True, text=True, stdout=subprocess.PIPE,
+                         cwd=str(zipapp.parent)).stdout
+
+    # Assert.
+    assert out == 'clean\n'
+
+
+def test_local_command_cannot_be_bundled(tmp_path):
+    # Arrange.
+    cli = CLI()
+
+    @cli
+    def main(x: Arg):
+        pass
+
+    # Act & Assert.
+    with pytest.raises(ValueError, match='cannot be imported'):
+        Bundle(cli, 'x:cli').manifest()
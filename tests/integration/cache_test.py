@@ -0,0 +1,252 @@
+"""Various tests for `mints.cache.Cache`."""
+
+import importlib
+import os
+import sys
+import textwrap
+
+import pytest
+
+from mints.args.arg import Arg
+from mints.cache import Cache
+from mints.cli import CLI
+from mints.spec import CommandSpec
+
+from tests.execution import execute
+
+
+SOURCE = '''
+from typing import List
+
+from mints import CLI, Arg, Opt, Flag
+
+
+class Money:
+    def __init__(self, value):
+        self.value = value
+
+
+def new_cli(cache):
+    cli = CLI(cache=cache)
+    cli(main)
+    cli.main.command(one)
+    return cli
+
+
+def main(a: Arg[int],
+         b: Opt[List[float]]('Description of `b`.', short='b') = (1.0,),
+         c: Flag(prefix='+') = False):
+    pass
+
+
+def one(x: Arg[Money], y: Opt = 'y'):
+    return x.value, y
+'''
+
+
+@pytest.fixture
+def module(tmp_path):
+    """Writes a module with commands and imports it."""
+
+    name = f'cached_{abs(hash(str(tmp_path))):x}'
+    path = tmp_path / f'{name}.py'
+
+    def new(source: str = SOURCE):
+        path.write_text(textwrap.dedent(source))
+
+        # Make sure the module file looks changed, even if it is
+        # rewritten within the resolution of the file system clock.
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+        sys.modules.pop(name, None)
+        importlib.invalidate_caches()
+
+        return importlib.import_module(name)
+
+    sys.path.insert(0, str(tmp_path))
+    yield new
+    sys.path.remove(str(tmp_path))
+    sys.modules.pop(name, None)
+
+
+def test_spec_is_loaded_from_cache(module, tmp_path):
+    # Arrange.
+    m = module()
+    cache_a = Cache(str(tmp_path / 'cache'))
+    cache_b = Cache(str(tmp_path / 'cache'))
+
+    # Act.
+    cli_a = m.new_cli(cache_a)
+    cx_a = execute(cli_a, '1 one 2')
+
+    cli_b = m.new_cli(cache_b)
+    cx_b = execute(cli_b, '1 one 2 --y 3')
+
+    # Assert.
+    assert (cache_a.hits, cache_a.misses) == (0, 2)
+    assert (cache_b.hits, cache_b.misses) == (2, 0)
+    assert cx_a == ('2', 'y')
+    assert cx_b == ('2', '3')
+
+
+def test_cached_spec_is_the_same_as_computed(module, tmp_path):
+    # Arrange.
+    m = module()
+    cache = Cache(str(tmp_path / 'cache'))
+
+    m.new_cli(cache)
+    cache.save()
+
+    # Act.
+    cache = Cache(str(tmp_path / 'cache'))
+    cli = m.new_cli(cache)
+
+    # Assert.
+    assert cache.hits == 2
+    assert cli.main.spec == CommandSpec.of(m.main)
+    assert cli.main.subcommands['one'].spec == CommandSpec.of(m.one)
+
+
+def test_cache_is_invalidated_when_module_changes(module, tmp_path):
+    # Arrange.
+    m = module()
+    cache = Cache(str(tmp_path / 'cache'))
+
+    execute(m.new_cli(cache), '1')
+
+    # Act.
+    m = module(SOURCE.replace("y: Opt = 'y'", "y: Flag = False"))
+    cache = Cache(str(tmp_path / 'cache'))
+    cli = m.new_cli(cache)
+    cx = execute(cli, '1 one 2 --y')
+
+    # Assert.
+    assert (cache.hits, cache.misses) == (0, 2)
+    assert cx == ('2', True)
+
+
+def test_cache_is_saved_only_when_changed(module, tmp_path):
+    # Arrange.
+    m = module()
+    cache = Cache(str(tmp_path / 'cache'))
+    cli = m.new_cli(cache)
+
+    # Act.
+    execute(cli, '1')
+    files = os.listdir(tmp_path / 'cache')
+    mtimes = [os.stat(tmp_path / 'cache' / x).st_mtime_ns for x in files]
+    execute(cli, '2')
+
+    # Assert.
+    assert len(files) == 1
+    assert mtimes == [os.stat(tmp_path / 'cache' / x).st_mtime_ns
+                      for x in files]
+
+
+def test_corrupted_cache_is_ignored(module, tmp_path):
+    # Arrange.
+    m = module()
+    cache = Cache(str(tmp_path / 'cache'))
+    execute(m.new_cli(cache), '1')
+
+    for file in os.listdir(tmp_path / 'cache'):
+        (tmp_path / 'cache' / file).write_bytes(b'\x00garbage')
+
+    # Act.
+    cache = Cache(str(tmp_path / 'cache'))
+    cx = execute(m.new_cli(cache), '1 one 2')
+
+    # Assert.
+    assert (cache.hits, cache.misses) == (0, 2)
+    assert cx == ('2', 'y')
+
+
+def test_local_command_is_not_cached(tmp_path):
+    # Arrange.
+    cache = Cache(str(tmp_path / 'cache'))
+    cli = CLI(cache=cache)
+
+    @cli
+    def main(x: Arg):
+        return x
+
+    # Act.
+    execute(cli, '1')
+
+    # Assert.
+    assert (cache.hits, cache.misses) == (0, 1)
+    assert not os.path.exists(tmp_path / 'cache')
+
+
+def test_defaults_are_read_from_function(module, tmp_path, monkeypatch):
+    # Arrange.
+    m = module(SOURCE + textwrap.dedent('''
+        import os
+
+        def env(region: Opt = os.environ.get('REGION', 'eu'),
+                dry: Flag = os.environ.get('DRY') == '1'):
+            return region, dry
+
+        def new_env_cli(cache):
+            cli = CLI(cache=cache)
+            cli(env)
+            return cli
+        '''))
+
+    monkeypatch.setenv('REGION', 'us')
+    execute(m.new_env_cli(Cache(str(tmp_path / 'cache'))), '')
+
+    # Import the same (unchanged) module file again.
+    monkeypatch.setenv('REGION', 'ap')
+    monkeypatch.setenv('DRY', '1')
+    sys.modules.pop(m.__name__)
+    m = importlib.import_module(m.__name__)
+
+    # Act.
+    cache = Cache(str(tmp_path / 'cache'))
+    cx = execute(m.new_env_cli(cache), '')
+
+    # Assert.
+    assert cx == ('ap', True)
+    assert (cache.hits, cache.misses) == (1, 0)
+    assert cache.spec(m.env) == CommandSpec.of(m.env)
+
+
+def test_annotations_are_read_from_function(module, tmp_path):
+    # Arrange.
+    texts = tmp_path / f'texts_{abs(hash(str(tmp_path))):x}'
+    source = SOURCE + textwrap.dedent(f'''
+        from {texts.name} import HELP, SHORT
+
+        def rename(name: Opt(HELP, short=SHORT)):
+            return name
+
+        def new_rename_cli(cache):
+            cli = CLI(cache=cache)
+            cli(rename)
+            return cli
+        ''')
+
+    texts.with_suffix('.py').write_text("HELP = 'A name.'\nSHORT = 'r'\n")
+    m = module(source)
+    execute(m.new_rename_cli(Cache(str(tmp_path / 'cache'))), '-r x')
+
+    # Change only the module with the texts.
+    texts.with_suffix('.py').write_text("HELP = 'A new name.'\nSHORT = 'g'\n")
+    sys.modules.pop(texts.name)
+    sys.modules.pop(m.__name__)
+    importlib.invalidate_caches()
+    m = importlib.import_module(m.__name__)
+
+    # Act.
+    cache = Cache(str(tmp_path / 'cache'))
+    cli = m.new_rename_cli(cache)
+    cx_a = execute(cli, '-g y')
+    cx_b = execute(cli, '-r y')
+
+    # Assert.
+    assert (cache.hits, cache.misses) == (1, 0)
+    assert cx_a == 'y'
+    assert isinstance(cx_b, SystemExit)
+    assert cli.main.spec.params[0].description == 'A new name.'
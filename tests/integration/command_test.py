@@ -1,6 +1,7 @@
 """Various tests for `mints.command.Command`."""
 
 from typing import Any
+from unittest import mock
 
 import pytest
 
@@ -8,15 +9,19 @@ from mints.args.arg import Arg
 from mints.args.opt import Opt
 from mints.args.flag import Flag
 from mints.cli import cli, CLI
+from mints.parsers.fast import FastParser
+from mints.parsers.standard import StandardParser
 
 from tests.execution import execute
 
 
-@pytest.fixture(autouse=True)
-def reset():
+@pytest.fixture(autouse=True, params=[StandardParser, FastParser])
+def reset(request):
     # Reset `cli` before each test
-    # as if we have just imported it.
+    # as if we have just imported it,
+    # and run the test with each parser.
     globals()['cli'] = CLI()
+    globals()['cli'].parser = request.param(globals()['cli'])
 
 
 def test_nonexistent_command_name():
@@ -191,3 +196,61 @@ def test_two_commands_with_different_arguments():
     # Assert.
     assert cx_a == (+1, +2, True)
     assert cx_b == (-1, -2, True)
+
+
+def test_command_is_not_inspected_on_each_call():
+    # Arrange.
+    @cli
+    def main(x: Arg[int]):
+        return x
+
+    # Act.
+    with mock.patch('inspect.signature') as signature:
+        cx_a = execute(cli, '1')
+        cx_b = execute(cli, '2')
+
+    # Assert.
+    assert (cx_a, cx_b) == (1, 2)
+    assert not signature.called
+
+
+def test_compact_tree_shares_equal_specs():
+    # Arrange.
+    @cli
+    def main():
+        pass
+
+    def leaf(x: Opt[int] = 1, y: Flag = False):
+        return x, y
+
+    def other(x: Opt[int] = True, y: Flag = False):
+        return x, y
+
+    def nested(x: Opt[int] = (1,), y: Flag = False):
+        return x, y
+
+    def nested_other(x: Opt[int] = (True,), y: Flag = False):
+        return x, y
+
+    a = main.command(leaf, name='a')
+    b = main.command(leaf, name='b')
+    c = main.command(other, name='c')
+    d = main.command(nested, name='d')
+    e = main.command(nested_other, name='e')
+
+    # Act.
+    main.compact()
+
+    cx_a = execute(cli, 'a --x 2 --y')
+    cx_b = execute(cli, 'b')
+    cx_c = execute(cli, 'c')
+    cx_e = execute(cli, 'e')
+
+    # Assert.
+    assert a.spec is b.spec
+    assert a.spec is not c.spec
+    assert d.spec is not e.spec
+    assert a.subcommands is b.subcommands
+    assert (cx_a, cx_b, cx_c) == ((2, True), (1, False), (True, False))
+    assert cx_e == ((True,), False)
+    assert type(cx_e[0][0]) is bool
@@ -0,0 +1,285 @@
+"""Various tests for `mints compile` and `mints.parsers.CompiledParser`."""
+
+import importlib
+import os
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+from mints.args.arg import Arg
+from mints.cli import CLI
+from mints.compiler import Compiler
+from mints.parsers.compiled import CompiledParser
+from mints.parsers.parser import Parser
+from mints.parsers.standard import StandardParser
+
+from tests.execution import execute, redirect_stdout
+
+
+SOURCE = '''
+from typing import List
+
+from mints import CLI, Arg, Opt, Flag
+
+
+class Money:
+    def __init__(self, value):
+        self.value = value
+
+    def __eq__(self, other):
+        return self.value == other.value
+
+
+cli = CLI()
+
+
+@cli
+def main(a: Arg[int],
+         b: Opt[List[int]] = None,
+         c: Flag('Description.', short='c') = False,
+         d: Opt(prefix='+') = 'd'):
+    pass
+
+
+@main.command
+def one(x: Arg, y: Arg[List[float]], z: Arg):
+    pass
+
+
+@main.command
+def two(x: Opt[int](short='x') = '5'):
+    pass
+
+
+@two.command
+def three(w: Flag(prefix='+'), m: Opt[Money] = None):
+    pass
+'''
+
+
+class Forbidden(Parser):
+    def parse(self, args):
+        raise AssertionError(f'Unexpected fallback for {args}.')
+
+
+@pytest.fixture
+def modules(tmp_path):
+    """Writes a module with a CLI, compiles it and imports both modules."""
+
+    name = f'compiled_{abs(hash(str(tmp_path))):x}'
+    (tmp_path / f'{name}.py').write_text(textwrap.dedent(SOURCE))
+
+    sys.path.insert(0, str(tmp_path))
+    module = importlib.import_module(name)
+
+    source = Compiler(module.cli, f'{name}:cli').source()
+    (tmp_path / f'{name}_compiled.py').write_text(source)
+
+    yield module, importlib.import_module(f'{name}_compiled')
+
+    sys.path.remove(str(tmp_path))
+    sys.modules.pop(name)
+    sys.modules.pop(f'{name}_compiled')
+
+
+def invocations(parser: Parser, line: str):
+    try:
+        return [(x.args, x.next) for x in parser.parse(line.split())]
+    except SystemExit as e:
+        return e.code
+
+
+@pytest.mark.parametrize('line', ['1',
+                                  '1 -c',
+                                  '-c 1 --b 2 3',
+                                  '1 ++d x --c',
+                                  '1 one a b',
+                                  '1 one a 1 2 3 b',
+                                  '1 -c one a b',
+                                  '1 two',
+                                  '1 two -x 1 three',
+                                  '1 two three ++w',
+                                  '1 two three ++w --m 5'])
+def test_supported_line_is_parsed_without_fallback(modules, line):
+    # Arrange.
+    module, compiled = modules
+    parser = CompiledParser(module.cli, compiled, fallback=Forbidden())
+    standard = StandardParser(module.cli)
+
+    # Act.
+    cx_a = invocations(parser, line)
+    cx_b = invocations(standard, line)
+
+    # Assert.
+    assert cx_a == cx_b
+
+
+@pytest.mark.parametrize('line', ['',
+                                  'a',
+                                  '1 --c=1',
+                                  '1 --b 2 a',
+                                  '1 one a --c b',
+                                  '1 four',
+                                  '1 two -x',
+                                  '1 two -x a',
+                                  '1 two three --w',
+                                  '1 -h',
+                                  '1 one a --help'])
+def test_unsupported_line_is_parsed_with_fallback(modules, line):
+    # Arrange.
+    module, compiled = modules
+    parser = CompiledParser(module.cli, compiled)
+    standard = StandardParser(module.cli)
+
+    # Act.
+    cx_a = invocations(parser, line)
+    cx_b = invocations(standard, line)
+
+    # Assert.
+    assert cx_a == cx_b
+
+
+@pytest.mark.parametrize('line', ['--help',
+                                  '1 one --help',
+                                  '1 two -x 2 -h',
+                                  '1 two three -h'])
+def test_help_is_precomputed(modules, monkeypatch, line):
+    # Arrange.
+    monkeypatch.setenv('COLUMNS', '80')
+
+    module, compiled = modules
+    cli_a = CLI(module.cli.main)
+    cli_a.parser = CompiledParser(cli_a, compiled, fallback=Forbidden())
+    cli_b = CLI(module.cli.main)
+
+    # Act.
+    ex_a, out_a = execute(cli_a, line, redirect_stdout)
+    ex_b, out_b = execute(cli_b, line, redirect_stdout)
+
+    # Assert.
+    assert isinstance(ex_a, SystemExit)
+    assert isinstance(ex_b, SystemExit)
+    assert ex_a.code == ex_b.code == 0
+    assert out_a == out_b
+
+
+def test_help_for_another_width_is_not_precomputed(modules, monkeypatch):
+    # Arrange.
+    monkeypatch.setenv('COLUMNS', '40')
+
+    module, compiled = modules
+    cli_a = CLI(module.cli.main)
+    cli_a.parser = CompiledParser(cli_a, compiled)
+    cli_b = CLI(module.cli.main)
+
+    # Act.
+    _, out_a = execute(cli_a, '--help', redirect_stdout)
+    _, out_b = execute(cli_b, '--help', redirect_stdout)
+
+    # Assert.
+    assert out_a == out_b
+
+
+def test_stale_module_is_refused(modules):
+    # Arrange.
+    module, compiled = modules
+    parser = CompiledParser(module.cli, compiled)
+
+    # Act.
+    cx_a = invocations(parser, '1 one a b')
+
+    @module.cli.main.subcommands['one'].command
+    def four(x: Arg):
+        pass
+
+    # Assert.
+    assert cx_a[-1] == ({'x': 'a', 'y': [], 'z': 'b'}, None)
+    assert invocations(parser, '1 two three')[-1][1] is None
+
+    with pytest.raises(ValueError, match='one command has changed'):
+        parser.parse('1 one a b'.split())
+
+
+def test_stale_module_is_refused_after_parser_is_added(modules):
+    # Arrange.
+    module, compiled = modules
+    parser = CompiledParser(module.cli, compiled)
+
+    # Act.
+    @module.cli.parse
+    def money(x: str) -> module.Money:
+        return module.Money(x)
+
+    # Assert.
+    assert invocations(parser, '1 two')[-1] == ({'x': 5}, None)
+
+    with pytest.raises(ValueError, match='two three command has changed'):
+        parser.parse('1 two three --m 5'.split())
+
+
+def test_missing_module_is_ignored():
+    # Arrange.
+    cli = CLI()
+    cli.parser = CompiledParser(cli, 'nonexistent_compiled')
+
+    @cli
+    def main(x: Arg[int]):
+        return x
+
+    # Act.
+    cx = execute(cli, '1')
+
+    # Assert.
+    assert cx == 1
+
+
+def test_local_converter_cannot_be_compiled():
+    # Arrange.
+    class Local:
+        def __init__(self, value):
+            self.value = value
+
+    cli = CLI()
+
+    @cli
+    def main(x: Arg[Local]):
+        pass
+
+    # Act & Assert.
+    with pytest.raises(ValueError, match='cannot be imported'):
+        Compiler(cli, 'x:cli').source()
+
+
+def test_compile_command(modules, tmp_path):
+    # Arrange.
+    module, _ = modules
+    root = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+    env = dict(os.environ,
+               PYTHONPATH=os.pathsep.join([str(tmp_path), root]))
+    output = tmp_path / 'output.py'
+
+    # Act.
+    subprocess.run([sys.executable, '-m', 'mints', 'compile',
+                    f'{module.__name__}:cli', '-o', str(output)],
+                   env=env, check=True)
+
+    code = textwrap.dedent(f'''
+        import sys
+        from {module.__name__} import cli
+        from mints.parsers import CompiledParser
+
+        cli.parser = CompiledParser(cli, 'output')
+        cli(['1', 'two', 'three', '++w'])
+        print(' '.join(sorted(sys.modules)))
+    ''')
+
+    modules_ = subprocess.run([sys.executable, '-c', code],
+                              env=env, check=True, text=True,
+                              stdout=subprocess.PIPE).stdout.split()
+
+    # Assert.
+    assert 'output' in modules_
+    assert 'argparse' not in modules_
+    assert 'inspect' not in modules_
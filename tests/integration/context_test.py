@@ -0,0 +1,160 @@
+"""Tests for passing results of parent commands to subcommands."""
+
+from typing import Any, Iterable, List
+
+import pytest
+
+from mints.args.arg import Arg
+from mints.args.flag import Flag
+from mints.args.opt import Opt
+from mints.cli import cli, CLI
+from mints.parsers.fast import FastParser
+from mints.parsers.standard import StandardParser
+
+from tests.execution import execute
+
+
+@pytest.fixture(autouse=True, params=[StandardParser, FastParser])
+def reset(request):
+    # Reset `cli` before each test
+    # as if we have just imported it,
+    # and run the test with each parser.
+    globals()['cli'] = CLI()
+    globals()['cli'].parser = request.param(globals()['cli'])
+
+
+def test_result_is_passed_to_subcommand():
+    # Arrange.
+    @cli
+    def main(x: Arg[int]):
+        return {'x': x}
+
+    @main.command
+    def one(y: Opt[int], config: Any, z: Flag = False):
+        return config, y, z
+
+    # Act.
+    cx = execute(cli, '1 one --y 2 --z')
+
+    # Assert.
+    assert cx == ({'x': 1}, 2, True)
+
+
+def test_result_is_passed_through_many_levels():
+    # Arrange.
+    @cli
+    def main():
+        return 1
+
+    @main.command
+    def one(x: int):
+        return x + 1
+
+    @one.command
+    def two(x: int):
+        return x * 10
+
+    # Act.
+    cx = execute(cli, 'one two')
+
+    # Assert.
+    assert cx == 20
+
+
+def test_generator_is_consumed_lazily():
+    # Arrange.
+    events = []
+
+    @cli
+    def tool():
+        pass
+
+    @tool.command
+    def read(path: Arg):
+        for i in range(3):
+            events.append(f'read {path}:{i}')
+            yield {'col': i}
+
+    @read.command
+    def filter(records: Iterable[dict], col: Opt = 'col'):
+        for record in records:
+            events.append(f'filter {record[col]}')
+
+    # Act.
+    execute(cli, 'read big.csv filter --col col')
+
+    # Assert.
+    assert events == ['read big.csv:0', 'filter 0',
+                      'read big.csv:1', 'filter 1',
+                      'read big.csv:2', 'filter 2']
+
+
+def test_none_is_not_passed():
+    # Arrange.
+    @cli
+    def main():
+        pass
+
+    @main.command
+    def one(x: Arg, context: Any = 'default'):
+        return x, context
+
+    # Act.
+    cx = execute(cli, 'one a')
+
+    # Assert.
+    assert cx == ('a', 'default')
+
+
+def test_subcommand_without_parameter_for_result():
+    # Arrange.
+    @cli
+    def main():
+        return 1
+
+    @main.command
+    def one(x: Arg):
+        pass
+
+    # Act.
+    cx = execute(cli, 'one a')
+
+    # Assert.
+    assert isinstance(cx, ValueError)
+    assert "to 'one'" in str(cx)
+
+
+def test_result_is_passed_on_invoke():
+    # Arrange.
+    @cli
+    def main(n: Opt[int] = 3):
+        return range(n)
+
+    @main.command
+    def total(values: Iterable[int], scale: Opt[int] = 1):
+        return sum(values) * scale
+
+    # Act.
+    result_a = cli.invoke('total', scale=2)
+    result_b = total.invoke(values=[1, 2], scale='3')
+
+    # Assert.
+    assert result_a == 6
+    assert result_b == 9
+
+
+def test_result_of_last_command_is_returned():
+    # Arrange.
+    @cli
+    def main():
+        return [1]
+
+    @main.command
+    def one(xs: List[int]):
+        return xs + [2]
+
+    # Act.
+    cx = execute(cli, 'one')
+
+    # Assert.
+    assert cx == [1, 2]
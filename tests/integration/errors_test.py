@@ -0,0 +1,145 @@
+"""Tests for `ParseError` (see `StandardParser.exit_on_error`)."""
+
+from typing import List
+
+import pytest
+
+from mints import ParseError
+from mints.args.arg import Arg
+from mints.args.flag import Flag
+from mints.args.opt import Opt
+from mints.cli import cli, CLI
+from mints.parsers.fast import FastParser
+from mints.parsers.standard import StandardParser
+
+from tests.execution import execute, redirect_stderr
+
+
+@pytest.fixture(autouse=True, params=[StandardParser, FastParser])
+def reset(request):
+    # Reset `cli` before each test
+    # as if we have just imported it,
+    # and run the test with each parser.
+    globals()['cli'] = CLI()
+
+    standard = StandardParser(globals()['cli'], exit_on_error=False)
+
+    if request.param is FastParser:
+        globals()['cli'].parser = FastParser(globals()['cli'], standard)
+    else:
+        globals()['cli'].parser = standard
+
+    # Define a typical CLI to report errors for.
+    @cli
+    def tool(verbose: Flag(short='v') = False):
+        pass
+
+    @tool.command
+    def deploy(service: Arg,
+               replicas: Opt[int](short='r') = 1,
+               region: Opt = 'eu'):
+        return service, replicas, region
+
+    @deploy.command
+    def update(force: Flag(prefix='+') = False,
+               retries: Opt[int](prefix='+') = None):
+        pass
+
+    @tool.command
+    def delete(services: Arg[List[str]]):
+        pass
+
+
+def error(line: str) -> ParseError:
+    ex = execute(cli.invocations, line)
+
+    assert isinstance(ex, ParseError)
+
+    return ex
+
+
+def test_invalid_value():
+    # Act.
+    ex = error('deploy api -r x')
+
+    # Assert.
+    assert (ex.path, ex.param, ex.reason) == \
+        (('deploy',), 'replicas', "invalid int value: 'x'")
+    assert str(ex) == "argument --replicas/-r: invalid int value: 'x'"
+
+
+def test_missing_argument():
+    # Act.
+    ex = error('deploy')
+
+    # Assert.
+    assert (ex.path, ex.param, ex.reason) == \
+        (('deploy',), 'service',
+         'the following arguments are required: service')
+
+
+def test_nested_subcommand():
+    # Act.
+    ex = error('deploy api update ++retries x')
+
+    # Assert.
+    assert (ex.path, ex.param) == (('deploy', 'update'), 'retries')
+
+
+def test_invalid_and_ambiguous_subcommands():
+    # Act.
+    ex_a = error('x')
+    ex_b = error('de api')
+
+    # Assert.
+    assert (ex_a.path, ex_a.param) == ((), None)
+    assert ex_a.reason.startswith("invalid choice: 'x'")
+    assert (ex_b.path, ex_b.param, ex_b.reason) == \
+        ((), None, "ambiguous choice: 'de' could match 'deploy', 'delete'")
+
+
+def test_unrecognized_argument():
+    # Act.
+    ex = error('delete api --x')
+
+    # Assert.
+    assert (ex.path, ex.param, ex.reason) == \
+        ((), None, 'unrecognized arguments: --x')
+
+
+def test_usage_is_formatted_only_when_needed():
+    # Act.
+    ex, err = execute(cli.invocations, 'deploy', redirect_stderr)
+    deferred = callable(ex._usage)
+    usage = ex.usage
+
+    # Assert.
+    assert err == ''
+    assert deferred
+    assert usage.startswith('usage: tool deploy [-h]')
+    assert ex.usage is usage
+    assert ex.format() == f"{usage}tool deploy: error: {ex}\n"
+
+
+def test_valid_line_is_parsed():
+    # Act.
+    invocations = cli.invocations('deploy api -r 2'.split())
+
+    # Assert.
+    assert invocations[1].args == {'service': 'api', 'replicas': 2,
+                                   'region': 'eu'}
+
+
+def test_exit_on_error_is_default():
+    # Arrange.
+    cli.parser = StandardParser(cli)
+
+    # Act.
+    ex, err = execute(cli, 'deploy api -r x', redirect_stderr)
+
+    # Assert.
+    assert isinstance(ex, SystemExit)
+    assert ex.code == 2
+    assert err.startswith('usage: tool deploy')
+    assert err.endswith("tool deploy: error: argument --replicas/-r: "
+                        "invalid int value: 'x'\n")
@@ -0,0 +1,204 @@
+"""Various tests for `mints.parsers.fast.FastParser`.
+
+The behaviour of `FastParser` is also checked by the rest of the integration
+tests, which run against both `StandardParser` and `FastParser`.
+"""
+
+from typing import List
+
+import pytest
+
+from mints.args.arg import Arg
+from mints.args.flag import Flag
+from mints.args.opt import Opt
+from mints.cli import CLI
+from mints.parsers.fast import FastParser
+from mints.parsers.parser import Parser
+from mints.parsers.standard import StandardParser
+
+
+class Forbidden(Parser):
+    def parse(self, args):
+        raise AssertionError(f'Unexpected fallback for {args}.')
+
+
+def new_cli() -> CLI:
+    cli = CLI()
+
+    @cli
+    def main(a: Arg[int],
+             b: Opt[List[int]] = None,
+             c: Flag('Description.', short='c') = False,
+             d: Opt(prefix='+') = 'd'):
+        pass
+
+    @main.command
+    def one(x: Arg, y: Arg[List[float]], z: Arg):
+        pass
+
+    @main.command
+    def two(x: Opt[int](short='x') = '5'):
+        pass
+
+    @two.command
+    def three(w: Flag(prefix='+')):
+        pass
+
+    return cli
+
+
+def invocations(parser: Parser, line: str):
+    try:
+        return [(x.args, x.next) for x in parser.parse(line.split())]
+    except SystemExit as e:
+        return e.code
+
+
+@pytest.mark.parametrize('line', ['1',
+                                  '1 -c',
+                                  '-c 1 --b 2 3',
+                                  '1 ++d x --c',
+                                  '1 one a b',
+                                  '1 one a 1 2 3 b',
+                                  '1 -c one a b',
+                                  '1 two',
+                                  '1 two -x 1 three',
+                                  '1 two three ++w'])
+def test_supported_line_is_parsed_without_fallback(line):
+    # Arrange.
+    cli = new_cli()
+    fast = FastParser(cli, fallback=Forbidden())
+    standard = StandardParser(cli)
+
+    # Act.
+    cx_a = invocations(fast, line)
+    cx_b = invocations(standard, line)
+
+    # Assert.
+    assert cx_a == cx_b
+
+
+@pytest.mark.parametrize('line', ['',
+                                  'a',
+                                  '--help',
+                                  '1 --c=1',
+                                  '1 --b 2 a',
+                                  '1 one a --c b',
+                                  '1 one a 1 -c 2 b',
+                                  '1 four',
+                                  '1 two -x',
+                                  '1 two -x a',
+                                  '1 two three --w',
+                                  '1 two three +w'])
+def test_unsupported_line_is_parsed_with_fallback(line):
+    # Arrange.
+    cli = new_cli()
+    fast = FastParser(cli)
+    standard = StandardParser(cli)
+
+    # Act.
+    cx_a = invocations(fast, line)
+    cx_b = invocations(standard, line)
+
+    # Assert.
+    assert cx_a == cx_b
+
+
+@pytest.mark.parametrize('line', ['--reg us',
+                                  '--rep 2 --verb',
+                                  '--v ++ho x',
+                                  '-v --rep 2',
+                                  '--re us',
+                                  '--he',
+                                  '--reg=us',
+                                  '+h',
+                                  '--'])
+def test_abbreviated_option(line):
+    # Arrange.
+    cli = CLI()
+
+    @cli
+    def main(region: Opt = 'eu',
+             replicas: Opt[int] = 1,
+             verbose: Flag(short='v') = False,
+             host: Opt(prefix='+') = None):
+        pass
+
+    fast = FastParser(cli)
+    standard = StandardParser(cli)
+
+    # Act.
+    cx_a = invocations(fast, line)
+    cx_b = invocations(standard, line)
+
+    # Assert.
+    assert cx_a == cx_b
+
+
+def test_unambiguous_abbreviation_is_parsed_without_fallback():
+    # Arrange.
+    cli = new_cli()
+    fast = FastParser(cli, fallback=Forbidden())
+    standard = StandardParser(cli)
+
+    @cli.main.subcommands['two'].command
+    def four(verbose: Flag = False, version: Opt = None):
+        pass
+
+    # Act.
+    cx_a = invocations(fast, '1 two four --verb --vers 2')
+    cx_b = invocations(standard, '1 two four --verb --vers 2')
+
+    # Assert.
+    assert cx_a == cx_b
+
+
+def test_table_is_computed_once():
+    # Arrange.
+    cli = new_cli()
+    parser = FastParser(cli, fallback=Forbidden())
+
+    # Act.
+    parser.parse(['1'])
+    table = parser.table(cli.main)
+    parser.parse(['2'])
+
+    # Assert.
+    assert parser.table(cli.main) is table
+
+
+def test_table_is_recomputed_after_subcommand_is_added():
+    # Arrange.
+    cli = new_cli()
+    parser = FastParser(cli, fallback=Forbidden())
+
+    # Act.
+    table = parser.table(cli.main)
+
+    @cli.main.command
+    def four():
+        pass
+
+    # Assert.
+    assert parser.table(cli.main) is not table
+    assert parser.parse(['1', 'four'])[-1].args == {}
+
+
+def test_huge_list_is_parsed_without_fallback():
+    # Arrange.
+    cli = CLI()
+
+    @cli
+    def main(a: Arg, b: Arg[List[int]], c: Opt[List[str]] = None):
+        pass
+
+    fast = FastParser(cli, fallback=Forbidden())
+    args = ['x', *map(str, range(100000)), '--c', *'abc']
+
+    # Act.
+    invocation, = fast.parse(args)
+
+    # Assert.
+    assert invocation.args == {'a': 'x',
+                               'b': list(range(100000)),
+                               'c': ['a', 'b', 'c']}
@@ -1,22 +1,25 @@
 """Various tests for `mints.args.flag.Flag`."""
 
 from typing import Any
-from argparse import ArgumentError
 
 import pytest
 
 from mints.cli import cli, CLI
+from mints.parsers.fast import FastParser
+from mints.parsers.standard import StandardParser
 from mints.args.flag import Flag
 from mints.args.arg import Arg
 
 from tests.execution import execute, redirect_stderr
 
 
-@pytest.fixture(autouse=True)
-def reset():
+@pytest.fixture(autouse=True, params=[StandardParser, FastParser])
+def reset(request):
     # Reset `cli` before each test
-    # as if we have just imported it.
+    # as if we have just imported it,
+    # and run the test with each parser.
     globals()['cli'] = CLI()
+    globals()['cli'].parser = request.param(globals()['cli'])
 
 
 def test_one_flag():
@@ -72,17 +75,11 @@ def test_one_flag_with_default_true():
 
 
 def test_one_flag_with_default_int():
-    # Arrange.
-    @cli
-    def main(x: Flag = 5):
-        return x
-
-    # Act.
-    ex = execute(cli, '--x')
-
-    # Assert.
-    assert isinstance(ex, ValueError)
-    assert 'Expected a `bool`' in str(ex)
+    # Act & Assert.
+    with pytest.raises(ValueError, match='Expected a `bool`'):
+        @cli
+        def main(x: Flag = 5):
+            return x
 
 
 def test_one_flag_not_specified():
@@ -282,73 +279,51 @@ def test_two_flags_with_same_implicit_shorts():
 
 
 def test_two_flags_with_same_explicit_shorts():
-    # Arrange.
-    @cli
-    def main(x: Flag(short='a'), y: Flag(short='a')):
-        return x, y
+    # Act & Assert.
+    with pytest.raises(ValueError, match="conflicting option string '-a'"):
+        @cli
+        def main(x: Flag(short='a'), y: Flag(short='a')):
+            return x, y
 
-    # Act.
-    ex = execute(cli, '--x --y')
 
-    # Assert.
-    assert isinstance(ex, ArgumentError)
-    assert 'conflicting option string: -a' in str(ex)
+def test_flag_with_help_short():
+    # Act & Assert.
+    with pytest.raises(ValueError, match="conflicting option string '-h'"):
+        @cli
+        def main(x: Flag(short='h')):
+            return x
 
 
 def test_flag_with_empty_short():
-    # Arrange.
-    @cli
-    def main(x: Flag(short='')):
-        return x
-
-    # Act.
-    ex = execute(cli, '--x')
-
-    # Assert.
-    assert isinstance(ex, ValueError)
-    assert "'x' has an invalid short name '': it is an empty" in str(ex)
+    # Act & Assert.
+    with pytest.raises(ValueError, match="'x' has an invalid short name '': it is an empty"):
+        @cli
+        def main(x: Flag(short='')):
+            return x
 
 
 def test_flag_with_too_long_short():
-    # Arrange.
-    @cli
-    def main(x: Flag(short='ab')):
-        return x
-
-    # Act.
-    ex = execute(cli, '--x')
-
-    # Assert.
-    assert isinstance(ex, ValueError)
-    assert "'x' has an invalid short name 'ab': it consists of more than one" in str(ex)
+    # Act & Assert.
+    with pytest.raises(ValueError, match="'x' has an invalid short name 'ab': it consists of more than one"):
+        @cli
+        def main(x: Flag(short='ab')):
+            return x
 
 
 def test_flag_with_digit_short():
-    # Arrange.
-    @cli
-    def main(x: Flag(short='1')):
-        return x
-
-    # Act.
-    ex = execute(cli, '--x')
-
-    # Assert.
-    assert isinstance(ex, ValueError)
-    assert "'x' has an invalid short name '1': it is not an alphabet" in str(ex)
+    # Act & Assert.
+    with pytest.raises(ValueError, match="'x' has an invalid short name '1': it is not an alphabet"):
+        @cli
+        def main(x: Flag(short='1')):
+            return x
 
 
 def test_flag_with_sign_short():
-    # Arrange.
-    @cli
-    def main(x: Flag(short='-')):
-        return x
-
-    # Act.
-    ex = execute(cli, '--x')
-
-    # Assert.
-    assert isinstance(ex, ValueError)
-    assert "'x' has an invalid short name '-': it is not an alphabet" in str(ex)
+    # Act & Assert.
+    with pytest.raises(ValueError, match="'x' has an invalid short name '-': it is not an alphabet"):
+        @cli
+        def main(x: Flag(short='-')):
+            return x
 
 
 def test_flag_specified_twice():
@@ -417,45 +392,27 @@ def test_flag_with_letter_prefix():
 
 
 def test_flag_with_empty_prefix():
-    # Arrange.
-    @cli
-    def main(x: Flag(prefix='')):
-        return x
-
-    # Act.
-    ex = execute(cli, 'x')
-
-    # Assert.
-    assert isinstance(ex, ValueError)
-    assert "'x' has an invalid prefix '': it is an empty" in str(ex)
+    # Act & Assert.
+    with pytest.raises(ValueError, match="'x' has an invalid prefix '': it is an empty"):
+        @cli
+        def main(x: Flag(prefix='')):
+            return x
 
 
 def test_flag_with_none_prefix():
-    # Arrange.
-    @cli
-    def main(x: Flag(prefix=None)):
-        return x
-
-    # Act.
-    ex = execute(cli, 'x')
-
-    # Assert.
-    assert isinstance(ex, ValueError)
-    assert "'x' has an invalid prefix 'None': it is None" in str(ex)
+    # Act & Assert.
+    with pytest.raises(ValueError, match="'x' has an invalid prefix 'None': it is None"):
+        @cli
+        def main(x: Flag(prefix=None)):
+            return x
 
 
 def test_flag_with_long_prefix():
-    # Arrange.
-    @cli
-    def main(x: Flag(prefix='--')):
-        return x
-
-    # Act.
-    ex = execute(cli, '----x')
-
-    # Assert.
-    assert isinstance(ex, ValueError)
-    assert "'x' has an invalid prefix '--': it consists of more than one" in str(ex)
+    # Act & Assert.
+    with pytest.raises(ValueError, match="'x' has an invalid prefix '--': it consists of more than one"):
+        @cli
+        def main(x: Flag(prefix='--')):
+            return x
 
 
 def test_flag_specified_with_wrong_prefix():
@@ -473,17 +430,11 @@ def test_flag_specified_with_wrong_prefix():
 
 
 def test_flag_with_non_string_prefix():
-    # Arrange.
-    @cli
-    def main(x: Flag(prefix=[1])):
-        return x
-
-    # Act.
-    ex = execute(cli, '--x')
-
-    # Assert.
-    assert isinstance(ex, TypeError)
-    assert "unhashable type: 'list'" in str(ex)
+    # Act & Assert.
+    with pytest.raises(TypeError, match="unhashable type: 'list'"):
+        @cli
+        def main(x: Flag(prefix=[1])):
+            return x
 
 
 def test_two_flags_and_one_with_prefix():
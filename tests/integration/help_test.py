@@ -5,16 +5,20 @@ import pytest
 from mints.args.arg import Arg
 from mints.args.flag import Flag
 from mints.cli import cli, CLI
+from mints.parsers.fast import FastParser
+from mints.parsers.standard import StandardParser
 from mints.command import Command
 
 from tests.execution import execute, redirect_stdout
 
 
-@pytest.fixture(autouse=True)
-def reset():
+@pytest.fixture(autouse=True, params=[StandardParser, FastParser])
+def reset(request):
     # Reset `cli` before each test
-    # as if we have just imported it.
+    # as if we have just imported it,
+    # and run the test with each parser.
     globals()['cli'] = CLI()
+    globals()['cli'].parser = request.param(globals()['cli'])
 
 
 def test_default_help_without_description():
@@ -0,0 +1,121 @@
+"""Tests for the import cost of `mints`.
+
+Each test runs a fresh interpreter, since the modules imported by the
+tests themselves are already loaded.
+"""
+
+from typing import Dict
+import os
+import subprocess
+import sys
+import textwrap
+
+
+# A budget for the time `import mints` adds to the time of importing
+# `typing` (which the annotations of `mints`, and of most CLIs, e.g.
+# `Arg[List[int]]`, need anyway), relative to the time of importing `typing`
+# alone (an absolute time depends on the machine and its load too much).
+# `mints` takes about 0.45 now, while it took about 2.1 when it imported
+# `argparse` and `inspect` eagerly.
+BUDGET = 0.75
+
+# Modules that must not be loaded by defining a CLI.
+HEAVY = ['argparse', 'inspect', 'mints.cache', 'mints.parsers.standard']
+
+SOURCE = '''
+from mints import cli, Arg, Opt, Flag
+
+
+@cli
+def main(x: Arg[int], y: Opt = 'y', z: Flag = False):
+    return x
+
+
+@main.command
+def one():
+    pass
+'''
+
+
+def run(code: str, *options: str) -> subprocess.CompletedProcess:
+    root = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+    env = dict(os.environ, PYTHONPATH=root)
+
+    return subprocess.run([sys.executable, *options, '-c', code],
+                          env=env, check=True, text=True,
+                          stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+
+
+def loaded(code: str):
+    """Returns the names of the heavy modules loaded by `code`."""
+
+    code = textwrap.dedent(code) + textwrap.dedent('''
+        import sys
+        print(' '.join(sorted(sys.modules)))
+    ''')
+
+    modules = run(code).stdout.split()
+
+    return [x for x in HEAVY if x in modules]
+
+
+def test_defining_cli_does_not_import_parsers():
+    # Act.
+    cx = loaded(SOURCE)
+
+    # Assert.
+    assert cx == []
+
+
+def test_running_cli_imports_standard_parser():
+    # Act.
+    cx = loaded(SOURCE + 'cli(["1"])')
+
+    # Assert.
+    assert 'argparse' in cx
+    assert 'inspect' not in cx
+
+
+def test_running_cli_with_fast_parser_does_not_import_argparse():
+    # Arrange.
+    code = SOURCE + textwrap.dedent('''
+        from mints.parsers import FastParser
+
+        cli.parser = FastParser(cli)
+        cli(['1', '--y', '2', '--z'])
+    ''')
+
+    # Act.
+    cx = loaded(code)
+
+    # Assert.
+    assert cx == []
+
+
+def test_relative_import_time_is_within_budget():
+    # Arrange.
+    def cumulative(code: str) -> Dict[str, int]:
+        times = {}
+        output = run(code, '-X', 'importtime').stderr
+
+        for line in output.splitlines():
+            _, _, columns = line.partition('import time:')
+            _, total, name = columns.split('|')
+
+            if total.strip().isdigit():
+                times[name.strip()] = int(total)
+
+        return times
+
+    def ratio():
+        mints = cumulative('import mints')
+        typing = cumulative('import typing')['typing']
+
+        return (mints['mints'] - mints.get('typing', 0)) / typing
+
+    # Act.
+    # The best of several runs is taken to exclude random delays.
+    cx = min(ratio() for _ in range(5))
+
+    # Assert.
+    assert cx < BUDGET
@@ -0,0 +1,98 @@
+"""Tests for `CLI.invocations` and `CLI.execute`."""
+
+import pytest
+
+from mints.args.arg import Arg
+from mints.args.opt import Opt
+from mints.cli import cli, CLI
+from mints.parsers.fast import FastParser
+from mints.parsers.parser import Invocation
+from mints.parsers.standard import StandardParser
+
+from tests.execution import execute
+
+
+@pytest.fixture(autouse=True, params=[StandardParser, FastParser])
+def reset(request):
+    # Reset `cli` before each test
+    # as if we have just imported it,
+    # and run the test with each parser.
+    globals()['cli'] = CLI()
+    globals()['cli'].parser = request.param(globals()['cli'])
+
+
+def new_tool(calls: list):
+    @cli
+    def tool():
+        calls.append('tool')
+
+    @tool.command
+    def deploy(service: Arg, replicas: Opt[int] = 1):
+        calls.append('deploy')
+        return service, replicas
+
+    return tool, deploy
+
+
+def test_invocations_are_not_executed():
+    # Arrange.
+    calls = []
+    tool, deploy = new_tool(calls)
+
+    # Act.
+    invocations = cli.invocations(['deploy', 'api', '--replicas', '3'])
+
+    # Assert.
+    assert calls == []
+    assert [x.command for x in invocations] == [tool, deploy]
+    assert [(x.args, x.next) for x in invocations] == \
+        [({}, 'deploy'), ({'service': 'api', 'replicas': 3}, None)]
+
+
+def test_invocations_are_executed_later():
+    # Arrange.
+    calls = []
+    new_tool(calls)
+
+    # Act.
+    invocations = cli.invocations(['deploy', 'api'])
+    cx_a = cli.execute(invocations)
+    cx_b = cli.execute(invocations)
+
+    # Assert.
+    assert cx_a == cx_b == ('api', 1)
+    assert calls == ['tool', 'deploy'] * 2
+
+
+def test_invalid_line_is_not_executed():
+    # Arrange.
+    calls = []
+    new_tool(calls)
+
+    # Act.
+    ex = execute(cli.invocations, 'deploy api --replicas x')
+
+    # Assert.
+    assert isinstance(ex, SystemExit)
+    assert calls == []
+
+
+def test_manual_invocations_are_executed():
+    # Arrange.
+    calls = []
+    new_tool(calls)
+
+    # Act.
+    cx = cli.execute([Invocation({}, 'deploy'),
+                      Invocation({'service': 'web', 'replicas': 2})])
+
+    # Assert.
+    assert cx == ('web', 2)
+
+
+def test_main_command_is_required():
+    # Act.
+    ex = execute(cli.invocations, '')
+
+    # Assert.
+    assert isinstance(ex, ValueError)
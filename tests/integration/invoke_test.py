@@ -0,0 +1,165 @@
+"""Tests for `CLI.invoke` and `Command.invoke`."""
+
+from typing import List
+
+import pytest
+
+from mints.args.arg import Arg
+from mints.args.flag import Flag
+from mints.args.opt import Opt
+from mints.cli import cli, CLI
+
+
+class Money:
+    def __init__(self, value: float):
+        self.value = value
+
+
+@pytest.fixture(autouse=True)
+def reset():
+    # Reset `cli` before each test
+    # as if we have just imported it.
+    globals()['cli'] = CLI()
+
+
+def test_main_command_is_invoked():
+    # Arrange.
+    @cli
+    def main(a: Arg[int], b: Opt = 'b', c: Flag = False):
+        return a, b, c
+
+    # Act.
+    result = cli.invoke(a=1, c=True)
+
+    # Assert.
+    assert result == (1, 'b', True)
+
+
+def test_subcommand_is_invoked_with_parents_defaults():
+    # Arrange.
+    calls = []
+
+    @cli
+    def main(verbose: Flag = False):
+        calls.append(('main', verbose))
+
+    @main.command
+    def deploy(region: Opt = 'eu'):
+        calls.append(('deploy', region))
+
+    @deploy.command
+    def update(replicas: Opt[int] = 1):
+        calls.append(('update', replicas))
+
+        return replicas
+
+    # Act.
+    result = cli.invoke('deploy', 'update', replicas=3)
+
+    # Assert.
+    assert result == 3
+    assert calls == [('main', False), ('deploy', 'eu'), ('update', 3)]
+
+
+def test_typed_values_are_not_converted():
+    # Arrange.
+    money = Money(5.0)
+    parsed = []
+
+    @cli
+    def main(x: Arg[Money], xs: Opt[List[Money]] = None):
+        return x, xs
+
+    @cli.parse
+    def parse_money(x: str) -> Money:
+        parsed.append(x)
+
+        return Money(float(x[1:]))
+
+    # Act.
+    x, xs = cli.invoke(x=money, xs=[money, '$3'])
+
+    # Assert.
+    assert x is money
+    assert xs[0] is money
+    assert xs[1].value == 3.0
+    assert parsed == ['$3']
+
+
+def test_strings_and_string_defaults_are_converted():
+    # Arrange.
+    @cli
+    def main(a: Arg[int], b: Opt[float] = '2.5', c: Opt[List[int]] = None):
+        return a, b, c
+
+    # Act.
+    result = cli.invoke(a='1', c=('2', 3))
+
+    # Assert.
+    assert result == (1, 2.5, [2, 3])
+
+
+def test_command_is_invoked_directly():
+    # Arrange.
+    @cli
+    def main():
+        pass
+
+    @main.command
+    def deploy(service: Arg, replicas: Opt[int] = 1):
+        return service, replicas
+
+    # Act.
+    result = deploy.invoke(service='api', replicas='2')
+
+    # Assert.
+    assert result == ('api', 2)
+
+
+@pytest.mark.parametrize('kwargs, message', [
+    ({}, "the argument 'a' is missing"),
+    ({'a': 1, 'd': 2}, "unexpected arguments 'd'"),
+    ({'a': 1.5}, "expected int for 'a'"),
+    ({'a': 1, 'b': 2}, "expected a string for 'b'"),
+    ({'a': 1, 'c': 'yes'}, "expected a `bool` value for the flag 'c'"),
+    ({'a': 1, 'xs': 1}, "expected a list for 'xs'"),
+    ({'a': 1, 'xs': '1'}, "expected a list for 'xs'"),
+])
+def test_invalid_values_are_reported(kwargs, message):
+    # Arrange.
+    @cli
+    def main(a: Arg[int],
+             b: Opt = None,
+             c: Flag = False,
+             xs: Opt[List[int]] = None):
+        pass
+
+    # Act.
+    with pytest.raises(ValueError) as ex:
+        cli.invoke(**kwargs)
+
+    # Assert.
+    assert message in str(ex.value)
+
+
+def test_unknown_subcommand_is_reported():
+    # Arrange.
+    @cli
+    def main():
+        pass
+
+    # Act.
+    with pytest.raises(ValueError) as ex:
+        cli.invoke('deploy')
+
+    # Assert.
+    assert "does not have a subcommand 'deploy'" in str(ex.value)
+
+
+def test_missing_main_command_is_reported():
+    # Act.
+    with pytest.raises(ValueError) as ex:
+        cli.invoke()
+
+    # Assert.
+    assert 'the main command is not set' in str(ex.value)
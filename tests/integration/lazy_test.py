@@ -0,0 +1,289 @@
+"""Tests for commands defined by a `module:function` target."""
+
+import sys
+import textwrap
+
+import pytest
+
+from mints.args.arg import Arg
+from mints.cli import cli, CLI
+from mints.parsers.fast import FastParser
+from mints.parsers.standard import StandardParser
+
+from tests.execution import execute, redirect_stdout
+
+
+MODULES = {
+    'fetch': '''
+        from mints import Arg, Flag
+
+
+        def fetch(remote: Arg, all: Flag = False):
+            """Fetches a remote."""
+            return remote, all
+    ''',
+    'merge': '''
+        from mints import Arg
+
+
+        def merge(branch: Arg):
+            """Merges a branch."""
+            return branch
+    ''',
+    'lfs': '''
+        from mints import CLI, Arg
+
+
+        cli = CLI()
+
+
+        @cli
+        def lfs():
+            """Git extension for large files."""
+
+
+        @lfs.help
+        def help(command):
+            return f'Help for {command.name} is yet to be done.'
+
+
+        @lfs.command
+        def track(pattern: Arg):
+            """Tracks files matching a pattern."""
+            return pattern
+    ''',
+    'broken': '''
+        from mints import Arg
+
+
+        def broken(x):
+            return x
+    ''',
+}
+
+
+@pytest.fixture(autouse=True, params=[StandardParser, FastParser])
+def reset(request, tmp_path):
+    # Reset `cli` before each test
+    # as if we have just imported it,
+    # and run the test with each parser.
+    globals()['cli'] = CLI()
+    globals()['cli'].parser = request.param(globals()['cli'])
+
+    # Write the modules with commands into a fresh package.
+    package = tmp_path / 'lazy_commands'
+    package.mkdir()
+    (package / '__init__.py').write_text('')
+
+    for name, source in MODULES.items():
+        (package / f'{name}.py').write_text(textwrap.dedent(source))
+
+    sys.path.insert(0, str(tmp_path))
+    yield
+    sys.path.remove(str(tmp_path))
+
+    for name in [x for x in sys.modules if x.startswith('lazy_commands')]:
+        del sys.modules[name]
+
+
+def imported():
+    return {x.partition('.')[2] for x in sys.modules
+            if x.startswith('lazy_commands.')}
+
+
+def test_only_selected_command_is_imported():
+    # Arrange.
+    @cli
+    def git():
+        pass
+
+    git.command('lazy_commands.fetch:fetch')
+    git.command('lazy_commands.merge:merge')
+
+    # Act.
+    cx = execute(cli, 'fetch origin --all')
+
+    # Assert.
+    assert cx == ('origin', True)
+    assert imported() == {'fetch'}
+
+
+def test_no_command_is_imported_for_help():
+    # Arrange.
+    @cli
+    def git():
+        pass
+
+    git.command('lazy_commands.fetch:fetch')
+    git.command('lazy_commands.merge:merge')
+
+    # Act.
+    _, out = execute(cli, '--help', redirect_stdout)
+
+    # Assert.
+    assert 'fetch' in out
+    assert 'merge' in out
+    assert imported() == set()
+
+
+def test_selected_command_is_imported_for_help():
+    # Arrange.
+    @cli
+    def git():
+        pass
+
+    git.command('lazy_commands.fetch:fetch')
+    git.command('lazy_commands.merge:merge')
+
+    # Act.
+    _, out = execute(cli, 'merge --help', redirect_stdout)
+
+    # Assert.
+    assert 'Merges a branch.' in out
+    assert imported() == {'merge'}
+
+
+def test_command_name_and_description():
+    # Arrange.
+    @cli
+    def git():
+        pass
+
+    # Act.
+    fetch = git.command('lazy_commands.fetch:fetch', name='get')
+    merge = git.command('lazy_commands.merge:merge', description='Merge.')
+
+    # Assert.
+    assert fetch.name == 'get'
+    assert merge.name == 'merge'
+    assert merge.description == 'Merge.'
+    assert imported() == set()
+    assert fetch.description == 'Fetches a remote.'
+    assert imported() == {'fetch'}
+
+
+def test_command_with_invalid_target():
+    # Arrange.
+    @cli
+    def git():
+        pass
+
+    # Act & Assert.
+    with pytest.raises(ValueError, match='module:function'):
+        git.command('lazy_commands.fetch')
+
+
+def test_command_with_nonexistent_function():
+    # Arrange.
+    @cli
+    def git():
+        pass
+
+    git.command('lazy_commands.fetch:pull')
+
+    # Act.
+    cx = execute(cli, 'pull')
+
+    # Assert.
+    assert isinstance(cx, ValueError)
+    assert "'pull' is not found" in str(cx)
+
+
+def test_command_with_invalid_parameter_fails_when_imported():
+    # Arrange.
+    @cli
+    def git():
+        pass
+
+    git.command('lazy_commands.broken:broken')
+    git.command('lazy_commands.merge:merge')
+
+    # Act.
+    cx_a = execute(cli, 'merge develop')
+    cx_b = execute(cli, 'broken 1')
+
+    # Assert.
+    assert cx_a == 'develop'
+    assert isinstance(cx_b, ValueError)
+
+
+def test_subcommands_of_imported_command_are_adopted():
+    # Arrange.
+    @cli
+    def git():
+        pass
+
+    git.command('lazy_commands.lfs:lfs')
+
+    # Act.
+    cx = execute(cli, 'lfs track *.psd')
+
+    # Assert.
+    assert cx == '*.psd'
+    assert imported() == {'lfs'}
+
+
+def test_help_of_imported_command_is_adopted():
+    # Arrange.
+    @cli
+    def git():
+        pass
+
+    git.command('lazy_commands.lfs:lfs')
+
+    # Act.
+    _, out = execute(cli, 'lfs --help', redirect_stdout)
+
+    # Assert.
+    assert out.strip() == 'Help for lfs is yet to be done.'
+
+
+def test_description_of_imported_command_is_adopted():
+    # Arrange.
+    @cli
+    def git():
+        pass
+
+    lfs = git.command('lazy_commands.lfs:lfs')
+
+    # Act.
+    description = lfs.description
+
+    # Assert.
+    assert description == 'Git extension for large files.'
+    assert list(lfs.subcommands) == ['track']
+    assert lfs.subcommands['track'].parent is lfs
+
+
+def test_subcommand_of_imported_command_is_invoked():
+    # Arrange.
+    @cli
+    def git():
+        pass
+
+    git.command('lazy_commands.lfs:lfs')
+
+    # Act.
+    cx = cli.invoke('lfs', 'track', pattern='*.psd')
+
+    # Assert.
+    assert cx == '*.psd'
+
+
+def test_defined_subcommand_is_not_replaced():
+    # Arrange.
+    @cli
+    def git():
+        pass
+
+    lfs = git.command('lazy_commands.lfs:lfs')
+
+    @lfs.command
+    def track(pattern: Arg):
+        return f'defined {pattern}'
+
+    # Act.
+    cx = execute(cli, 'lfs track *.psd')
+
+    # Assert.
+    assert cx == 'defined *.psd'
@@ -0,0 +1,127 @@
+"""Various tests for `mints.parsers.MemoParser`."""
+
+from typing import List
+
+import pytest
+
+from mints.args.arg import Arg
+from mints.args.flag import Flag
+from mints.args.opt import Opt
+from mints.cli import CLI
+from mints.parsers.fast import FastParser
+from mints.parsers.memo import MemoParser, pure
+from mints.parsers.standard import StandardParser
+
+from tests.execution import execute
+
+
+class Money:
+    def __init__(self, value: str):
+        self.value = value
+
+
+class Point:
+    def __init__(self, value: str):
+        self.value = value
+
+
+pure(Point)
+
+
+@pytest.fixture(params=[StandardParser, FastParser])
+def cli(request):
+    cli = CLI()
+    cli.parser = MemoParser(cli, request.param(cli), size=2)
+
+    @cli
+    def main(verbose: Flag = False):
+        pass
+
+    @main.command
+    def check(service: Arg, counts: Arg[List[int]], timeout: Opt[int] = 5):
+        return service, counts, timeout
+
+    @main.command
+    def pay(amount: Arg[Money]):
+        return amount
+
+    @main.command
+    def move(to: Arg[Point]):
+        return to
+
+    return cli
+
+
+def test_repeated_line_is_remembered(cli):
+    # Act.
+    cx_a = execute(cli, 'check api 1 2 --timeout 3')
+    cx_b = execute(cli, 'check api 1 2 --timeout 3')
+    cx_c = execute(cli, 'check api 1 2')
+
+    # Assert.
+    assert cx_a == cx_b == ('api', [1, 2], 3)
+    assert cx_c == ('api', [1, 2], 5)
+    assert (cli.parser.hits, cli.parser.misses) == (1, 2)
+    assert cli.parser.hit_rate == 1 / 3
+
+
+def test_remembered_lists_are_copied(cli):
+    # Act.
+    cx_a = execute(cli, 'check api 1 2')
+    cx_a[1].append(3)
+    cx_b = execute(cli, 'check api 1 2')
+
+    # Assert.
+    assert cx_b == ('api', [1, 2], 5)
+    assert cli.parser.hits == 1
+
+
+def test_least_recently_used_line_is_forgotten(cli):
+    # Act.
+    execute(cli, 'check a')
+    execute(cli, 'check b')
+    execute(cli, 'check a')
+    execute(cli, 'check c')
+    execute(cli, 'check a')
+    execute(cli, 'check b')
+
+    # Assert.
+    assert (cli.parser.hits, cli.parser.misses) == (2, 4)
+
+
+def test_values_of_impure_converters_are_not_remembered(cli):
+    # Act.
+    cx_a = execute(cli, 'pay 5')
+    cx_b = execute(cli, 'pay 5')
+    cx_c = execute(cli, 'move 1')
+    cx_d = execute(cli, 'move 1')
+
+    # Assert.
+    assert cx_a is not cx_b
+    assert cx_c is cx_d
+    assert (cli.parser.hits, cli.parser.misses) == (1, 3)
+
+
+def test_memo_is_cleared_when_cli_changes(cli):
+    # Act.
+    execute(cli, 'check api')
+
+    @cli.main.command
+    def other():
+        pass
+
+    execute(cli, 'check api')
+
+    # Assert.
+    assert (cli.parser.hits, cli.parser.misses) == (0, 2)
+
+
+def test_failed_line_is_not_remembered(cli):
+    # Act.
+    ex_a = execute(cli, 'check api x')
+    ex_b = execute(cli, 'check api x')
+
+    # Assert.
+    assert isinstance(ex_a, SystemExit)
+    assert isinstance(ex_b, SystemExit)
+    assert (cli.parser.hits, cli.parser.misses) == (0, 2)
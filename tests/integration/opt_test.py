@@ -4,9 +4,13 @@ Consider looking at `tests.integration.flag_test` for more details about some
 specific behaviour that is shared between flags and options.
 """
 
+import functools
+
 import pytest
 
 from mints.cli import cli, CLI
+from mints.parsers.fast import FastParser
+from mints.parsers.standard import StandardParser
 from mints.args.arg import Arg
 from mints.args.opt import Opt
 from mints.args.flag import Flag
@@ -14,11 +18,13 @@ from mints.args.flag import Flag
 from tests.execution import execute, redirect_stderr
 
 
-@pytest.fixture(autouse=True)
-def reset():
+@pytest.fixture(autouse=True, params=[StandardParser, FastParser])
+def reset(request):
     # Reset `cli` before each test
-    # as if we have just imported it.
+    # as if we have just imported it,
+    # and run the test with each parser.
     globals()['cli'] = CLI()
+    globals()['cli'].parser = request.param(globals()['cli'])
 
 
 def test_one_opt():
@@ -73,6 +79,27 @@ def test_one_opt_with_default_value_but_not_specified_in_cli():
     assert cx == '2'
 
 
+def test_string_default_value_of_decorated_function():
+    # Arrange.
+    def decorated(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return func(*args, **kwargs)
+
+        return wrapper
+
+    @cli
+    @decorated
+    def main(x: Opt = 'eu'):
+        return x
+
+    # Act.
+    cx = execute(cli, '')
+
+    # Assert.
+    assert cx == 'eu'
+
+
 def test_one_opt_not_specified_in_cli():
     # Arrange.
     @cli
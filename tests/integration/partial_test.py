@@ -0,0 +1,176 @@
+"""Tests for `Parser.parse_partial`."""
+
+from typing import List
+
+import pytest
+
+from mints.args.arg import Arg
+from mints.args.flag import Flag
+from mints.args.opt import Opt
+from mints.cli import cli, CLI
+from mints.parsers.fast import FastParser
+from mints.parsers.parser import Parser
+from mints.parsers.standard import StandardParser
+
+from tests.execution import execute, redirect_stderr
+
+
+@pytest.fixture(autouse=True, params=[StandardParser, FastParser])
+def reset(request):
+    # Reset `cli` before each test
+    # as if we have just imported it,
+    # and run the test with each parser.
+    globals()['cli'] = CLI()
+    globals()['cli'].parser = request.param(globals()['cli'])
+
+    # Define a typical CLI to complete.
+    @cli
+    def tool(verbose: Flag(short='v') = False):
+        pass
+
+    @tool.command
+    def deploy(service: Arg,
+               hosts: Arg[List[str]],
+               region: Opt = 'eu',
+               tags: Opt[List[str]] = None,
+               replicas: Opt[int](short='r') = 1):
+        pass
+
+    @deploy.command
+    def update(force: Flag(prefix='+') = False):
+        pass
+
+    @tool.command
+    def delete(service: Arg):
+        pass
+
+
+def partial(line: str):
+    state = cli.parser.parse_partial(line.split())
+
+    return state.path, state.values, \
+        getattr(state.pending, 'name', None), state.errors
+
+
+def test_empty_line():
+    # Act.
+    state = cli.parser.parse_partial([])
+
+    # Assert.
+    assert state.command is cli.main
+    assert (state.path, state.values, state.pending, state.errors) == \
+        ((), [{}], None, [])
+
+
+def test_option_without_value_is_pending():
+    # Act.
+    state = partial('deploy --reg')
+
+    # Assert.
+    assert state == (('deploy',), [{}, {}], 'region', [])
+
+
+def test_consumed_values():
+    # Act.
+    state = partial('-v deploy api --tags a b -r 3 h1 h2')
+
+    # Assert.
+    assert state == (('deploy',),
+                     [{'verbose': True},
+                      {'service': 'api', 'tags': ['a', 'b'], 'replicas': '3',
+                       'hosts': ['h1', 'h2']}],
+                     'hosts',
+                     [])
+
+
+def test_next_positional_is_pending():
+    # Act.
+    state_a = partial('deploy')
+    state_b = partial('deploy api --region=us')
+    state_c = partial('deploy api h1 h2')
+
+    # Assert.
+    assert state_a[2] == 'service'
+    assert state_b[1][1] == {'service': 'api', 'region': 'us'}
+    assert state_b[2] == 'hosts'
+    assert state_c[1][1] == {'service': 'api', 'hosts': ['h1', 'h2']}
+    assert state_c[2] == 'hosts'
+
+
+def test_subcommand_after_list_argument():
+    # Act.
+    state = partial('dep api h1 update ++force')
+
+    # Assert.
+    assert state == (('deploy', 'update'),
+                     [{}, {'service': 'api', 'hosts': ['h1']},
+                      {'force': True}],
+                     None,
+                     [])
+
+
+def test_errors_are_collected():
+    # Act.
+    state = partial('de --x delete api extra --help')
+
+    # Assert.
+    assert state == (('delete',),
+                     [{}, {'service': 'api'}],
+                     None,
+                     ["ambiguous choice: 'de' could match "
+                      "'deploy', 'delete'",
+                      'unrecognized argument: --x',
+                      'unrecognized argument: extra'])
+
+
+def test_empty_name_is_refused():
+    # Act.
+    state = cli.parser.parse_partial([''])
+
+    # Assert.
+    assert state.errors == ["invalid choice: ''"]
+
+
+def test_nothing_is_printed():
+    # Act.
+    _, err = execute(lambda args: cli.parser.parse_partial(args),
+                     'x --re --help', redirect_stderr)
+
+    # Assert.
+    assert err == ''
+
+
+def test_options_end_after_double_dash():
+    # Act.
+    state = partial('deploy --region -- --api -v update --force')
+
+    # Assert.
+    assert state == (('deploy', 'update'),
+                     [{}, {'service': '--api', 'hosts': ['-v']}, {}],
+                     None,
+                     ['unrecognized argument: --force'])
+
+
+def test_custom_parser():
+    # Arrange.
+    class Custom(Parser):
+        def parse(self, args):
+            return []
+
+    # Act.
+    state = Custom(cli).parse_partial(['delete', 'api'])
+
+    # Assert.
+    assert (state.path, state.values, state.errors) == \
+        (('delete',), [{}, {'service': 'api'}], [])
+
+
+def test_parser_without_cli():
+    # Arrange.
+    class Custom(Parser):
+        def parse(self, args):
+            return []
+
+    # Act & Assert.
+    with pytest.raises(ValueError, match='main command is not set'):
+        Custom().parse_partial(['delete'])
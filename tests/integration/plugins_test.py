@@ -0,0 +1,181 @@
+"""Tests for subcommands defined by plugins (see `Command.plugins`)."""
+
+import importlib
+import os
+import sys
+import textwrap
+
+import pytest
+
+from mints.cache import Cache
+from mints.cli import CLI
+
+from tests.execution import execute, redirect_stdout
+
+
+MODULES = {
+    'lfs': '''
+        from mints import Arg
+
+
+        def lfs(path: Arg):
+            """Tracks large files."""
+            print(f'tracking {path}')
+    ''',
+    'flow': '''
+        from mints import Arg
+
+
+        def flow(branch: Arg):
+            print(f'starting {branch}')
+    ''',
+}
+
+
+@pytest.fixture
+def site(tmp_path):
+    """Creates a directory with installed distributions and adds it
+    to `sys.path`."""
+
+    site = tmp_path / 'site'
+    site.mkdir()
+
+    for name, source in MODULES.items():
+        (site / f'plugin_{name}.py').write_text(textwrap.dedent(source))
+
+    install(site, 'git-lfs', '1.2', {'lfs': 'plugin_lfs:lfs'})
+
+    sys.path.insert(0, str(site))
+    importlib.invalidate_caches()
+
+    yield site
+
+    sys.path.remove(str(site))
+    importlib.invalidate_caches()
+
+    for name in [x for x in sys.modules if x.startswith('plugin_')]:
+        del sys.modules[name]
+
+
+def install(site, name: str, version: str, plugins: dict):
+    """Writes metadata of a distribution with `git.commands` plugins."""
+
+    info = site / f'{name.replace("-", "_")}-{version}.dist-info'
+    info.mkdir()
+
+    (info / 'METADATA').write_text(f'Metadata-Version: 2.1\n'
+                                   f'Name: {name}\n'
+                                   f'Version: {version}\n')
+    (info / 'entry_points.txt').write_text(
+        '[git.commands]\n' +
+        ''.join(f'{k} = {v}\n' for k, v in plugins.items()))
+
+    # Make sure the change is visible even if the timer is coarse.
+    stat = os.stat(site)
+    os.utime(site, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    importlib.invalidate_caches()
+
+
+def new_cli(cache: Cache) -> CLI:
+    cli = CLI(cache=cache)
+
+    @cli
+    def git():
+        pass
+
+    git.plugins('git.commands')
+
+    return cli
+
+
+def test_plugin_is_imported_only_when_invoked(site, tmp_path):
+    # Arrange.
+    cli = new_cli(Cache(str(tmp_path / 'cache')))
+
+    # Act.
+    imported = 'plugin_lfs' in sys.modules
+    _, out = execute(cli, 'lfs data.bin', redirect_stdout)
+
+    # Assert.
+    assert not imported
+    assert out == 'tracking data.bin\n'
+
+
+def test_plugins_are_indexed(site, tmp_path):
+    # Arrange.
+    cache = Cache(str(tmp_path / 'cache'))
+
+    # Act.
+    plugins_a = cache.plugins('git.commands')
+    plugins_b = Cache(cache.path).plugins('git.commands')
+    plugins_c = cache.plugins('hg.commands')
+
+    # Assert.
+    assert plugins_a == plugins_b == [('lfs', '1.2', 'plugin_lfs:lfs')]
+    assert plugins_c == []
+
+
+def test_index_is_loaded_from_cache(site, tmp_path):
+    # Arrange.
+    path = str(tmp_path / 'cache')
+    new_cli(Cache(path))
+
+    # Act.
+    cache = Cache(path)
+    plugins = cache.plugins('git.commands')
+
+    # Assert.
+    assert (cache.hits, cache.misses) == (1, 0)
+    assert plugins == [('lfs', '1.2', 'plugin_lfs:lfs')]
+
+
+def test_index_is_rebuilt_after_install(site, tmp_path):
+    # Arrange.
+    path = str(tmp_path / 'cache')
+    new_cli(Cache(path))
+
+    # Act.
+    install(site, 'git-flow', '0.4', {'flow': 'plugin_flow:flow'})
+
+    cache = Cache(path)
+    plugins = cache.plugins('git.commands')
+    cli = new_cli(Cache(path))
+    _, out = execute(cli, 'flow feature', redirect_stdout)
+
+    # Assert.
+    assert (cache.hits, cache.misses) == (0, 1)
+    assert len(plugins) == 2
+    assert list(cli.main.subcommands) == ['flow', 'lfs']
+    assert out == 'starting feature\n'
+    assert 'plugin_lfs' not in sys.modules
+
+
+def test_plugin_help_does_not_import_it(site, tmp_path, capsys):
+    # Arrange.
+    cli = new_cli(Cache(str(tmp_path / 'cache')))
+
+    # Act.
+    ex = execute(cli, '--help')
+    out = capsys.readouterr().out
+
+    # Assert.
+    assert isinstance(ex, SystemExit)
+    assert 'lfs' in out
+    assert 'plugin_lfs' not in sys.modules
+
+
+def test_plugin_with_existing_name_is_refused(site, tmp_path):
+    # Arrange.
+    cli = CLI(cache=Cache(str(tmp_path / 'cache')))
+
+    @cli
+    def git():
+        pass
+
+    @git.command
+    def lfs():
+        pass
+
+    # Act & Assert.
+    with pytest.raises(ValueError, match='already been defined'):
+        git.plugins('git.commands')
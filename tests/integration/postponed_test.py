@@ -0,0 +1,135 @@
+"""Tests for commands with string annotations (see PEP 563)."""
+
+import importlib
+import sys
+import textwrap
+
+import pytest
+
+from mints.cache import Cache
+from mints.parsers.fast import FastParser
+from mints.parsers.standard import StandardParser
+
+from tests.execution import execute
+
+
+SOURCE = '''
+from __future__ import annotations
+
+from typing import List, TYPE_CHECKING
+
+from mints import CLI, Arg, Opt, Flag
+
+if TYPE_CHECKING:
+    from decimal import Decimal
+
+cli = CLI()
+
+
+@cli
+def main(a: Arg[int], b: Opt[List[float]]('Description of `b`.') = None):
+    pass
+
+
+@main.command
+def one(x: Arg[Money], y: Flag(short='y') = False):
+    return x.value, y
+
+
+@main.command
+def two(z: Opt[Unknown] = None):
+    return z
+
+
+@main.command
+def three(n: Arg[int], scale: Decimal = None) -> Decimal:
+    return n, scale
+
+
+class Money:
+    def __init__(self, value):
+        self.value = value
+
+
+@cli.parse
+def money(x: str) -> Money:
+    return Money(x[1:])
+'''
+
+
+@pytest.fixture(params=[StandardParser, FastParser])
+def module(request, tmp_path):
+    """Writes a module with postponed annotations and imports it."""
+
+    name = f'postponed_{abs(hash(str(tmp_path))):x}'
+    (tmp_path / f'{name}.py').write_text(textwrap.dedent(SOURCE))
+
+    sys.path.insert(0, str(tmp_path))
+    module = importlib.import_module(name)
+    module.cli.parser = request.param(module.cli)
+
+    yield module
+
+    sys.path.remove(str(tmp_path))
+    sys.modules.pop(name)
+
+
+def test_annotations_are_evaluated(module):
+    # Act.
+    invocation, = module.cli.parser.parse('1 --b 2 3'.split())
+    cx = execute(module.cli, '1 one $5 -y')
+
+    # Assert.
+    assert invocation.args == {'a': 1, 'b': [2.0, 3.0]}
+    assert cx == ('5', True)
+
+
+def test_annotations_are_evaluated_only_when_needed(module):
+    # Arrange.
+    main = module.cli.main
+    one = main.subcommands['one']
+    two = main.subcommands['two']
+
+    # Act.
+    deferred = main._spec, one._spec, two._spec
+    execute(module.cli, '1 one $5')
+    spec = one.spec
+    execute(module.cli, '1 one $5')
+
+    # Assert.
+    assert deferred == (None, None, None)
+    assert one.spec is spec
+    assert two._spec is None
+
+
+def test_invalid_annotation_is_reported_when_needed(module):
+    # Act.
+    ex = execute(module.cli, '1 two')
+
+    # Assert.
+    assert isinstance(ex, ValueError)
+    assert "'Unknown'" in str(ex)
+
+
+def test_annotation_imported_for_type_checking_is_skipped(module):
+    # Act.
+    cx = execute(module.cli, '1 three 2')
+
+    # Assert.
+    assert cx == (2, None)
+    assert [x.name for x in module.three.spec.params] == ['n']
+
+
+def test_postponed_command_is_recorded_in_cache(module, tmp_path):
+    # Arrange.
+    module.cli.cache = Cache(str(tmp_path / 'cache'))
+    module.cli.main.cache = module.cli.cache
+
+    # Act.
+    execute(module.cli, '1')
+    cache = Cache(module.cli.cache.path)
+
+    # Assert.
+    assert cache.checked(module.main.func)
+    assert not cache.checked(module.two.func)
+    assert (cache.hits, cache.misses) == (1, 0)
@@ -0,0 +1,244 @@
+"""Various tests for `mints.parsers.standard.StandardParser`."""
+
+import pytest
+
+from mints.args.arg import Arg
+from mints.args.flag import Flag
+from mints.args.opt import Opt
+from mints.cli import cli, CLI
+from mints.parsers.standard import StandardParser
+
+from tests.execution import execute, redirect_stdout, redirect_stderr
+
+
+class Money:
+    def __init__(self, value: str):
+        self.value = value
+
+
+@pytest.fixture(autouse=True)
+def reset():
+    # Reset `cli` before each test
+    # as if we have just imported it.
+    globals()['cli'] = CLI()
+
+
+def test_parser_is_reused():
+    # Arrange.
+    @cli
+    def main(x: Arg[int]):
+        return x
+
+    # Act.
+    cx_a = execute(cli, '1')
+    cx_b = execute(cli, '2')
+
+    # Assert.
+    assert (cx_a, cx_b) == (1, 2)
+    assert cli.parser.misses == 1
+    assert cli.parser.hits == 1
+
+
+def test_parser_is_rebuilt_after_subcommand_is_added():
+    # Arrange.
+    @cli
+    def main():
+        pass
+
+    @main.command
+    def one():
+        pass
+
+    # Act.
+    cx_a = execute(cli, 'one')
+
+    @one.command
+    def two():
+        return 2
+
+    cx_b = execute(cli, 'one two')
+
+    # Assert.
+    assert (cx_a, cx_b) == (None, 2)
+    assert cli.parser.misses == 2
+    assert cli.parser.hits == 0
+
+
+def test_parser_is_rebuilt_after_main_is_set():
+    # Arrange.
+    parser = StandardParser(cli)
+    cli.parser = parser
+
+    @cli
+    def main(x: Arg):
+        return x
+
+    # Act.
+    cx_a = execute(cli, '1')
+
+    cli.main = None
+
+    @cli
+    def other(y: Opt):
+        return y
+
+    cx_b = execute(cli, '--y 2')
+
+    # Assert.
+    assert (cx_a, cx_b) == ('1', '2')
+    assert parser.misses == 2
+
+
+def test_parser_is_rebuilt_after_custom_parser_is_added():
+    # Arrange.
+    @cli
+    def main(x: Arg[Money]):
+        return x
+
+    # Act.
+    cx_a = execute(cli, '1')
+
+    @cli.parse
+    def dollars(x: str) -> Money:
+        return Money('$' + x)
+
+    cx_b = execute(cli, '2')
+
+    # Assert.
+    assert cx_a.value == '1'
+    assert cx_b.value == '$2'
+    assert cli.parser.misses == 2
+
+
+def test_parser_is_rebuilt_after_clear():
+    # Arrange.
+    @cli
+    def main():
+        return True
+
+    # Act.
+    execute(cli, '')
+    cli.parser.clear()
+    execute(cli, '')
+
+    # Assert.
+    assert cli.parser.misses == 2
+    assert cli.parser.hits == 0
+
+
+def test_lazy_parser_configures_only_selected_subcommand():
+    # Arrange.
+    @cli
+    def main():
+        pass
+
+    @main.command
+    def one():
+        return 1
+
+    @main.command
+    def two():
+        return 2
+
+    # Break the subcommand, so configuring it fails.
+    two.spec = object()
+
+    # Act.
+    cx = execute(cli, 'one')
+    ex = execute(cli, 'two')
+
+    # Assert.
+    assert cx == 1
+    assert isinstance(ex, AttributeError)
+
+
+def test_subcommand_is_configured_again_after_failure():
+    # Arrange.
+    @cli
+    def main():
+        pass
+
+    @main.command
+    def one():
+        return 1
+
+    # The target cannot be imported, so configuring the subcommand fails.
+    main.command('tests.integration.missing:two')
+
+    # Act.
+    ex_a = execute(cli, 'two')
+    ex_b = execute(cli, 'two')
+    cx = execute(cli, 'one')
+
+    # Assert.
+    assert isinstance(ex_a, ModuleNotFoundError)
+    assert isinstance(ex_b, ModuleNotFoundError)
+    assert cx == 1
+
+
+def test_eager_parser_configures_all_subcommands():
+    # Arrange.
+    cli.parser = StandardParser(cli, lazy=False)
+
+    @cli
+    def main():
+        pass
+
+    @main.command
+    def one():
+        return 1
+
+    @main.command
+    def two():
+        return 2
+
+    # Break the subcommand, so configuring it fails.
+    two.spec = object()
+
+    # Act.
+    ex = execute(cli, 'one')
+
+    # Assert.
+    assert isinstance(ex, AttributeError)
+
+
+@pytest.mark.parametrize('line', ['--help',
+                                  'one --help',
+                                  'one a --help',
+                                  'three',
+                                  'one b',
+                                  'one a --y'])
+def test_lazy_parser_output_is_the_same_as_eager(line):
+    # Arrange.
+    def output(lazy):
+        cli = CLI()
+        cli.parser = StandardParser(cli, lazy=lazy)
+
+        @cli
+        def main(x: Flag('Description of `x`.')):
+            """Main."""
+
+        @main.command
+        def one():
+            """One."""
+
+        @main.command
+        def two():
+            """Two."""
+
+        @one.command
+        def a(y: Opt[int]):
+            """A."""
+
+        return execute(cli, line, redirect_stdout), \
+               execute(cli, line, redirect_stderr)
+
+    # Act.
+    (ex_a, out_a), (_, err_a) = output(lazy=True)
+    (ex_b, out_b), (_, err_b) = output(lazy=False)
+
+    # Assert.
+    assert isinstance(ex_a, SystemExit)
+    assert isinstance(ex_b, SystemExit)
+    assert out_a == out_b
+    assert err_a == err_b
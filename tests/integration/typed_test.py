@@ -7,6 +7,8 @@ import pytest
 from mints.args.arg import Arg
 from mints.args.opt import Opt
 from mints.cli import cli, CLI
+from mints.parsers.fast import FastParser
+from mints.parsers.standard import StandardParser
 
 from tests.execution import execute, redirect_stderr
 
@@ -26,11 +28,13 @@ class Money:
         return Money(value, 'dollars')
 
 
-@pytest.fixture(autouse=True)
-def reset():
+@pytest.fixture(autouse=True, params=[StandardParser, FastParser])
+def reset(request):
     # Reset `cli` before each test
-    # as if we have just imported it.
+    # as if we have just imported it,
+    # and run the test with each parser.
     globals()['cli'] = CLI()
+    globals()['cli'].parser = request.param(globals()['cli'])
 
 
 def test_typed_arg_without_description():
@@ -280,3 +284,16 @@ def test_add_parser_with_duplicate_type():
 
     with pytest.raises(ValueError, match="namely 'Example'"):
         cli.add_parser(Example)
+
+
+def test_typed_opt_with_custom_prefix():
+    # Arrange.
+    @cli
+    def main(x: Opt[int](prefix='+')):
+        return x
+
+    # Act.
+    cx = execute(cli, '++x 10')
+
+    # Assert.
+    assert cx == 10